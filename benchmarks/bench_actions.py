@@ -0,0 +1,138 @@
+"""Benchmark the wall-clock time of `bwwl actions update` on many actions.
+
+Runs ActionsCmd.update against the local mock of the GitHub API from
+tests/mock_github.py, which waits --latency seconds before each response to
+simulate the round trip to GitHub. Compares a new connection pool per request
+looked up one action at a time (as update did before), with the shared
+keep-alive pool and a growing number of threads, then runs the most parallel
+updater twice more with the HTTP cache: once to fill it, and once where every
+request is answered 304 Not Modified, which does not count against the
+GitHub API rate limit, and once with the batched GraphQL backend. Every run is
+checked to save the same actions.
+
+Usage:
+  python benchmarks/bench_actions.py [--actions 500] [--latency 0.01]
+                                     [--jobs 1 8 32]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+from unittest import mock
+
+from bitwarden_workflow_linter.actions import ActionsCmd
+from bitwarden_workflow_linter.utils import Action, Settings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.mock_github import MockGitHub, MockRepo  # noqa: E402 pylint: disable=wrong-import-position
+
+
+class PoolPerRequestActionsCmd(ActionsCmd):
+    """ActionsCmd that opens a new connection pool for every request, as it used to."""
+
+    def http(self):
+        import urllib3  # pylint: disable=import-outside-toplevel
+
+        return urllib3.PoolManager()
+
+
+def approved_actions(count: int) -> tuple[list[MockRepo], dict[str, Action]]:
+    """Generate the mocked repositories and the approved actions that use them."""
+    repos = [
+        MockRepo(
+            f"owner-{index % 50}/action-{index}",
+            tag=f"v{index % 7}.{index % 11}.0",
+            annotated=index % 4 == 0,
+            releases=index % 10 != 0,
+        )
+        for index in range(count)
+    ]
+    actions = {
+        repo.name: Action(name=repo.name, version="v0.0.0", sha="0" * 40) for repo in repos
+    }
+    return repos, actions
+
+
+def run_update(
+    actions_cmd: ActionsCmd, jobs: int, use_cache: bool, backend: str, output: str
+) -> tuple[float, str]:
+    """Time one `actions update`, returning the time and the saved actions."""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        actions_cmd.update(output, jobs, use_cache, backend)
+    elapsed = time.perf_counter() - start
+    with open(output, encoding="utf8") as file:
+        return elapsed, file.read()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--actions", type=int, default=500)
+    parser.add_argument(
+        "--latency", type=float, default=0.01, help="seconds before each response"
+    )
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 8, 32])
+    args = parser.parse_args()
+
+    repos, actions = approved_actions(args.actions)
+    settings = Settings()
+    settings.approved_actions = actions
+    server = MockGitHub(repos, latency=args.latency).start()
+
+    most_jobs = max(args.jobs)
+    runs = [("pool per request", PoolPerRequestActionsCmd, 1, False, "rest")]
+    runs += [
+        (f"shared, {jobs} jobs", ActionsCmd, jobs, False, "rest") for jobs in args.jobs
+    ]
+    runs += [
+        (f"cold cache, {most_jobs} jobs", ActionsCmd, most_jobs, True, "rest"),
+        (f"warm cache, {most_jobs} jobs", ActionsCmd, most_jobs, True, "rest"),
+        ("graphql, 1 job", ActionsCmd, 1, False, "graphql"),
+        (f"graphql, {most_jobs} jobs", ActionsCmd, most_jobs, False, "graphql"),
+    ]
+
+    print(f"{args.actions} actions, {args.latency * 1000:.0f} ms per response")
+    print(
+        f"{'updater':<22} {'seconds':>8} {'requests':>9} {'304s':>6} "
+        f"{'connections':>12} {'actions/sec':>12}"
+    )
+    expected = None
+    try:
+        with tempfile.TemporaryDirectory() as directory, mock.patch.dict(
+            os.environ,
+            {
+                "BWWL_CACHE_DIR": os.path.join(directory, "cache"),
+                # The GraphQL backend needs a token, which the mock does not check
+                "GITHUB_TOKEN": os.environ.get("GITHUB_TOKEN", "benchmark"),
+            },
+        ):
+            output = os.path.join(directory, "actions.json")
+            for name, command, jobs, use_cache, backend in runs:
+                requests, connections = len(server.requests), server.connections
+                not_modified = server.not_modified
+                elapsed, saved = run_update(
+                    command(settings=settings, api_url=server.url),
+                    jobs,
+                    use_cache,
+                    backend,
+                    output,
+                )
+                expected = expected or saved
+                assert saved == expected, f"{name} saved different actions"
+                print(
+                    f"{name:<22} {elapsed:>8.2f} {len(server.requests) - requests:>9} "
+                    f"{server.not_modified - not_modified:>6} "
+                    f"{server.connections - connections:>12} {args.actions / elapsed:>12.0f}"
+                )
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark RuleCheckBlockedDomains against a large threat feed.
+
+Compares the suffix lookups of RuleCheckBlockedDomains.is_blocked with the
+nested loop the rule used before, which compared every domain found in a text
+with every blocked domain. Both are checked to find the same domains.
+
+Usage:
+  python benchmarks/bench_blocked_domains.py [--blocked 100000] [--texts 50]
+                                             [--repeat 5] [--seed 0]
+"""
+
+import argparse
+import random
+import time
+
+from bitwarden_workflow_linter.rules.check_blocked_domains import RuleCheckBlockedDomains
+from bitwarden_workflow_linter.utils import Settings
+
+TLDS = ("com", "net", "org", "io", "dev", "xyz", "top")
+
+TEXT = (
+    'curl -fsSL "https://{domain}/install.sh" | bash\n'
+    "npm config set registry https://registry.npmjs.org\n"
+    "wget https://github.com/bitwarden/clients/archive/main.tar.gz\n"
+    "echo see docs.bitwarden.com and www.example.com/path for details\n"
+)
+
+
+def threat_feed(count: int, rng: random.Random) -> list[str]:
+    """Generate a blocklist of `count` random domains, some with subdomains."""
+    feed = []
+    for index in range(count):
+        domain = f"threat{index}-{rng.randrange(1 << 20):x}.{rng.choice(TLDS)}"
+        if rng.random() < 0.2:
+            domain = f"cdn{rng.randrange(10)}.{domain}"
+        feed.append(domain.upper() if rng.random() < 0.05 else domain)
+    return feed
+
+
+def legacy_check(rule: RuleCheckBlockedDomains, text: str) -> list[str]:
+    """Find the blocked domains of a text the way the rule did before the suffix set."""
+    blocked_found = []
+    for domain in rule.extract_domains_from_text(text):
+        for blocked_domain in rule.blocked_domains:
+            blocked_domain_lc = blocked_domain.lower().strip()
+            domain_lc = domain.lower().strip()
+            if domain_lc == blocked_domain_lc or domain_lc.endswith("." + blocked_domain_lc):
+                blocked_found.append(domain)
+    return blocked_found
+
+
+def best_of(repeat: int, function) -> float:
+    """Get the fastest of `repeat` runs of a function, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--blocked", type=int, default=100000, help="entries in the blocklist")
+    parser.add_argument("--texts", type=int, default=50, help="run scripts to check")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    feed = threat_feed(args.blocked, rng)
+
+    start = time.perf_counter()
+    rule = RuleCheckBlockedDomains(settings=Settings(blocked_domains=feed))
+    compile_time = time.perf_counter() - start
+
+    # One in four scripts downloads from a subdomain of a blocked domain
+    texts = [
+        TEXT.format(
+            domain=f"dl.{rng.choice(feed)}" if index % 4 == 0 else f"mirror{index}.example.net"
+        )
+        for index in range(args.texts)
+    ]
+
+    expected = [sorted(legacy_check(rule, text)) for text in texts]
+    assert [sorted(rule.check_blocked_domains(text)[1]) for text in texts] == expected
+
+    suffixes = best_of(args.repeat, lambda: [rule.check_blocked_domains(text) for text in texts])
+    legacy = best_of(1, lambda: [legacy_check(rule, text) for text in texts])
+    found = sum(len(domains) for domains in expected)
+
+    print(f"{len(feed)} blocked domains, {len(texts)} texts, {found} blocked domains found")
+    print(f"compiling the blocklist: {compile_time * 1000:.1f} ms")
+    print(f"{'strategy':>12} {'seconds':>10} {'texts/sec':>12}")
+    print(f"{'nested loop':>12} {legacy:>10.4f} {len(texts) / legacy:>12.0f}")
+    print(f"{'suffix set':>12} {suffixes:>10.4f} {len(texts) / suffixes:>12.0f}")
+    print(f"speedup: {legacy / suffixes:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark the extraction of domains from adversarial `run:` blocks.
+
+Times extract_domains() and the regex that RuleCheckBlockedDomains used before
+on inputs of growing size made of dot and hyphen heavy patterns, on which the
+regex backtracks quadratically. The regex is only run up to --legacy-max-size.
+Exits with 1 if extract_domains() grows faster than linearly: if the time per
+byte of the largest input is more than --max-growth times that of the
+smallest one.
+
+Usage:
+  python benchmarks/bench_domains.py [--sizes 1000 10000 100000 1000000]
+                                     [--legacy-max-size 10000] [--max-growth 4]
+"""
+
+import argparse
+import re
+import sys
+import time
+
+from bitwarden_workflow_linter.domains import extract_domains
+
+LEGACY_PATTERN = re.compile(
+    r"(?:https?://)?(?:www\.)?([a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+"
+    r"[a-zA-Z]{2,}(?:/[^\s]*)?",
+    re.IGNORECASE,
+)
+
+# Patterns repeated to the size of each input
+PATTERNS = {
+    "labels without tld": "a.",
+    "hyphens": "a-",
+    "dangling hyphen": "a.-",
+    "numeric tld": "1.a.",
+    "schemes": "https://a.",
+    "long labels": "a" * 64 + ".",
+    "script": 'curl -fsSL "https://cdn-1.example.com/releases/v1.2.3/tool.tar.gz" -o t.tgz\n',
+}
+
+
+def legacy_extract(text: str) -> list[str]:
+    """Extract the domains of a text the way RuleCheckBlockedDomains did with a regex."""
+    domains = set()
+    for match in LEGACY_PATTERN.finditer(text):
+        domain = re.sub(r"^https?://", "", match.group(0))
+        domain = re.sub(r"^www\.", "", domain)
+        domain = re.sub(r"/.*$", "", domain)
+        domain = domain.lower().strip()
+        if domain and "." in domain:
+            domains.add(domain)
+    return list(domains)
+
+
+def timed(function, text: str) -> float:
+    """Time one call of a function, in seconds."""
+    start = time.perf_counter()
+    function(text)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000]
+    )
+    parser.add_argument("--legacy-max-size", type=int, default=10000)
+    parser.add_argument("--max-growth", type=float, default=4.0)
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'pattern':<20} {'bytes':>9} {'regex (s)':>10} {'linear (s)':>11} {'ns/byte':>8}")
+    for name, unit in PATTERNS.items():
+        per_byte = []
+        for size in args.sizes:
+            text = unit * max(1, size // len(unit))
+            linear = timed(extract_domains, text)
+            per_byte.append(linear / len(text))
+            legacy = "-"
+            if len(text) <= args.legacy_max_size:
+                legacy = f"{timed(legacy_extract, text):.4f}"
+                assert sorted(extract_domains(text)) == sorted(legacy_extract(text))
+            print(
+                f"{name:<20} {len(text):>9} {legacy:>10} {linear:>11.4f} "
+                f"{per_byte[-1] * 1e9:>8.0f}"
+            )
+        growth = per_byte[-1] / per_byte[0]
+        if growth > args.max_growth:
+            failures.append(f"{name}: time per byte grew {growth:.1f}x")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
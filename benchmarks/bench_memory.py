@@ -0,0 +1,89 @@
+"""Benchmark the memory held by the built Workflows and the findings of a scan.
+
+Builds every workflow of a generated corpus and keeps them all alive, like a
+scan that batches many workflows at once, then uses tracemalloc to measure
+the memory that is still allocated. Results are scaled to 1,000 workflows.
+
+Usage:
+  python benchmarks/bench_memory.py [--files 1000] [--jobs 4] [--steps 8] [--seed 0]
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import tempfile
+import tracemalloc
+
+from typing import Callable
+
+from bitwarden_workflow_linter.lint import LinterCmd
+from bitwarden_workflow_linter.load import WorkflowBuilder
+from bitwarden_workflow_linter.utils import Settings
+
+from corpus import CorpusOptions, write_corpus
+
+EXTERNAL_TOOL_RULES = ("RunActionlint", "RunZizmor")
+
+
+def retained(function: Callable[[], object]) -> tuple[int, int]:
+    """Measure the memory allocated by a function that is still held by its result.
+
+    Returns:
+      The retained and the peak memory, in bytes.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function()
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return current, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--jobs", type=int, default=4, help="jobs per workflow")
+    parser.add_argument("--steps", type=int, default=8, help="steps per job")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    settings = Settings.factory()
+    settings.enabled_rules = [
+        rule
+        for rule in settings.enabled_rules
+        if not rule["id"].endswith(EXTERNAL_TOOL_RULES)
+    ]
+    linter = LinterCmd(settings=settings)
+    scale = 1000 / args.files
+
+    with tempfile.TemporaryDirectory() as directory:
+        options = CorpusOptions(jobs=args.jobs, steps=args.steps)
+        files = write_corpus(directory, args.files, options, args.seed)
+
+        def findings() -> list:
+            with contextlib.redirect_stdout(io.StringIO()):
+                return [linter.collect_findings(file) for file in files]
+
+        cases = {
+            "loaded YAML (round-trip)": lambda: [WorkflowBuilder.load(file) for file in files],
+            "Workflows (round-trip)": lambda: [WorkflowBuilder.build(file) for file in files],
+            "Workflows (fast YAML)": lambda: [
+                WorkflowBuilder.build(file, fast=True) for file in files
+            ],
+            "LintFindings": findings,
+        }
+
+        print(f"{args.files} workflows of {args.jobs} jobs x {args.steps} steps")
+        print(f"{'held':<26} {'MB / 1,000 workflows':>21} {'peak MB':>9}")
+        for name, function in cases.items():
+            current, peak = retained(function)
+            print(f"{name:<26} {current * scale / 1e6:>21.2f} {peak / 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Benchmark `bwwl actions update --backend mirror` on many local git mirrors.
+
+Creates a repository with --tags tags (every other one annotated), packs it
+with `git gc`, and clones --actions bare mirrors of it with `git clone
+--mirror`. Then times ActionsCmd.update reading every mirror with a growing
+number of threads, without any network access, and checks the saved SHAs
+against `git rev-parse <tag>^{commit}`.
+
+Usage:
+  python benchmarks/bench_mirrors.py [--actions 500] [--tags 100] [--jobs 1 8]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import tempfile
+import time
+
+from bitwarden_workflow_linter.actions import ActionsCmd
+from bitwarden_workflow_linter.utils import Action, Settings
+
+
+def git(cwd: str, *args: str) -> str:
+    """Run git in a directory and return its output."""
+    return subprocess.run(
+        ["git", "-c", "user.name=bench", "-c", "user.email=bench@example.com", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+def make_source(path: str, tags: int) -> None:
+    """Create a packed repository with a commit and a tag per version."""
+    os.makedirs(path)
+    git(path, "init", "-q", "-b", "main")
+    for index in range(tags):
+        with open(os.path.join(path, "action.yml"), "w", encoding="utf8") as file:
+            file.write(f"name: action\nversion: {index}\n")
+        git(path, "add", ".")
+        git(path, "commit", "-q", "-m", f"release {index}")
+        tag = f"v{index // 10}.{index % 10}.0"
+        if index % 2:
+            git(path, "tag", "-a", tag, "-m", f"Release {tag}")
+        else:
+            git(path, "tag", tag)
+    git(path, "gc", "-q")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--actions", type=int, default=500)
+    parser.add_argument("--tags", type=int, default=100)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "source")
+        mirrors = os.path.join(directory, "mirrors")
+        start = time.perf_counter()
+        make_source(source, args.tags)
+        for index in range(args.actions):
+            mirror = os.path.join(mirrors, f"owner-{index}", "action.git")
+            git(directory, "clone", "-q", "--mirror", source, mirror)
+        print(
+            f"{args.actions} mirrors of {args.tags} tags created in "
+            f"{time.perf_counter() - start:.1f}s"
+        )
+
+        latest = f"v{(args.tags - 1) // 10}.{(args.tags - 1) % 10}.0"
+        expected = git(source, "rev-parse", f"{latest}^{{commit}}").strip()
+        settings = Settings()
+        settings.approved_actions = {
+            f"owner-{index}/action": Action(name=f"owner-{index}/action", version="v0.0.0")
+            for index in range(args.actions)
+        }
+        output = os.path.join(directory, "actions.json")
+
+        print(f"{'jobs':>4} {'seconds':>8} {'actions/sec':>12}")
+        for jobs in args.jobs:
+            actions_cmd = ActionsCmd(
+                settings=settings, api_url="http://127.0.0.1:9", mirror_dir=mirrors
+            )
+            elapsed = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                actions_cmd.update(output, jobs, backend="mirror", resume=False)
+            elapsed = time.perf_counter() - elapsed
+            with open(output, encoding="utf8") as file:
+                saved = json.load(file)
+            assert all(
+                action["version"] == latest and action["sha"] == expected
+                for action in saved.values()
+            ), "the mirrors resolved to the wrong commits"
+            print(f"{jobs:>4} {elapsed:>8.3f} {args.actions / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
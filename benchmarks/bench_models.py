@@ -0,0 +1,117 @@
+"""Benchmark the construction cost of each Step, Job and Workflow model.
+
+Compares the direct constructors used by the init() methods of the models with
+building the same models through dataclasses_json's from_dict(), as init()
+did before.
+
+Usage:
+  python benchmarks/bench_models.py [--jobs 10] [--steps 200] [--repeat 5] [--seed 0]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from bitwarden_workflow_linter.load import WorkflowBuilder
+from bitwarden_workflow_linter.models.job import Job
+from bitwarden_workflow_linter.models.step import Step, trailing_comment
+from bitwarden_workflow_linter.models.workflow import Workflow
+
+from corpus import CorpusOptions, generate_workflow
+
+
+def from_dict_step(idx: int, job: str, data) -> Step:
+    """Build a Step the way Step.init did with from_dict()."""
+    new_step = Step.from_dict(data)
+    new_step.key = idx
+    new_step.job = job
+
+    if new_step.uses:
+        new_step.uses_comment = trailing_comment(data, "uses")
+        if new_step.uses_comment is not None:
+            new_step.uses_version = new_step.uses_comment.split(" ")[-1]
+        if "@" in new_step.uses:
+            new_step.uses_path, new_step.uses_ref = new_step.uses.split("@")
+        else:
+            new_step.uses_path = new_step.uses
+    return new_step
+
+
+def from_dict_job(key: str, data) -> Job:
+    """Build a Job (without its steps) the way Job.init did with from_dict()."""
+    return Job.from_dict(
+        {
+            "key": key,
+            "name": data["name"] if "name" in data else None,
+            "runs-on": data["runs-on"] if "runs-on" in data else None,
+            "env": data["env"] if "env" in data else None,
+            "needs": Job.parse_needs(data["needs"]) if "needs" in data else None,
+            "outputs": data["outputs"] if "outputs" in data else None,
+            "permissions": data["permissions"] if "permissions" in data else None,
+        }
+    )
+
+
+def best_of(repeat: int, function) -> float:
+    """Get the fastest of `repeat` runs of a function, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=10, help="jobs in the workflow")
+    parser.add_argument("--steps", type=int, default=200, help="steps per job")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "workflow.yml")
+        with open(path, "w", encoding="utf8") as file:
+            file.write(
+                generate_workflow(0, CorpusOptions(jobs=args.jobs, steps=args.steps), args.seed)
+            )
+        data = WorkflowBuilder.load(path)
+
+    steps = [
+        (idx, str(key), step)
+        for key, job in data["jobs"].items()
+        for idx, step in enumerate(job["steps"])
+    ]
+    jobs = list(data["jobs"].items())
+
+    cases = {
+        "Step": (
+            len(steps),
+            lambda: [from_dict_step(*step) for step in steps],
+            lambda: [Step.init(*step) for step in steps],
+        ),
+        "Job (no steps)": (
+            len(jobs),
+            lambda: [from_dict_job(key, job) for key, job in jobs],
+            lambda: [Job.init(key, {**job, "steps": []}) for key, job in jobs],
+        ),
+    }
+
+    print(f"{len(steps)} steps in {len(jobs)} jobs")
+    print(f"{'model':<16} {'from_dict (us)':>15} {'init (us)':>10} {'speedup':>8}")
+    for name, (count, before, after) in cases.items():
+        before_time = best_of(args.repeat, before) / count * 1e6
+        after_time = best_of(args.repeat, after) / count * 1e6
+        print(f"{name:<16} {before_time:>15.2f} {after_time:>10.2f} {before_time / after_time:>7.1f}x")
+
+    build = best_of(args.repeat, lambda: Workflow.init("", path, data))
+    print(
+        f"Workflow.init of the whole workflow: {build * 1000:.2f} ms "
+        f"({build / len(steps) * 1e6:.2f} us per step)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark `bwwl lint` throughput with an increasing number of worker processes.
+
+Generates a synthetic corpus of workflows and reports the files/sec of
+LinterCmd.run for 1, 2, 4, ... up to --max-jobs workers.
+
+Usage:
+  python benchmarks/bench_parallel.py [--files 2000] [--seed 0] [--max-jobs N] [--with-tools]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from bitwarden_workflow_linter.lint import LinterCmd
+from bitwarden_workflow_linter.utils import Settings
+
+from corpus import write_corpus
+
+EXTERNAL_TOOL_RULES = ("RunActionlint", "RunZizmor")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--with-tools",
+        action="store_true",
+        help="keep the actionlint and zizmor rules enabled",
+    )
+    args = parser.parse_args()
+
+    settings = Settings.factory()
+    if not args.with_tools:
+        settings.enabled_rules = [
+            rule
+            for rule in settings.enabled_rules
+            if not rule["id"].endswith(EXTERNAL_TOOL_RULES)
+        ]
+    linter = LinterCmd(settings=settings)
+
+    jobs_list = []
+    jobs = 1
+    while jobs < args.max_jobs:
+        jobs_list.append(jobs)
+        jobs *= 2
+    jobs_list.append(args.max_jobs)
+
+    with tempfile.TemporaryDirectory() as corpus:
+        write_corpus(corpus, args.files, seed=args.seed)
+        baseline = None
+        print(f"{'jobs':>6} {'seconds':>10} {'files/sec':>12} {'speedup':>9}")
+        for jobs in jobs_list:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                linter.run([corpus], jobs=jobs)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(
+                f"{jobs:>6} {elapsed:>10.2f} {args.files / elapsed:>12.1f} "
+                f"{baseline / elapsed:>8.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Benchmark the startup time of the bwwl CLI and check it against a budget.
+
+Times `bwwl --version`, `bwwl --help` and `bwwl lint --help` in fresh
+interpreters, compared to a bare `python -c pass`, and uses `python -X importtime`
+to list the slowest imports of `bwwl --version`. Exits with 1 if `bwwl --version`
+takes longer than the budget on top of the bare interpreter, or if it imports
+any of the heavy dependencies that only the subcommands need.
+
+Usage:
+  python benchmarks/bench_startup.py [--repeat 10] [--budget-ms 30]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+CLI = [sys.executable, "-m", "bitwarden_workflow_linter.cli"]
+
+COMMANDS = {
+    "python -c pass": [sys.executable, "-c", "pass"],
+    "bwwl --version": [*CLI, "--version"],
+    "bwwl --help": [*CLI, "--help"],
+    "bwwl lint --help": [*CLI, "lint", "--help"],
+}
+
+# Dependencies that `bwwl --version` must not import
+HEAVY_MODULES = ("ruamel.yaml", "dataclasses_json", "marshmallow", "urllib3")
+
+
+def time_command(command: list[str], repeat: int) -> list[float]:
+    """Run a command `repeat` times and return the wall time of each run, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def import_times(command: list[str]) -> dict[str, int]:
+    """Get the cumulative import time of every module a command imports, in microseconds."""
+    output = subprocess.run(
+        [command[0], "-X", "importtime", *command[1:]],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=30.0,
+        help="maximum time of `bwwl --version` on top of a bare interpreter",
+    )
+    parser.add_argument("--top", type=int, default=10, help="number of slowest imports to list")
+    args = parser.parse_args()
+
+    medians = {}
+    print(f"{'command':<20} {'best (ms)':>10} {'median (ms)':>12}")
+    for name, command in COMMANDS.items():
+        timings = time_command(command, args.repeat)
+        medians[name] = statistics.median(timings)
+        print(f"{name:<20} {min(timings) * 1000:>10.1f} {medians[name] * 1000:>12.1f}")
+
+    times = import_times(COMMANDS["bwwl --version"])
+    print()
+    print("Slowest imports of `bwwl --version` (cumulative):")
+    for name, cumulative in sorted(times.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"  {cumulative / 1000:>8.1f} ms  {name}")
+
+    failures = []
+    overhead = (medians["bwwl --version"] - medians["python -c pass"]) * 1000
+    print()
+    print(f"`bwwl --version` overhead: {overhead:.1f} ms (budget {args.budget_ms:.1f} ms)")
+    if overhead > args.budget_ms:
+        failures.append(f"`bwwl --version` is over budget by {overhead - args.budget_ms:.1f} ms")
+
+    heavy = [name for name in HEAVY_MODULES if name in times]
+    if heavy:
+        failures.append(f"`bwwl --version` imports {', '.join(heavy)}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
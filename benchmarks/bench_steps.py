@@ -0,0 +1,116 @@
+"""Benchmark the Step level rules on workflows with thousands of steps.
+
+Compares running every Step level rule on every step (with the compatibility
+check of Rule.execute) against the execution plan of Rules.step_plan, which
+only evaluates each rule on the kinds of steps it can fail on.
+
+Usage:
+  python benchmarks/bench_steps.py [--steps 5000] [--jobs-per-workflow 4] [--repeat 5]
+                                   [--seed 0] [--only RULE [RULE ...]]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from bitwarden_workflow_linter.lint import LinterCmd
+from bitwarden_workflow_linter.load import WorkflowBuilder
+from bitwarden_workflow_linter.utils import Settings
+
+from corpus import CorpusOptions, generate_workflow
+
+EXTERNAL_TOOL_RULES = ("RunActionlint", "RunZizmor")
+
+
+def run_every_rule(linter: LinterCmd, workflow) -> list:
+    """Lint a workflow the way bwwl did before the execution plan."""
+    findings = []
+    for rule in linter.rules.workflow:
+        findings.append(rule.execute(workflow))
+    for job in workflow.jobs.values():
+        for rule in linter.rules.job:
+            findings.append(rule.execute(job))
+        for step in job.steps or []:
+            for rule in linter.rules.step:
+                findings.append(rule.execute(step))
+    return [finding for finding in findings if finding is not None]
+
+
+def run_plan(linter: LinterCmd, workflow) -> list:
+    """Lint a workflow with the execution plan (see LinterCmd.collect_findings)."""
+    findings = []
+    for rule in linter.rules.workflow:
+        findings.append(rule.evaluate(workflow))
+    step_plan = linter.rules.step_plan()
+    for job in workflow.jobs.values():
+        for rule in linter.rules.job:
+            findings.append(rule.evaluate(job))
+        for step in job.steps or []:
+            for rule in step_plan[step.kind]:
+                findings.append(rule.evaluate(step))
+    return [finding for finding in findings if finding is not None]
+
+
+def best_of(repeat: int, function, *args) -> float:
+    """Get the fastest of `repeat` runs of a function, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=5000)
+    parser.add_argument("--jobs-per-workflow", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        default=None,
+        metavar="RULE",
+        help="only enable the rules with these class names",
+    )
+    args = parser.parse_args()
+
+    settings = Settings.factory()
+    settings.enabled_rules = [
+        rule
+        for rule in settings.enabled_rules
+        if not rule["id"].endswith(EXTERNAL_TOOL_RULES)
+        and (args.only is None or rule["id"].split(".")[-1] in args.only)
+    ]
+    linter = LinterCmd(settings=settings)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "many-steps.yml")
+        options = CorpusOptions(
+            jobs=args.jobs_per_workflow,
+            steps=max(1, args.steps // args.jobs_per_workflow),
+            matrix=0,
+            script_lines=3,
+        )
+        with open(path, "w", encoding="utf8") as file:
+            file.write(generate_workflow(0, options, args.seed))
+        workflow = WorkflowBuilder.build(path)
+
+    expected = [str(finding) for finding in run_every_rule(linter, workflow)]
+    assert [str(finding) for finding in run_plan(linter, workflow)] == expected
+
+    every_rule = best_of(args.repeat, run_every_rule, linter, workflow)
+    plan = best_of(args.repeat, run_plan, linter, workflow)
+    steps = sum(len(job.steps or []) for job in workflow.jobs.values())
+
+    print(f"{steps} steps, {len(expected)} findings")
+    print(f"{'strategy':>12} {'seconds':>10} {'steps/sec':>12}")
+    print(f"{'every rule':>12} {every_rule:>10.4f} {steps / every_rule:>12.0f}")
+    print(f"{'plan':>12} {plan:>10.4f} {steps / plan:>12.0f}")
+    print(f"speedup: {every_rule / plan:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
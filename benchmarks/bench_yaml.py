@@ -0,0 +1,61 @@
+"""Benchmark the parse throughput of the round-trip and the fast YAML loaders.
+
+Both loaders parse the same large generated workflows, which are then built
+into Workflows and compared so that the fast loader is checked to produce the
+same models.
+
+Usage:
+  python benchmarks/bench_yaml.py [--files 20] [--jobs 20] [--steps 50] [--repeat 5]
+                                  [--seed 0]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from bitwarden_workflow_linter.load import WorkflowBuilder
+
+from corpus import CorpusOptions, write_corpus
+
+
+def best_of(repeat: int, function) -> float:
+    """Get the fastest of `repeat` runs of a function, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--jobs", type=int, default=20, help="jobs per workflow")
+    parser.add_argument("--steps", type=int, default=50, help="steps per job")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        options = CorpusOptions(jobs=args.jobs, steps=args.steps)
+        files = write_corpus(directory, args.files, options, args.seed)
+        size = sum(os.path.getsize(file) for file in files)
+
+        for file in files:
+            assert WorkflowBuilder.build(file, fast=True) == WorkflowBuilder.build(file)
+
+        print(f"{len(files)} files, {size / 1e6:.1f} MB")
+        print(f"{'loader':>12} {'phase':>6} {'seconds':>10} {'MB/sec':>8}")
+        for name, fast in (("round-trip", False), ("fast", True)):
+            load = best_of(args.repeat, lambda: [WorkflowBuilder.load(file, fast) for file in files])
+            build = best_of(
+                args.repeat, lambda: [WorkflowBuilder.build(file, fast=fast) for file in files]
+            )
+            print(f"{name:>12} {'load':>6} {load:>10.4f} {size / 1e6 / load:>8.2f}")
+            print(f"{name:>12} {'build':>6} {build:>10.4f} {size / 1e6 / build:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
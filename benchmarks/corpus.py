@@ -0,0 +1,203 @@
+"""Deterministic generator of realistic synthetic GitHub Action workflows.
+
+The same seed and options always produce byte-for-byte identical workflows, so
+benchmark results can be compared between commits.
+"""
+
+import functools
+import importlib.resources
+import json
+import os
+import random
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class CorpusOptions:
+    """Shape of the generated workflows."""
+
+    jobs: int = 4
+    steps: int = 8
+    matrix: int = 3
+    script_lines: int = 20
+    # Fraction of `uses` steps that are unpinned or not approved, so that the
+    # step rules produce findings
+    bad_uses: float = 0.1
+
+
+RUNNERS = ("ubuntu-22.04", "ubuntu-24.04", "windows-2022", "macos-14")
+
+SCRIPT_LINES = (
+    "set -euo pipefail",
+    'echo "Building ${{{{ matrix.target }}}} ({index})"',
+    "npm ci --prefer-offline --no-audit",
+    "npm run build -- --configuration=production",
+    'curl -fsSL "$_DOWNLOAD_URL/artifact-{index}.tar.gz" -o artifact.tar.gz',
+    "tar -xzf artifact.tar.gz -C ./dist",
+    'if [[ "${{{{ github.event_name }}}}" == "push" ]]; then echo "push"; fi',
+    'echo "version=1.{index}.0" >> "$GITHUB_OUTPUT"',
+    "dotnet test --configuration Release --no-build --logger trx",
+    "docker build -t registry.example.com/app:{index} .",
+)
+
+
+@functools.cache
+def approved_actions() -> list[dict[str, str]]:
+    """Get the default approved actions, sorted by name."""
+    with (
+        importlib.resources.files("bitwarden_workflow_linter")
+        .joinpath("default_actions.json")
+        .open("r", encoding="utf-8") as file
+    ):
+        actions = json.load(file)
+    return [actions[name] for name in sorted(actions)]
+
+
+def generate_step(rng: random.Random, index: int, options: CorpusOptions, actions: list) -> str:
+    """Generate one step: a `uses` of an approved or local action, or a `run` script."""
+    kind = rng.random()
+    if kind < 0.1:
+        return (
+            f"      - name: Local action {index}\n"
+            f"        uses: ./.github/actions/local-{index % 5}\n"
+        )
+    if kind < 0.55:
+        action = rng.choice(actions)
+        if rng.random() < options.bad_uses:
+            uses = f"{action['name']}@{action['version']}"
+        else:
+            uses = f"{action['name']}@{action['sha']} # {action['version']}"
+        return (
+            f"      - name: Use {action['name'].split('/')[-1]} {index}\n"
+            f"        uses: {uses}\n"
+            f"        with:\n"
+            f"          token: ${{{{ secrets.GITHUB_TOKEN }}}}\n"
+        )
+
+    lines = [
+        rng.choice(SCRIPT_LINES).format(index=index)
+        for _ in range(rng.randint(1, max(1, options.script_lines)))
+    ]
+    script = "".join(f"          {line}\n" for line in lines)
+    return (
+        f"      - name: Run script {index}\n"
+        f"        env:\n"
+        f"          _DOWNLOAD_URL: https://artifacts.example.com/builds/{index}\n"
+        f"        run: |\n{script}"
+    )
+
+
+def generate_workflow(
+    index: int, options: Optional[CorpusOptions] = None, seed: int = 0
+) -> str:
+    """Generate the YAML of a workflow.
+
+    Args:
+      index:
+        The index of the workflow in the corpus
+      options:
+        The shape of the workflow
+      seed:
+        The seed of the corpus
+
+    Returns:
+      The workflow YAML.
+    """
+    options = options or CorpusOptions()
+    rng = random.Random(f"{seed}:{index}")
+    actions = approved_actions()
+
+    lines = [
+        f"name: Synthetic Workflow {index}\n",
+        "\n",
+        "on:\n",
+        "  push:\n",
+        "    branches: [main]\n",
+        "  workflow_dispatch:\n",
+        "    inputs:\n",
+        "      target:\n",
+        "        description: Target to build\n",
+        "        required: false\n",
+        "\n",
+        "permissions:\n",
+        "  contents: read\n",
+        "\n",
+        "jobs:\n",
+    ]
+    step_index = 0
+    for job in range(options.jobs):
+        targets = ", ".join(f"target-{value}" for value in range(options.matrix))
+        lines += [
+            f"  job-{job}:\n",
+            f"    name: Job {job}\n",
+            f"    runs-on: {rng.choice(RUNNERS)}\n",
+            "    permissions:\n",
+            "      contents: read\n",
+            "    outputs:\n",
+            f"      version_{job}: ${{{{ steps.version.outputs.version }}}}\n",
+            "    env:\n",
+            f"      _JOB_INDEX: {job}\n",
+        ]
+        if options.matrix > 0:
+            lines += [
+                "    strategy:\n",
+                "      fail-fast: false\n",
+                "      matrix:\n",
+                f"        target: [{targets}]\n",
+            ]
+        lines.append("    steps:\n")
+        for _ in range(options.steps):
+            lines.append(generate_step(rng, step_index, options, actions))
+            step_index += 1
+        lines.append("\n")
+
+    return "".join(lines)
+
+
+def write_corpus(
+    path: str, count: int, options: Optional[CorpusOptions] = None, seed: int = 0
+) -> list[str]:
+    """Write `count` generated workflows into a directory.
+
+    Returns:
+      The paths of the written workflows, sorted.
+    """
+    os.makedirs(path, exist_ok=True)
+    filenames = []
+    for index in range(count):
+        filename = os.path.join(path, f"workflow-{index:05d}.yml")
+        with open(filename, "w", encoding="utf8") as file:
+            file.write(generate_workflow(index, options, seed))
+        filenames.append(filename)
+    return filenames
+
+
+def write_tree(path: str, depth: int, fanout: int, files_per_directory: int) -> list[str]:
+    """Write a tree of directories that each contain a few small workflows.
+
+    Every directory also contains non-workflow files, which generate_files
+    has to skip.
+
+    Returns:
+      All of the directories of the tree, parents first.
+    """
+    directories = [path]
+    level = [path]
+    for _ in range(depth):
+        level = [
+            os.path.join(parent, f"dir-{child}")
+            for parent in level
+            for child in range(fanout)
+        ]
+        directories += level
+
+    for directory in directories:
+        os.makedirs(directory, exist_ok=True)
+        for index in range(files_per_directory):
+            with open(os.path.join(directory, f"workflow-{index}.yml"), "w", encoding="utf8") as file:
+                file.write(f"name: Tree {index}\n")
+            with open(os.path.join(directory, f"notes-{index}.md"), "w", encoding="utf8") as file:
+                file.write("not a workflow\n")
+    return directories
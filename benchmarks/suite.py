@@ -0,0 +1,254 @@
+"""Benchmark suite for bwwl, with results saved as JSON to compare between commits.
+
+Benchmarks:
+  build              WorkflowBuilder.build of every workflow of the corpus
+  build:fast         the same with the fast YAML loader
+  rule:<Rule>        each enabled rule on every object it is compatible with
+  lint_file          LinterCmd.lint_file end-to-end on every workflow
+  lint_file:inventory
+                     the same with only the workflow level rules that an
+                     inventory of the workflows needs
+  generate_files     LinterCmd.generate_files on every directory of a deep tree
+  settings:parse     Settings.factory parsing every settings file
+  settings:snapshot  Settings.factory loading the settings snapshot
+  startup            `bwwl --version` in a fresh interpreter
+
+Usage:
+  python benchmarks/suite.py [--files 200] [--repeat 5] [--output results.json]
+                             [--compare baseline.json] [--only NAME [NAME ...]]
+                             [--with-tools]
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from typing import Callable, Optional
+
+from bitwarden_workflow_linter.__about__ import __version__
+from bitwarden_workflow_linter.lint import LinterCmd
+from bitwarden_workflow_linter.load import WorkflowBuilder
+from bitwarden_workflow_linter.models.job import Job
+from bitwarden_workflow_linter.models.step import Step
+from bitwarden_workflow_linter.models.workflow import Workflow
+from bitwarden_workflow_linter.utils import Settings
+
+from bench_startup import COMMANDS, time_command
+from corpus import CorpusOptions, write_corpus, write_tree
+
+EXTERNAL_TOOL_RULES = ("RunActionlint", "RunZizmor")
+INVENTORY_RULES = ("RulePermissionsExist", "RuleCheckPrTarget")
+
+
+def measure(function: Callable[[], None], repeat: int) -> list[float]:
+    """Time `repeat` calls of a function, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def result(timings: list[float], items: int) -> dict[str, float]:
+    """Summarize the timings of a benchmark that processes `items` items per call."""
+    best = min(timings)
+    return {
+        "best": best,
+        "mean": sum(timings) / len(timings),
+        "items": items,
+        "items_per_second": items / best if best > 0 else 0.0,
+    }
+
+
+def git_commit() -> Optional[str]:
+    """Get the commit of the working tree, if it is a git repository."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def objects_of(workflows: list[Workflow]) -> dict[type, list]:
+    """Get every Workflow, Job and Step of the workflows, by type."""
+    objects = {Workflow: list(workflows), Job: [], Step: []}
+    for workflow in workflows:
+        for job in workflow.jobs.values():
+            objects[Job].append(job)
+            objects[Step] += job.steps or []
+    return objects
+
+
+def run_suite(args: argparse.Namespace, corpus: str, tree: str) -> dict[str, dict]:
+    """Run every selected benchmark."""
+    settings = Settings.factory()
+    if not args.with_tools:
+        settings.enabled_rules = [
+            rule
+            for rule in settings.enabled_rules
+            if not rule["id"].endswith(EXTERNAL_TOOL_RULES)
+        ]
+    linter = LinterCmd(settings=settings)
+
+    options = CorpusOptions(
+        jobs=args.jobs, steps=args.steps, matrix=args.matrix, script_lines=args.script_lines
+    )
+    files = write_corpus(corpus, args.files, options, args.seed)
+    directories = write_tree(tree, args.tree_depth, args.tree_fanout, args.tree_files)
+
+    def selected(name: str) -> bool:
+        return args.only is None or any(name.startswith(only) for only in args.only)
+
+    results = {}
+
+    if selected("build"):
+        timings = measure(lambda: [WorkflowBuilder.build(file) for file in files], args.repeat)
+        results["build"] = result(timings, len(files))
+
+    if selected("build:fast"):
+        timings = measure(
+            lambda: [WorkflowBuilder.build(file, fast=True) for file in files], args.repeat
+        )
+        results["build:fast"] = result(timings, len(files))
+
+    workflows = [WorkflowBuilder.build(file) for file in files]
+    objects = objects_of(workflows)
+    rules = {id(rule): rule for rule in linter.rules.workflow + linter.rules.job + linter.rules.step}
+    for rule in rules.values():
+        name = f"rule:{type(rule).__name__}"
+        if not selected(name):
+            continue
+        targets = [obj for kind in rule.compatibility for obj in objects[kind]]
+        rule.prepare(files)
+        timings = measure(lambda: [rule.execute(obj) for obj in targets], args.repeat)
+        results[name] = result(timings, len(targets))
+
+    if selected("lint_file"):
+        linter.rules.prepare(files)
+
+        def lint_all() -> None:
+            with contextlib.redirect_stdout(io.StringIO()):
+                for file in files:
+                    linter.lint_file(file, errors_only=False)
+
+        results["lint_file"] = result(measure(lint_all, args.repeat), len(files))
+
+    if selected("lint_file:inventory"):
+        inventory_settings = copy.copy(settings)
+        inventory_settings.enabled_rules = [
+            rule for rule in settings.enabled_rules if rule["id"].endswith(INVENTORY_RULES)
+        ]
+        inventory = LinterCmd(settings=inventory_settings)
+
+        def inventory_all() -> None:
+            with contextlib.redirect_stdout(io.StringIO()):
+                for file in files:
+                    inventory.lint_file(file, errors_only=False)
+
+        results["lint_file:inventory"] = result(measure(inventory_all, args.repeat), len(files))
+
+    if selected("generate_files"):
+        timings = measure(lambda: linter.generate_files(directories), args.repeat)
+        results["generate_files"] = result(timings, len(directories))
+
+    if selected("settings:parse"):
+        timings = measure(lambda: Settings.factory(use_snapshot=False), args.repeat)
+        results["settings:parse"] = result(timings, 1)
+
+    if selected("settings:snapshot"):
+        Settings.factory()
+        results["settings:snapshot"] = result(measure(Settings.factory, args.repeat), 1)
+
+    if selected("startup"):
+        results["startup"] = result(time_command(COMMANDS["bwwl --version"], args.repeat), 1)
+
+    return results
+
+
+def compare(results: dict[str, dict], baseline_file: str) -> None:
+    """Print the change of each benchmark compared to a previous run."""
+    with open(baseline_file, encoding="utf8") as file:
+        baseline = json.load(file)["results"]
+
+    print()
+    print(f"Compared to {baseline_file}:")
+    print(f"{'benchmark':<36} {'baseline (s)':>13} {'current (s)':>12} {'change':>8}")
+    for name, current in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]["best"], current["best"]
+        change = (after - before) / before * 100 if before > 0 else 0.0
+        print(f"{name:<36} {before:>13.4f} {after:>12.4f} {change:>+7.1f}%")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=200, help="workflows in the corpus")
+    parser.add_argument("--jobs", type=int, default=4, help="jobs per workflow")
+    parser.add_argument("--steps", type=int, default=8, help="steps per job")
+    parser.add_argument("--matrix", type=int, default=3, help="matrix entries per job")
+    parser.add_argument("--script-lines", type=int, default=20, help="max lines per run script")
+    parser.add_argument("--tree-depth", type=int, default=4)
+    parser.add_argument("--tree-fanout", type=int, default=4)
+    parser.add_argument("--tree-files", type=int, default=3, help="workflows per directory")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="+", default=None, metavar="NAME",
+                        help="only run the benchmarks whose names start with NAME")
+    parser.add_argument("--with-tools", action="store_true",
+                        help="keep the actionlint and zizmor rules enabled")
+    parser.add_argument("--output", default=None, help="save the results as JSON")
+    parser.add_argument("--compare", default=None, metavar="BASELINE",
+                        help="compare with the JSON results of a previous run")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = run_suite(
+            args, os.path.join(directory, "corpus"), os.path.join(directory, "tree")
+        )
+
+    print(f"{'benchmark':<36} {'best (s)':>10} {'mean (s)':>10} {'items':>7} {'items/sec':>12}")
+    for name, values in results.items():
+        print(
+            f"{name:<36} {values['best']:>10.4f} {values['mean']:>10.4f} "
+            f"{values['items']:>7} {values['items_per_second']:>12.0f}"
+        )
+
+    if args.output is not None:
+        report = {
+            "version": __version__,
+            "commit": git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "parameters": {
+                name: value
+                for name, value in vars(args).items()
+                if name not in ("output", "compare")
+            },
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf8") as file:
+            json.dump(report, file, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+    if args.compare is not None:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,39 @@ import argparse
 import json
 import logging
 import os
-import urllib3 as urllib
+import threading
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Union
 
+from .cache import CachedResponse, HttpCache, UpdateCheckpoint
+from .mirrors import MirrorResolver
+from .rate_limit import RateLimiter
 from .utils import Colors, Settings, Action
 
+if TYPE_CHECKING:
+    import urllib3 as urllib
+
+
+# The GitHub API used when $GITHUB_API_URL is not set
+DEFAULT_API_URL = "https://api.github.com"
+
+# Default number of actions `actions update` resolves at the same time
+DEFAULT_UPDATE_JOBS = 8
+
+# The ways to look up the latest versions of the actions
+BACKENDS = ("rest", "graphql", "mirror")
+
+# The number of repositories resolved by each GraphQL query
+GRAPHQL_BATCH_SIZE = 50
+
+# The latest release of one repository, peeled to its commit
+GRAPHQL_REPOSITORY = """
+  r{index}: repository(owner: $owner{index}, name: $name{index}) {{
+    latestRelease {{ tagName tagCommit {{ oid }} }}
+  }}"""
+
 
 class GitHubApiSchemaError(Exception):
     """A generic Exception to catch redefinitions of GitHub Api Schema changes."""
@@ -18,6 +44,17 @@ class GitHubApiSchemaError(Exception):
     pass
 
 
+def response_json(response) -> Any:
+    """Get the JSON body of a GitHub API response.
+
+    The body of a CachedResponse was parsed when it was cached, so a response
+    revalidated with a 304 Not Modified is not parsed again.
+    """
+    if isinstance(response, CachedResponse):
+        return response.json()
+    return json.loads(response.data)
+
+
 class ActionsCmd:
     """Command to manage the pre-approved list of Actions
 
@@ -31,15 +68,50 @@ class ActionsCmd:
 
     """
 
-    def __init__(self, settings: Optional[Settings] = None) -> None:
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        api_url: Optional[str] = None,
+        graphql_url: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        mirror_dir: Optional[str] = None,
+    ) -> None:
         """Initialize the ActionsCmd class.
 
         Args:
           settings:
             A Settings object that contains any default, overridden, or custom settings
             required anywhere in the application.
+          api_url:
+            The base URL of the GitHub API (default: $GITHUB_API_URL, or
+            https://api.github.com)
+          graphql_url:
+            The URL of the GitHub GraphQL API (default: $GITHUB_GRAPHQL_URL, or
+            the one next to api_url)
+          rate_limiter:
+            The scheduler of the requests to the GitHub API (default: a
+            RateLimiter with the default limits)
+          mirror_dir:
+            The directory of the local git mirrors of the action repositories
+            that the "mirror" backend reads (default: $BWWL_MIRROR_DIR)
         """
         self.settings = settings
+        self.api_url = (
+            api_url or os.getenv("GITHUB_API_URL") or DEFAULT_API_URL
+        ).rstrip("/")
+        if graphql_url is None and api_url is None:
+            graphql_url = os.getenv("GITHUB_GRAPHQL_URL")
+        if graphql_url is None:
+            # GitHub Enterprise Server serves REST at /api/v3 and GraphQL at /api/graphql
+            graphql_url = self.api_url.removesuffix("/v3") + "/graphql"
+        self.graphql_url = graphql_url
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.mirror_dir = mirror_dir or os.getenv("BWWL_MIRROR_DIR")
+        self.mirrors = MirrorResolver(self.mirror_dir) if self.mirror_dir else None
+        self.pool_size = 1
+        self.http_cache: Optional[HttpCache] = None
+        self._http: Optional["urllib.PoolManager"] = None
+        self._http_lock = threading.Lock()
 
     @staticmethod
     def extend_parser(
@@ -66,6 +138,45 @@ class ActionsCmd:
         parser_actions_update.add_argument(
             "-o", "--output", action="store", default="actions.json", help="output file"
         )
+        parser_actions_update.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="do not reuse the GitHub API responses cached by previous runs",
+        )
+        parser_actions_update.add_argument(
+            "--backend",
+            choices=BACKENDS,
+            default="rest",
+            help=(
+                "look up the latest releases with REST calls for each action, "
+                f"with GraphQL queries of up to {GRAPHQL_BATCH_SIZE} repositories "
+                "(needs $GITHUB_TOKEN), or resolve the latest tags from local git "
+                "mirrors (needs --mirror-dir)"
+            ),
+        )
+        parser_actions_update.add_argument(
+            "--mirror-dir",
+            default=None,
+            help=(
+                "directory of the bare git mirrors of the action repositories, as "
+                "<owner>/<repo>.git (default: $BWWL_MIRROR_DIR)"
+            ),
+        )
+        parser_actions_update.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=DEFAULT_UPDATE_JOBS,
+            help=(
+                "number of actions to look up at the same time "
+                f"(default: {DEFAULT_UPDATE_JOBS})"
+            ),
+        )
+        parser_actions_update.add_argument(
+            "--no-resume",
+            action="store_true",
+            help="look up every action again instead of resuming an interrupted update",
+        )
         parser_actions_add = subparsers_actions.add_parser(
             "add", help="add action to approved list"
         )
@@ -73,23 +184,127 @@ class ActionsCmd:
         parser_actions_add.add_argument(
             "-o", "--output", action="store", default="actions.json", help="output file"
         )
+        parser_actions_add.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="do not reuse the GitHub API responses cached by previous runs",
+        )
+        parser_actions_add.add_argument(
+            "--backend",
+            choices=BACKENDS,
+            default="rest",
+            help=(
+                "look up the latest releases with REST calls for each action, "
+                f"with GraphQL queries of up to {GRAPHQL_BATCH_SIZE} repositories "
+                "(needs $GITHUB_TOKEN), or resolve the latest tags from local git "
+                "mirrors (needs --mirror-dir)"
+            ),
+        )
+        parser_actions_add.add_argument(
+            "--mirror-dir",
+            default=None,
+            help=(
+                "directory of the bare git mirrors of the action repositories, as "
+                "<owner>/<repo>.git (default: $BWWL_MIRROR_DIR)"
+            ),
+        )
 
         return subparsers
 
-    def get_github_api_response(
-        self, url: str, action_name: str
-    ) -> Union[urllib.response.BaseHTTPResponse, None]:
-        """Call GitHub API with error logging without throwing an exception."""
+    def http(self) -> "urllib.PoolManager":
+        """Get the connection pool shared by every call to the GitHub API.
 
-        http = urllib.PoolManager()
+        The pool keeps up to pool_size connections to each host alive, so the
+        calls for every action reuse the same connections instead of opening a
+        new one (and doing a new TLS handshake) for each request. It is safe to
+        use from several threads.
+        """
+        with self._http_lock:
+            if self._http is None:
+                # urllib3 is only imported by the actions subcommand to keep lint fast
+                import urllib3 as urllib  # pylint: disable=import-outside-toplevel
+
+                self._http = urllib.PoolManager(maxsize=self.pool_size)
+            return self._http
+
+    def api_headers(self) -> dict[str, str]:
+        """Get the headers of every call to the GitHub API."""
         headers = {"user-agent": "bw-linter"}
 
         if os.getenv("GITHUB_TOKEN", None):
             headers["Authorization"] = f'Token {os.environ["GITHUB_TOKEN"]}'
+        return headers
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        body: Optional[str] = None,
+    ) -> "urllib.response.BaseHTTPResponse":
+        """Send a request to the GitHub API within its rate limit.
+
+        The request waits for the rate_limiter before it is sent, and is
+        retried after the delay the rate_limiter gives for rate limited
+        responses and server errors.
+
+        Returns:
+          The response, or the last one if the request could not succeed.
+        """
+        attempt = 0
+        while True:
+            self.rate_limiter.wait()
+            response = self.http().request(method, url, body=body, headers=headers)
+            self.rate_limiter.observe(response.headers)
+            delay = self.rate_limiter.retry_delay(
+                response.status, response.headers, attempt
+            )
+            if delay is None:
+                return response
+            logging.warning(
+                "GitHub API answered %s for %s, retrying in %.0f seconds",
+                response.status,
+                url,
+                delay,
+            )
+            self.rate_limiter.sleep(delay)
+            attempt += 1
 
-        response = http.request("GET", url, headers=headers)
+    def get_github_api_response(
+        self, url: str, action_name: str
+    ) -> Union["urllib.response.BaseHTTPResponse", None]:
+        """Call GitHub API with error logging without throwing an exception.
 
-        if response.status == 403 and response.reason == "rate limit exceeded":
+        With an http_cache, a cached response is revalidated with a conditional
+        request and returned if GitHub answers 304 Not Modified. Responses that
+        are cached are returned as CachedResponses, whose body is only parsed
+        once (see response_json()).
+        """
+        headers = self.api_headers()
+
+        cached = self.http_cache.get(url) if self.http_cache is not None else None
+        if cached is not None:
+            headers.update(cached.validators())
+
+        response = self.request("GET", url, headers)
+
+        if self.http_cache is not None:
+            if response.status == 304 and cached is not None:
+                self.http_cache.hit(url)
+                return cached
+            self.http_cache.miss()
+            if response.status == 200:
+                stored = self.http_cache.set(url, response)
+                if stored is not None:
+                    return stored
+
+        if response.status == 429 or (
+            response.status == 403
+            and (
+                response.reason == "rate limit exceeded"
+                or response.headers.get("X-RateLimit-Remaining") == "0"
+            )
+        ):
             logging.error(
                 "Failed to call GitHub API for action: %s due to rate limit exceeded.",
                 action_name,
@@ -109,7 +324,7 @@ class ActionsCmd:
     def exists(self, action: Action) -> bool:
         """Takes an action id and checks if the action repository exists."""
 
-        url = f"https://api.github.com/repos/{action.name}"
+        url = f"{self.api_url}/repos/{action.name}"
         response = self.get_github_api_response(url, action.name)
 
         if response is None:
@@ -129,42 +344,47 @@ class ActionsCmd:
         try:
             # Get tag from latest release
             response = self.get_github_api_response(
-                f"https://api.github.com/repos/{action.name}/releases/latest",
+                f"{self.api_url}/repos/{action.name}/releases/latest",
                 action.name,
             )
-            if response is not None and response.status != 404:
-                tag_name = json.loads(response.data)["tag_name"]
+            if response is None or response.status >= 500:
+                # Rate limited or failed after the retries of request()
+                return None
+            if response.status != 404:
+                tag_name = response_json(response)["tag_name"]
 
                 # Get the URL to the commit for the tag
                 url = (
-                    f"https://api.github.com/repos/{action.name}"
-                    f"/git/ref/tags/{tag_name}"
+                    f"{self.api_url}/repos/{action.name}/git/ref/tags/{tag_name}"
                 )
                 response = self.get_github_api_response(url, action.name)
 
                 if response is None or response.status != 200:
                     return None
 
-                if json.loads(response.data)["object"]["type"] != "commit":
-                    url = json.loads(response.data)["object"]["url"]
+                tag_ref = response_json(response)
+                if tag_ref["object"]["type"] != "commit":
+                    url = tag_ref["object"]["url"]
                     # Follow the URL and get the commit sha for tags
                     response = self.get_github_api_response(url, action.name)
                     if not response:
                         return None
+                    tag_ref = response_json(response)
 
-                sha = json.loads(response.data)["object"]["sha"]
+                sha = tag_ref["object"]["sha"]
             else:
                 # Get tag from latest tag
                 response = self.get_github_api_response(
-                    f"https://api.github.com/repos/{action.name}/tags",
+                    f"{self.api_url}/repos/{action.name}/tags",
                     action.name,
                 )
 
                 if response is None or response.status != 200:
                     return None
 
-                sha = json.loads(response.data)[0]["commit"]["sha"]
-                tag_name = json.loads(response.data)[0]["name"]
+                tags = response_json(response)
+                sha = tags[0]["commit"]["sha"]
+                tag_name = tags[0]["name"]
         except KeyError as err:
             raise GitHubApiSchemaError(
                 f"Error with the GitHub API Response Schema for either /releases or"
@@ -173,6 +393,79 @@ class ActionsCmd:
 
         return Action(name=action.name, version=tag_name, sha=sha)
 
+    def get_latest_versions_graphql(
+        self, repo_names: list[str]
+    ) -> dict[str, tuple[bool, Optional[Action]]]:
+        """Get the latest versions of many repositories with one GraphQL query.
+
+        The query gets the tag of the latest release of each repository and the
+        commit it points to, which the REST API needs two or three calls per
+        repository for. Repositories without a release are looked up with the
+        REST API, which falls back to their latest tag, and so is the whole
+        batch if the query fails.
+
+        Args:
+          repo_names:
+            The owner/repo names of up to GRAPHQL_BATCH_SIZE repositories
+
+        Returns:
+          Whether each repository exists, and its latest version (like
+          get_latest_with_full_path()).
+        """
+        variables = {}
+        for index, repo_name in enumerate(repo_names):
+            variables[f"owner{index}"], _, variables[f"name{index}"] = repo_name.partition("/")
+        query = "query({}) {{{}\n}}".format(
+            ", ".join(f"${name}: String!" for name in variables),
+            "".join(GRAPHQL_REPOSITORY.format(index=index) for index in range(len(repo_names))),
+        )
+
+        response = self.request(
+            "POST",
+            self.graphql_url,
+            {**self.api_headers(), "Content-Type": "application/json"},
+            body=json.dumps({"query": query, "variables": variables}),
+        )
+        data = None
+        if response.status == 200:
+            data = response_json(response).get("data")
+        if data is None:
+            logging.error(
+                "Failed to query the GitHub GraphQL API (%s), using the REST API for: %s",
+                response.status,
+                ", ".join(repo_names),
+            )
+            data = {}
+
+        results = {}
+        for index, repo_name in enumerate(repo_names):
+            alias = f"r{index}"
+            if alias not in data:
+                results[repo_name] = self.get_latest_with_full_path(Action(name=repo_name))
+            elif data[alias] is None:
+                # The repository does not exist
+                results[repo_name] = (False, None)
+            elif data[alias].get("latestRelease") is None:
+                results[repo_name] = (
+                    True,
+                    self.get_latest_version(Action(name=repo_name)),
+                )
+            else:
+                release = data[alias]["latestRelease"]
+                try:
+                    latest = Action(
+                        name=repo_name,
+                        version=release["tagName"],
+                        sha=release["tagCommit"]["oid"],
+                    )
+                except (KeyError, TypeError) as err:
+                    raise GitHubApiSchemaError(
+                        f"Error with the GitHub GraphQL API Response Schema for "
+                        f"latestRelease: {err}"
+                    ) from err
+                results[repo_name] = (True, latest)
+        return results
+
     def save_actions(self, updated_actions: dict[str, Action], filename: str) -> None:
         """Save Actions to disk.
 
@@ -186,14 +479,37 @@ class ActionsCmd:
                 json.dumps(converted_updated_actions, indent=2, sort_keys=True)
             )
 
-    def add(self, new_action_name: str, filename: str) -> int:
+    def use_http_cache(self, use_cache: bool) -> None:
+        """Cache the GitHub API responses of this run on disk, or stop caching them."""
+        self.http_cache = HttpCache() if use_cache else None
+
+    def close_http_cache(self) -> None:
+        """Evict the old HTTP cache entries and print the cache usage of the run."""
+        if self.http_cache is not None:
+            self.http_cache.prune()
+            print(self.http_cache.stats())
+
+    def add(
+        self,
+        new_action_name: str,
+        filename: str,
+        use_cache: bool = False,
+        backend: str = "rest",
+    ) -> int:
         """Subcommand to add a new Action to the list of approved Actions.
 
         'actions add' will add an Action and all of its metadata and dump all
         approved actions (including the new one) to either the default JSON file
         or the one provided by '--output'
+
+        With use_cache, the GitHub API responses are revalidated against the
+        HttpCache instead of downloaded again. With the "graphql" backend, the
+        latest release is looked up with a GraphQL query, and with the
+        "mirror" backend, the latest tag is read from the local git mirrors.
         """
         print("Actions: add")
+        self.use_http_cache(use_cache)
+        backend = self.check_backend(backend)
         updated_actions = self.settings.approved_actions
 
         # For actions in subdirectories (multi-action repos), we need to check
@@ -207,41 +523,243 @@ class ActionsCmd:
         else:
             repo_action = Action(name=new_action_name)
 
-        if self.exists(repo_action):
-            latest = self.get_latest_version(repo_action)
+        if backend == "graphql":
+            exists, latest = self.get_latest_versions_graphql([repo_action.name])[
+                repo_action.name
+            ]
+        elif backend == "mirror":
+            exists, latest = self.get_latest_from_mirror(Action(name=new_action_name))
+        else:
+            exists = self.exists(repo_action)
+            latest = self.get_latest_version(repo_action) if exists else None
+
+        return_code = 0
+        if exists:
             if latest:
                 # Store with the full action path, not just the repo path
                 updated_actions[new_action_name] = Action(
                     name=new_action_name, version=latest.version, sha=latest.sha
                 )
+            elif backend == "mirror":
+                # A repository that is not mirrored may still exist
+                reason = (
+                    f"no mirror in {self.mirror_dir}"
+                    if self.mirrors.mirror(repo_action.name) is None
+                    else "could not get the latest version"
+                )
+                print(f" - {new_action_name} \033[{Colors.red}failed\033[0m: {reason}")
+                return_code = 1
         else:
             print(f" - {new_action_name} \033[{Colors.red}not found\033[0m")
 
         self.save_actions(updated_actions, filename)
-        return 0
+        self.close_http_cache()
+        return return_code
+
+    def get_latest_with_full_path(
+        self, action: Action
+    ) -> tuple[bool, Optional[Action]]:
+        """Get the latest version of an approved action, under its full path.
+
+        For actions in subdirectories (multi-action repos), the repository is
+        checked at the owner/repo level, but the result keeps the full path.
+
+        Returns:
+          Whether the repository of the action exists, and its latest version
+          (None if the repository does not exist).
+        """
+        repo_path_parts = action.name.split("/")
+        if len(repo_path_parts) > 2:
+            # Extract owner/repo for API calls
+            repo_action = Action(name="/".join(repo_path_parts[:2]))
+        else:
+            repo_action = action
+
+        if not self.exists(repo_action):
+            return False, None
+        return True, self.get_latest_version(repo_action)
+
+    def get_latest_from_mirror(
+        self, action: Action
+    ) -> tuple[bool, Optional[Action]]:
+        """Get the latest version of an approved action from the local git mirrors.
+
+        Unlike the GitHub API, a missing mirror does not mean that the action
+        does not exist anymore, so it is reported as a failed lookup.
+
+        Returns:
+          True, and the latest version under the full path of the action (None
+          if its repository is not mirrored or has no version tag).
+        """
+        repo_name = "/".join(action.name.split("/")[:2])
+        exists, latest = self.mirrors.get_latest_version(repo_name)
+        if not exists:
+            logging.error("No mirror of %s in %s", repo_name, self.mirror_dir)
+            return True, None
+        if latest is None:
+            return True, None
+        return True, Action(name=action.name, version=latest.version, sha=latest.sha)
+
+    def check_backend(self, backend: str) -> str:
+        """Get the backend to use, as GraphQL is only available with a token.
+
+        Raises:
+          ValueError: if the mirror backend is used without a mirror directory.
+        """
+        if backend == "mirror" and self.mirrors is None:
+            raise ValueError(
+                "The mirror backend needs a directory of mirrors "
+                "(--mirror-dir or $BWWL_MIRROR_DIR)"
+            )
+        if backend == "graphql" and not os.getenv("GITHUB_TOKEN"):
+            logging.warning("The GraphQL backend needs $GITHUB_TOKEN, using the REST API")
+            return "rest"
+        return backend
+
+    def get_latest_versions(
+        self,
+        actions: list[Action],
+        executor: ThreadPoolExecutor,
+        backend: str,
+        checkpoint: Optional[UpdateCheckpoint] = None,
+    ) -> Iterable[tuple[bool, Optional[Action]]]:
+        """Get the latest version of every action, in the order of the actions.
+
+        Args:
+          actions:
+            The approved actions
+          executor:
+            The threads to send the requests from
+          backend:
+            "rest" to look up each action with get_latest_with_full_path(), or
+            "graphql" to look up their repositories in batches of
+            GRAPHQL_BATCH_SIZE with get_latest_versions_graphql(), or "mirror"
+            to read them from the local git mirrors
+          checkpoint:
+            The results of a previous run, which are not looked up again, and
+            where the new results are recorded as soon as they are found
+
+        Returns:
+          Whether the repository of each action exists, and its latest version.
+        """
+        done = dict(checkpoint.results) if checkpoint is not None else {}
+        pending = [action for action in actions if action.name not in done]
+
+        def record(
+            action: Action, result: tuple[bool, Optional[Action]]
+        ) -> tuple[bool, Optional[Action]]:
+            if checkpoint is not None:
+                checkpoint.record(action.name, *result)
+            return result
+
+        if backend != "graphql":
+            get_latest = (
+                self.get_latest_from_mirror
+                if backend == "mirror"
+                else self.get_latest_with_full_path
+            )
+            # map() yields the results in the order of the actions
+            results = executor.map(
+                lambda action: record(action, get_latest(action)), pending
+            )
+        else:
+            repo_of = {
+                action.name: "/".join(action.name.split("/")[:2]) for action in pending
+            }
+            actions_of: dict[str, list[Action]] = {}
+            for action in pending:
+                actions_of.setdefault(repo_of[action.name], []).append(action)
+            repo_names = list(actions_of)
+            batches = [
+                repo_names[start : start + GRAPHQL_BATCH_SIZE]
+                for start in range(0, len(repo_names), GRAPHQL_BATCH_SIZE)
+            ]
+
+            def lookup(batch: list[str]) -> dict[str, tuple[bool, Optional[Action]]]:
+                latest = self.get_latest_versions_graphql(batch)
+                for repo_name, result in latest.items():
+                    for action in actions_of[repo_name]:
+                        record(action, result)
+                return latest
+
+            latest = {}
+            for batch_results in executor.map(lookup, batches):
+                latest.update(batch_results)
+            results = [latest[repo_of[action.name]] for action in pending]
+
+        pending_results = iter(results)
+        return (
+            done[action.name] if action.name in done else next(pending_results)
+            for action in actions
+        )
 
-    def update(self, filename: str) -> int:
+    def update(
+        self,
+        filename: str,
+        jobs: int = 1,
+        use_cache: bool = False,
+        backend: str = "rest",
+        resume: bool = False,
+    ) -> int:
         """Subcommand to update all of the versions of the approved actions.
 
         'actions update' will update all of the approved actions to the newest
         version and dump all of the new data to either the default JSON file or
         the one provided by '--output'
+
+        The actions are looked up by a pool of `jobs` threads that share the
+        connections to GitHub. They are reported and saved in the order of the
+        approved actions whatever the order their lookups finish in. With
+        use_cache, the GitHub API responses are revalidated against the
+        HttpCache instead of downloaded again. With the "graphql" backend,
+        the latest releases are looked up with batched GraphQL queries, and
+        with the "mirror" backend, the latest tags are read from the local git
+        mirrors without any network access.
+
+        The lookups are checkpointed to disk as they finish, and with resume,
+        the actions that an interrupted update already looked up are not looked
+        up again. Actions whose latest version could not be found (e.g. once the
+        rate limit is exhausted) keep their current version, and are looked up
+        again by the next update.
         """
         print("Actions: update")
-        updated_actions = {}
-        for action in self.settings.approved_actions.values():
-            # For actions in subdirectories (multi-action repos), we need to check
-            # the repository at owner/repo level, but store the full path
-            repo_path_parts = action.name.split("/")
-            if len(repo_path_parts) > 2:
-                # Extract owner/repo for API calls
-                repo_name = "/".join(repo_path_parts[:2])
-                repo_action = Action(name=repo_name)
-            else:
-                repo_action = action
+        self.use_http_cache(use_cache)
+        backend = self.check_backend(backend)
+        actions = list(self.settings.approved_actions.values())
+        jobs = max(1, min(jobs, len(actions)))
+        self.pool_size = jobs
+
+        checkpoint = UpdateCheckpoint(
+            self.mirror_dir if backend == "mirror" else self.api_url, actions
+        )
+        if resume:
+            resumed = checkpoint.load()
+            if resumed:
+                print(f"Resuming: {resumed} action(s) already looked up")
+
+        # urllib3 is only imported by the actions subcommand to keep lint fast
+        from urllib3.exceptions import (  # pylint: disable=import-outside-toplevel
+            HTTPError,
+        )
 
-            if self.exists(repo_action):
-                latest_release = self.get_latest_version(repo_action)
+        updated_actions = {}
+        failed = 0
+        executor = ThreadPoolExecutor(max_workers=jobs)
+        completed = False
+        try:
+            results = self.get_latest_versions(actions, executor, backend, checkpoint)
+            for action, (exists, latest_release) in zip(actions, results):
+                if not exists:
+                    continue
+                if latest_release is None:
+                    print(
+                        f" - {action.name} \033[{Colors.red}failed\033[0m: "
+                        "could not get the latest version"
+                    )
+                    # Keep the current version until the next update finds one
+                    updated_actions[action.name] = action
+                    failed += 1
+                    continue
                 # Create Action with original full path for comparison
                 latest_with_full_path = Action(
                     name=action.name,  # Use original full path
@@ -259,11 +777,24 @@ class ActionsCmd:
                 else:
                     print(f" - {action.name} \033[{Colors.green}ok\033[0m")
                 # Store with the original full action path
-                updated_actions[action.name] = Action(
-                    name=action.name,
-                    version=latest_release.version,
-                    sha=latest_release.sha,
-                )
+                updated_actions[action.name] = latest_with_full_path
+            completed = True
+        except (KeyboardInterrupt, HTTPError, OSError):
+            print("Update interrupted, rerun it to resume")
+            raise
+        finally:
+            if not completed:
+                # Keep what was looked up for the next run, without waiting for
+                # the lookups that have not started
+                executor.shutdown(cancel_futures=True)
+                checkpoint.save()
+        executor.shutdown()
 
         self.save_actions(updated_actions, filename)
+        self.close_http_cache()
+        if failed:
+            checkpoint.save()
+            print(f"{failed} action(s) failed, rerun the update to retry them")
+            return 1
+        checkpoint.clear()
         return 0
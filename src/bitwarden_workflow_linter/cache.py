@@ -0,0 +1,413 @@
+"""Module providing the persistent caches of lint results and GitHub API responses."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from dataclasses import asdict
+from typing import Any, Callable, Optional
+
+from .__about__ import __version__
+from .utils import (
+    Action,
+    LintFinding,
+    LintLevels,
+    Settings,
+    cache_dir,
+    write_json_atomic,
+)
+
+
+class ResultCache:
+    """Cache of the findings of workflow files, stored on disk between runs.
+
+    Entries are keyed by the SHA-256 of the file path and content together with
+    the fingerprint of the effective Settings, the version of bwwl and the other
+    inputs of the Rules (ie. the configuration files of the external tools).
+    Changing a workflow, the enabled rules, their levels, the approved actions,
+    any of the external tool versions or configurations therefore never returns
+    stale findings, and findings that name their file are never reported for
+    a copy of it elsewhere.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        directory: Optional[str] = None,
+        inputs: Optional[Callable[[str, bytes], list[str]]] = None,
+    ) -> None:
+        """Initialize the ResultCache.
+
+        Args:
+          settings:
+            The Settings that the findings are produced with
+          directory:
+            Where to store the cached results (defaults to <cache_dir>/results)
+          inputs:
+            Get what else the findings of a file depend on from its name and
+            content (see Rules.cache_inputs)
+        """
+        self.directory = directory or os.path.join(cache_dir(), "results")
+        self.inputs = inputs
+        self.prefix = hashlib.sha256(
+            f"{__version__}\0{settings.fingerprint()}\0".encode()
+        ).digest()
+        self.hits = 0
+        self.misses = 0
+        self._keys: dict[str, str] = {}
+
+    def key(self, filename: str) -> str:
+        """Get the cache key of a file from its path and current content."""
+        if filename not in self._keys:
+            with open(filename, "rb") as file:
+                content = file.read()
+            digest = hashlib.sha256(self.prefix)
+            digest.update(os.path.realpath(filename).encode() + b"\0")
+            for value in self.inputs(filename, content) if self.inputs else []:
+                digest.update(value.encode() + b"\0")
+            digest.update(b"\0" + content)
+            self._keys[filename] = digest.hexdigest()
+        return self._keys[filename]
+
+    def path(self, filename: str) -> str:
+        """Get the path of the cache entry of a file."""
+        key = self.key(filename)
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, filename: str) -> Optional[list[LintFinding]]:
+        """Get the cached findings of a file.
+
+        Returns:
+          The findings, or None if the file has not been linted with the same
+          content and settings before.
+        """
+        try:
+            with open(self.path(filename), encoding="utf8") as file:
+                entries = json.load(file)
+            findings = [
+                LintFinding(entry["description"], LintLevels[entry["level"]])
+                for entry in entries
+            ]
+        except (OSError, ValueError, KeyError, TypeError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return findings
+
+    def set(self, filename: str, findings: list[LintFinding]) -> None:
+        """Store the findings of a file."""
+        entries = [
+            {"description": finding.description, "level": finding.level.name}
+            for finding in findings
+        ]
+        try:
+            write_json_atomic(self.path(filename), entries)
+        except OSError:
+            pass
+
+    def forget(self, filename: str) -> None:
+        """Forget the content hash of a file after it has been modified."""
+        self._keys.pop(filename, None)
+
+    def stats(self) -> str:
+        """Summarize the cache usage of this run."""
+        return f"Result cache: {self.hits} hit(s), {self.misses} miss(es)"
+
+
+# How long an HTTP cache entry is kept after it was last used, in seconds
+HTTP_CACHE_TTL = 30 * 24 * 60 * 60
+
+# The total size of the HTTP cache entries above which the least recently used
+# entries are evicted, in bytes
+HTTP_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+
+class CachedResponse:
+    """A GitHub API response stored in the HttpCache.
+
+    It has the status, reason, headers and data attributes of the urllib3
+    responses that ActionsCmd reads, so it can be used in their place. The body
+    is kept parsed, so a response served again after a 304 Not Modified is not
+    parsed again (see json()).
+    """
+
+    def __init__(
+        self, parsed: Any, etag: Optional[str] = None, last_modified: Optional[str] = None
+    ) -> None:
+        self.status = 200
+        self.reason = "OK"
+        self.parsed = parsed
+        self.etag = etag
+        self.last_modified = last_modified
+        self.headers = {
+            name: value
+            for name, value in (("ETag", etag), ("Last-Modified", last_modified))
+            if value is not None
+        }
+
+    @property
+    def data(self) -> bytes:
+        """The body of the response, serialized again from its parsed JSON."""
+        return json.dumps(self.parsed).encode()
+
+    def json(self) -> Any:
+        """Get the parsed JSON body of the response."""
+        return self.parsed
+
+    def validators(self) -> dict[str, str]:
+        """Get the headers that make a request conditional on this response."""
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """Cache of GitHub API responses with their validators, stored on disk between runs.
+
+    Entries are keyed by the SHA-256 of the URL and keep the parsed JSON body
+    of the response with its ETag and Last-Modified headers. Requests for a cached URL
+    are sent with If-None-Match / If-Modified-Since, and a 304 Not Modified
+    answer (which does not count against the GitHub API rate limit) is served
+    from the cache. Entries that were not used for `ttl` seconds are dropped,
+    and prune() evicts the least recently used entries above `max_bytes`.
+
+    It is safe to use from several threads.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        ttl: float = HTTP_CACHE_TTL,
+        max_bytes: int = HTTP_CACHE_MAX_BYTES,
+    ) -> None:
+        """Initialize the HttpCache.
+
+        Args:
+          directory:
+            Where to store the cached responses (defaults to <cache_dir>/http)
+          ttl:
+            Seconds after its last use that an entry expires
+          max_bytes:
+            The total size of the entries that prune() evicts down to
+        """
+        self.directory = directory or os.path.join(cache_dir(), "http")
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def path(self, url: str) -> str:
+        """Get the path of the cache entry of a URL."""
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Get the cached response of a URL, if it has not expired."""
+        path = self.path(url)
+        try:
+            if time.time() - os.stat(path).st_mtime > self.ttl:
+                os.remove(path)
+                return None
+            with open(path, encoding="utf8") as file:
+                entry = json.load(file)
+            return CachedResponse(
+                entry["json"], entry.get("etag"), entry.get("last_modified")
+            )
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+    def set(self, url: str, response) -> Optional[CachedResponse]:
+        """Store a successful response, if it has an ETag or Last-Modified header.
+
+        Returns:
+          The stored response, with its body parsed, or None if it was not
+          stored (no validators or a body that is not JSON).
+        """
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag is None and last_modified is None:
+            return None
+        try:
+            cached = CachedResponse(json.loads(response.data), etag, last_modified)
+        except ValueError:
+            return None
+        entry = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "json": cached.parsed,
+        }
+        try:
+            write_json_atomic(self.path(url), entry)
+        except OSError:
+            pass
+        return cached
+
+    def hit(self, url: str) -> None:
+        """Count a response served from the cache and mark its entry as used."""
+        with self._lock:
+            self.hits += 1
+        try:
+            os.utime(self.path(url))
+        except OSError:
+            pass
+
+    def miss(self) -> None:
+        """Count a response that had to be downloaded."""
+        with self._lock:
+            self.misses += 1
+
+    def prune(self) -> None:
+        """Remove the expired entries, then the least recently used ones above max_bytes."""
+        entries = []
+        now = time.time()
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                    if now - stat.st_mtime > self.ttl:
+                        os.remove(path)
+                    else:
+                        entries.append((stat.st_mtime, stat.st_size, path))
+                except OSError:
+                    continue
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def stats(self) -> str:
+        """Summarize the cache usage of this run."""
+        return f"HTTP cache: {self.hits} hit(s), {self.misses} miss(es)"
+
+
+# How long the progress of an interrupted `actions update` can be resumed, in
+# seconds, before the versions it found are too old to be trusted
+CHECKPOINT_TTL = 24 * 60 * 60
+
+# The number of new results after which a checkpoint is written to disk
+CHECKPOINT_INTERVAL = 25
+
+
+class UpdateCheckpoint:
+    """The latest versions found by an `actions update`, saved to resume it.
+
+    A run that stops early (rate limit exhausted, network error, Ctrl-C)
+    leaves the lookups it finished on disk, so the next run with the same
+    approved actions only looks up the remaining ones. Checkpoints are keyed by
+    where the actions are looked up (API URL or mirror directory), the approved
+    actions and the version of bwwl, and are ignored once older than `ttl`
+    seconds. Failed lookups are not recorded, so they are retried.
+
+    It is safe to use from several threads.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        actions: list[Action],
+        directory: Optional[str] = None,
+        ttl: float = CHECKPOINT_TTL,
+        interval: int = CHECKPOINT_INTERVAL,
+    ) -> None:
+        """Initialize the UpdateCheckpoint.
+
+        Args:
+          source:
+            Where the actions are looked up: the base URL of the GitHub API,
+            or the directory of the git mirrors
+          actions:
+            The approved actions being updated
+          directory:
+            Where to store the checkpoints (defaults to <cache_dir>/update)
+          ttl:
+            Seconds after its creation that a checkpoint can no longer be resumed
+          interval:
+            The number of new results between two writes of the checkpoint
+        """
+        self.directory = directory or os.path.join(cache_dir(), "update")
+        self.ttl = ttl
+        self.interval = interval
+        key = json.dumps(
+            [__version__, source, [asdict(action) for action in actions]],
+            sort_keys=True,
+        )
+        self.path = os.path.join(
+            self.directory, f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+        )
+        self.created = time.time()
+        self.results: dict[str, tuple[bool, Optional[Action]]] = {}
+        self._unsaved = 0
+        self._lock = threading.Lock()
+
+    def load(self) -> int:
+        """Load the results of a previous run of the same update.
+
+        Returns:
+          The number of actions that do not need to be looked up again.
+        """
+        try:
+            with open(self.path, encoding="utf8") as file:
+                entry = json.load(file)
+            if time.time() - entry["created"] > self.ttl:
+                self.clear()
+                return 0
+            results = {
+                name: (exists, Action(**latest) if latest is not None else None)
+                for name, (exists, latest) in entry["results"].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            return 0
+
+        with self._lock:
+            self.created = entry["created"]
+            self.results = results
+        return len(results)
+
+    def record(self, name: str, exists: bool, latest: Optional[Action]) -> None:
+        """Record the result of the lookup of an action, unless it failed."""
+        if exists and latest is None:
+            return
+        with self._lock:
+            self.results[name] = (exists, latest)
+            self._unsaved += 1
+            if self._unsaved < self.interval:
+                return
+        self.save()
+
+    def save(self) -> None:
+        """Write the recorded results to disk."""
+        with self._lock:
+            entry = {
+                "created": self.created,
+                "results": {
+                    name: [exists, asdict(latest) if latest is not None else None]
+                    for name, (exists, latest) in self.results.items()
+                },
+            }
+            self._unsaved = 0
+            try:
+                write_json_atomic(self.path, entry)
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """Remove the checkpoint once the update is complete."""
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -1,16 +1,51 @@
 """This is the entrypoint module for the workflow-linter CLI."""
 
 import argparse
+import importlib
 import sys
 
 from typing import List, Optional
 
-from .actions import ActionsCmd
-from .lint import LinterCmd
-from .utils import Settings
 from .__about__ import __version__
 
-local_settings = Settings.factory()
+# The module, class and help of each subcommand. Only the module of the
+# subcommand being run is imported, so `bwwl --version`, `bwwl --help` and the
+# daemon client do not pay for the dependencies of every subcommand.
+SUBCOMMANDS = {
+    "lint": (
+        ".lint",
+        "LinterCmd",
+        "Verify that a GitHub Action Workflow follows all of the Rules.",
+    ),
+    "actions": (
+        ".actions",
+        "ActionsCmd",
+        "!!BETA!!\nAdd or Update Actions in the pre-approved list.",
+    ),
+    "daemon": (
+        ".daemon",
+        "DaemonCmd",
+        "Keep the linter loaded in the background to speed up lint.",
+    ),
+}
+
+
+def find_subcommand(input_args: List[str]) -> Optional[str]:
+    """Find the subcommand in the arguments.
+
+    The top-level options do not take values, so the subcommand is the first
+    argument that is not an option.
+    """
+    for arg in input_args:
+        if not arg.startswith("-"):
+            return arg if arg in SUBCOMMANDS else None
+    return None
+
+
+def load_subcommand(name: str) -> type:
+    """Import the class that implements a subcommand."""
+    module_name, class_name, _ = SUBCOMMANDS[name]
+    return getattr(importlib.import_module(module_name, __package__), class_name)
 
 
 def main(input_args: Optional[List[str]] = None) -> int:
@@ -20,9 +55,6 @@ def main(input_args: Optional[List[str]] = None) -> int:
     utility also provides other subcommands to assist with other workflow
     maintenance tasks; such as maintaining the list of approved GitHub Actions.
     """
-    linter_cmd = LinterCmd(settings=local_settings)
-    actions_cmd = ActionsCmd(settings=local_settings)
-
     # Read arguments from command line.
     parser = argparse.ArgumentParser(prog="bwwl")
     parser.add_argument(
@@ -31,24 +63,97 @@ def main(input_args: Optional[List[str]] = None) -> int:
     parser.add_argument("-v", "--verbose", action="store_true", default=False)
     subparsers = parser.add_subparsers(required=True, dest="command")
 
-    subparsers = LinterCmd.extend_parser(subparsers)
-    subparsers = ActionsCmd.extend_parser(subparsers)
-
     # Pull the arguments from the command line
     input_args = sys.argv[1:]
+
+    # Only the subcommand being run gets its full set of options
+    command = find_subcommand(input_args)
+    for name, (_, _, help_text) in SUBCOMMANDS.items():
+        if name == command:
+            subparsers = load_subcommand(name).extend_parser(subparsers)
+        else:
+            subparsers.add_parser(name, help=help_text)
+
     if not input_args:
         raise SystemExit(parser.print_help())
 
     args = parser.parse_args(input_args)
+
+    if args.command == "daemon":
+        daemon_cmd = load_subcommand("daemon")()
+        if args.daemon_command == "start":
+            return daemon_cmd.start(args.foreground, args.timeout)
+        if args.daemon_command == "stop":
+            return daemon_cmd.stop()
+        if args.daemon_command == "status":
+            return daemon_cmd.status()
+
+    if args.command == "lint" and not args.watch and not args.profile:
+        from .daemon import lint_with_daemon  # pylint: disable=import-outside-toplevel
+
+        result = lint_with_daemon(
+            {
+                "input_files": [file for file_list in args.files for file in file_list],
+                "strict": args.strict,
+                "errors_only": args.errors_only,
+                "jobs": args.jobs,
+                "use_cache": not args.no_cache,
+                "changed_since": args.changed_since,
+                "fast_yaml": args.fast_yaml,
+            }
+        )
+        if result is not None:
+            output, return_code = result
+            sys.stdout.write(output)
+            return return_code
+
+    from .utils import Settings  # pylint: disable=import-outside-toplevel
+
+    local_settings = Settings.factory()
+
+    if args.command == "lint":
+        linter_cmd = load_subcommand("lint")(settings=local_settings)
+
+    if args.command == "lint" and args.watch:
+        return linter_cmd.watch(
+            [file for file_list in args.files for file in file_list],
+            args.strict,
+            args.errors_only,
+            args.jobs,
+            not args.no_cache,
+            fast_yaml=args.fast_yaml,
+        )
+
     if args.command == "lint":
-        return linter_cmd.run([file for file_list in args.files for file in file_list], args.strict, args.errors_only)
+        return linter_cmd.run(
+            [file for file_list in args.files for file in file_list],
+            args.strict,
+            args.errors_only,
+            args.jobs,
+            not args.no_cache,
+            args.changed_since,
+            args.profile,
+            args.profile_output,
+            args.fast_yaml,
+        )
 
     if args.command == "actions":
+        actions_cmd = load_subcommand("actions")(
+            settings=local_settings, mirror_dir=args.mirror_dir
+        )
         print(f'{"-"*50}\n!!bwwl actions is in BETA!!\n{"-"*50}')
         if args.actions_command == "add":
-            return actions_cmd.add(args.name, args.output)
+            return actions_cmd.add(
+                args.name, args.output, not args.no_cache, args.backend
+            )
         if args.actions_command == "update":
-            return actions_cmd.update(args.output)
+            return actions_cmd.update(
+                args.output,
+                args.jobs,
+                not args.no_cache,
+                args.backend,
+                not args.no_resume,
+            )
 
     return -1
 
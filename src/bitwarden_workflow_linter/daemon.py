@@ -0,0 +1,377 @@
+"""Module providing a persistent lint daemon and the thin client that talks to it.
+
+`bwwl daemon start` keeps a LinterCmd with its Settings and Rules loaded in a
+background process that listens on a Unix socket in the cache directory. While
+it is running, `bwwl lint` sends its arguments to the daemon and prints the
+output it gets back instead of loading everything again.
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from typing import Any, Callable, Optional
+
+from .__about__ import __version__
+from .tools import forget_stale_tools
+from .utils import Settings, cache_dir
+
+# Seconds the client waits to connect to the daemon before linting in-process.
+CONNECT_TIMEOUT = 1.0
+
+# Seconds `bwwl daemon start` waits for the daemon to answer.
+START_TIMEOUT = 15.0
+
+
+class DaemonError(Exception):
+    """Exception to indicate that the daemon could not be reached."""
+
+    pass
+
+
+def is_supported() -> bool:
+    """Check if the platform supports Unix domain sockets."""
+    return hasattr(socket, "AF_UNIX")
+
+
+def socket_path(cwd: Optional[str] = None) -> str:
+    """Get the path of the socket of the daemon serving a working directory.
+
+    Settings are loaded relative to the working directory, so each directory
+    gets its own daemon.
+    """
+    directory = os.path.realpath(cwd or os.getcwd())
+    key = hashlib.sha256(directory.encode()).hexdigest()[:16]
+    return os.path.join(cache_dir(), "daemon", f"{key}.sock")
+
+
+def send_request(
+    request: dict[str, Any], path: Optional[str] = None, timeout: Optional[float] = None
+) -> dict[str, Any]:
+    """Send a request to the daemon and wait for its response.
+
+    Args:
+      request:
+        The JSON serializable request
+      path:
+        The path of the socket of the daemon (defaults to the current directory's)
+      timeout:
+        The number of seconds to wait for the response (forever if None)
+
+    Returns:
+      The response of the daemon.
+    """
+    if not is_supported():
+        raise DaemonError("Unix domain sockets are not supported on this platform")
+
+    path = path or socket_path()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(CONNECT_TIMEOUT)
+            client.connect(path)
+            client.settimeout(timeout)
+            client.sendall(json.dumps(request).encode() + b"\n")
+            client.shutdown(socket.SHUT_WR)
+            data = b"".join(iter(lambda: client.recv(65536), b""))
+        return json.loads(data)
+    except (OSError, ValueError) as err:
+        raise DaemonError(f"Failed to reach the daemon at {path}: {err}") from err
+
+
+def lint_with_daemon(arguments: dict[str, Any]) -> Optional[tuple[str, int]]:
+    """Lint through the daemon of the current directory if it is running.
+
+    Args:
+      arguments:
+        The keyword arguments of LinterCmd.run
+
+    Returns:
+      The output and return code of the lint, or None if the daemon is not
+      running, was started with other settings or failed to lint.
+    """
+    path = socket_path()
+    if not is_supported() or not os.path.exists(path):
+        return None
+
+    try:
+        response = send_request(
+            {"command": "lint", "version": __version__, "arguments": arguments}, path
+        )
+    except DaemonError:
+        return None
+
+    if response.get("status") != "ok":
+        return None
+    return response["output"], response["return_code"]
+
+
+class LintDaemon:
+    """Server that lints workflows with a LinterCmd that stays loaded."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        settings_factory: Callable[[], Settings] = Settings.factory,
+        idle_timeout: Optional[float] = None,
+    ) -> None:
+        """Initialize the LintDaemon.
+
+        Args:
+          path:
+            The path of the socket to listen on (defaults to the current directory's)
+          settings_factory:
+            Function that loads the Settings to lint with
+          idle_timeout:
+            Stop after this many seconds without a request (never if None)
+        """
+        self.path = path or socket_path()
+        self.settings_factory = settings_factory
+        self.idle_timeout = idle_timeout
+        self.linter = None
+        self.startup_output = ""
+        self.stamps: dict[str, Optional[list[int]]] = {}
+        self.started = time.time()
+        self.requests = 0
+        self.running = False
+
+    def load(self) -> None:
+        """Load the Settings and the Rules.
+
+        Anything printed while loading the Rules (ie. rules that failed to load)
+        is replayed in front of the output of every lint, like a fresh process
+        would print it.
+        """
+        from .lint import LinterCmd  # pylint: disable=import-outside-toplevel
+
+        self.linter = None
+        buffer = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(buffer):
+                settings = self.settings_factory()
+                linter = LinterCmd(settings=settings)
+        except Exception:  # pylint: disable=broad-except
+            return
+        self.stamps = settings.source_stamps()
+        self.startup_output = buffer.getvalue()
+        self.linter = linter
+
+    def is_stale(self) -> bool:
+        """Check if any file the Settings were loaded from has changed.
+
+        The daemon is stale as well when an external tool it resolved changed
+        (ie. actionlint was reinstalled) or failed to install a while ago, so
+        that the Rules are loaded again and resolve it again.
+        """
+        tools_changed = forget_stale_tools()
+        if self.linter is None:
+            return True
+        return tools_changed or self.linter.settings.source_stamps() != self.stamps
+
+    def status(self) -> dict[str, Any]:
+        """Describe the running daemon."""
+        return {
+            "status": "ok",
+            "pid": os.getpid(),
+            "version": __version__,
+            "cwd": os.getcwd(),
+            "uptime": time.time() - self.started,
+            "requests": self.requests,
+            "fingerprint": (
+                self.linter.settings.fingerprint() if self.linter is not None else None
+            ),
+        }
+
+    def lint(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Lint workflows for a client and capture the output.
+
+        Returns:
+          The output and return code, or a "stale" status if the daemon runs
+          another version of bwwl or its Settings are out of date.
+        """
+        if request.get("version") != __version__ or self.is_stale():
+            return {"status": "stale"}
+
+        buffer = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(buffer):
+                return_code = self.linter.run(**request["arguments"])
+        except Exception as err:  # pylint: disable=broad-except
+            return {"status": "error", "message": str(err)}
+
+        return {
+            "status": "ok",
+            "output": self.startup_output + buffer.getvalue(),
+            "return_code": return_code,
+        }
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Answer a single request."""
+        self.requests += 1
+        command = request.get("command")
+        if command == "lint":
+            return self.lint(request)
+        if command == "status":
+            return self.status()
+        if command == "stop":
+            self.running = False
+            return {"status": "ok"}
+        return {"status": "error", "message": f"Unknown command: {command}"}
+
+    def bind(self) -> socket.socket:
+        """Listen on the socket, replacing the socket file of a dead daemon."""
+        os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+        if os.path.exists(self.path):
+            try:
+                send_request({"command": "status"}, self.path, timeout=CONNECT_TIMEOUT)
+            except DaemonError:
+                os.unlink(self.path)
+            else:
+                raise DaemonError(f"A daemon is already listening on {self.path}")
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.path)
+        os.chmod(self.path, 0o600)
+        server.listen()
+        return server
+
+    def serve_forever(self) -> None:
+        """Load the linter and answer requests until stopped."""
+        self.load()
+        server = self.bind()
+        server.settimeout(self.idle_timeout)
+        self.running = True
+        try:
+            while self.running:
+                try:
+                    connection, _ = server.accept()
+                except socket.timeout:
+                    break
+                with connection:
+                    connection.settimeout(None)
+                    data = b"".join(iter(lambda: connection.recv(65536), b""))
+                    try:
+                        response = self.handle(json.loads(data))
+                    except ValueError as err:
+                        response = {"status": "error", "message": str(err)}
+                    with contextlib.suppress(OSError):
+                        connection.sendall(json.dumps(response).encode())
+                if response.get("status") == "stale":
+                    self.load()
+        finally:
+            server.close()
+            with contextlib.suppress(OSError):
+                os.unlink(self.path)
+
+
+class DaemonCmd:
+    """Command to manage the lint daemon of the current directory."""
+
+    @staticmethod
+    def extend_parser(
+        subparsers: argparse._SubParsersAction,
+    ) -> argparse._SubParsersAction:
+        """Extends the CLI subparser with the options for DaemonCmd.
+
+        Add 'daemon start', 'daemon stop' and 'daemon status' to the CLI as
+        subcommands along with the options for each.
+
+        Args:
+          subparsers:
+            The main argument parser to add subcommands and arguments to
+        """
+        parser_daemon = subparsers.add_parser(
+            "daemon", help="Keep the linter loaded in the background to speed up lint."
+        )
+        subparsers_daemon = parser_daemon.add_subparsers(
+            required=True, dest="daemon_command"
+        )
+        parser_daemon_start = subparsers_daemon.add_parser(
+            "start", help="start the daemon for the current directory"
+        )
+        parser_daemon_start.add_argument(
+            "--foreground",
+            action="store_true",
+            default=False,
+            help="run the daemon in this process instead of in the background",
+        )
+        parser_daemon_start.add_argument(
+            "--timeout",
+            type=float,
+            default=None,
+            help="stop the daemon after this many seconds without a request",
+        )
+        subparsers_daemon.add_parser("stop", help="stop the daemon")
+        subparsers_daemon.add_parser("status", help="show the status of the daemon")
+
+        return subparsers
+
+    def start(self, foreground: bool = False, timeout: Optional[float] = None) -> int:
+        """Start the daemon of the current directory."""
+        if not is_supported():
+            print("The daemon requires Unix domain sockets, which this platform lacks")
+            return -1
+
+        try:
+            status = send_request({"command": "status"}, timeout=CONNECT_TIMEOUT)
+            print(f"Daemon is already running (pid {status['pid']})")
+            return 0
+        except DaemonError:
+            pass
+
+        if foreground:
+            LintDaemon(idle_timeout=timeout).serve_forever()
+            return 0
+
+        command = [sys.executable, "-m", f"{__package__}.cli", "daemon", "start", "--foreground"]
+        if timeout is not None:
+            command += ["--timeout", str(timeout)]
+        subprocess.Popen(  # pylint: disable=consider-using-with
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+
+        deadline = time.monotonic() + START_TIMEOUT
+        while time.monotonic() < deadline:
+            try:
+                status = send_request({"command": "status"}, timeout=CONNECT_TIMEOUT)
+            except DaemonError:
+                time.sleep(0.05)
+                continue
+            print(f"Daemon started (pid {status['pid']})")
+            return 0
+
+        print("Timed out waiting for the daemon to start")
+        return -1
+
+    def stop(self) -> int:
+        """Stop the daemon of the current directory."""
+        try:
+            send_request({"command": "stop"}, timeout=CONNECT_TIMEOUT)
+        except DaemonError:
+            print("Daemon is not running")
+            return 0
+        print("Daemon stopped")
+        return 0
+
+    def status(self) -> int:
+        """Print the status of the daemon of the current directory."""
+        try:
+            status = send_request({"command": "status"}, timeout=CONNECT_TIMEOUT)
+        except DaemonError:
+            print("Daemon is not running")
+            return -1
+        print(
+            f"Daemon is running (pid {status['pid']}, bwwl {status['version']}, "
+            f"up {status['uptime']:.0f}s, {status['requests']} request(s))"
+        )
+        return 0
@@ -0,0 +1,140 @@
+"""Module providing the extraction of domain names from workflow text.
+
+The domains are the ones that this regex (matched with re.IGNORECASE) finds,
+with the scheme, a `www.` prefix and the path removed from each match:
+
+    (?:https?://)?(?:www\\.)?([a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\\.)+
+    [a-zA-Z]{2,}(?:/[^\\s]*)?
+
+Run as a regex, the repeated label group backtracks over every shorter
+sequence of labels before giving up, then tries again from the next character,
+which is quadratic on long dotted strings that end without a top-level domain.
+extract_domains() finds the same matches in a single pass: the text is split
+into words of label characters and dots, and the end of the longest match
+starting at each label of a word is computed once, from the last label to the
+first.
+"""
+
+import re
+
+from typing import List, Optional
+
+# Runs of the characters that labels, dots and top-level domains are made of
+WORD = re.compile(r"[a-zA-Z0-9.-]+", re.IGNORECASE)
+LETTERS = re.compile(r"[a-zA-Z]*", re.IGNORECASE)
+SCHEME = re.compile(r"https?://", re.IGNORECASE)
+PATH = re.compile(r"/\S*")
+
+MAX_LABEL_LENGTH = 63
+
+
+def match_ends(text: str, start: int, end: int) -> List[Optional[int]]:
+    """Get where the domain that follows each label of a word ends.
+
+    Args:
+      text:
+        The text that contains the word
+      start:
+        The position of the word in the text
+      end:
+        The position after the word
+
+    Returns:
+      For each label of the word, where `(label\\.)*tld` starting at that label
+      ends when as many labels as possible are taken, or None if there is no
+      top-level domain of 2 or more letters to end it.
+    """
+    labels = text[start:end].split(".")
+    ends: List[Optional[int]] = [None] * len(labels)
+    label_end = end
+    following = None
+    for index in range(len(labels) - 1, -1, -1):
+        label = labels[index]
+        label_start = label_end - len(label)
+        match_end = None
+        if (
+            following is not None
+            and 0 < len(label) <= MAX_LABEL_LENGTH
+            and label[0] != "-"
+            and label[-1] != "-"
+        ):
+            match_end = following
+        else:
+            tld_end = LETTERS.match(text, label_start, label_end).end()
+            if tld_end - label_start >= 2:
+                match_end = tld_end
+        ends[index] = following = match_end
+        label_end = label_start - 1
+    return ends
+
+
+def clean_domain(match: str) -> str:
+    """Remove the scheme, `www.` and the path from a match, like the original regex did."""
+    if match.startswith("https://"):
+        match = match[len("https://"):]
+    elif match.startswith("http://"):
+        match = match[len("http://"):]
+    if match.startswith("www."):
+        match = match[len("www."):]
+    return match.split("/", 1)[0].lower().strip()
+
+
+def extract_domains(text: str) -> List[str]:
+    """Extract the domain names of a text.
+
+    Args:
+      text:
+        The text to scan for domains
+
+    Returns:
+      The lowercased domain names found in the text, without duplicates, in the
+      order they are first found.
+    """
+    domains = {}
+    # Where the previous match ended, since matches do not overlap
+    position = 0
+    for word in WORD.finditer(text):
+        start, end = word.span()
+        if end <= position:
+            continue
+
+        matches = []
+        if "." in word.group():
+            ends = match_ends(text, start, end)
+            label_start = start
+            for index, label in enumerate(word.group().split(".")[:-1]):
+                label_end = label_start + len(label)
+                following = ends[index + 1]
+                first = max(position, label_start, label_end - MAX_LABEL_LENGTH)
+                if following is not None and label_end > first and label[-1:] != "-":
+                    # A match can start at any character of the label but a hyphen
+                    first += len(text[first:label_end]) - len(text[first:label_end].lstrip("-"))
+                    matches.append((first, following))
+                    position = following
+                label_start = label_end + 1
+
+        # A scheme that ends this word starts a match on the next word
+        if text.startswith("://", end):
+            scheme = SCHEME.match(text, end - 5) or SCHEME.match(text, end - 4)
+            host = WORD.match(text, end + 3)
+            if scheme and scheme.start() >= max(position, start) and host:
+                label = host.group().split(".", 1)[0]
+                following = match_ends(text, *host.span())[1:2]
+                if (
+                    following
+                    and following[0] is not None
+                    and 0 < len(label) <= MAX_LABEL_LENGTH
+                    and label[0] != "-"
+                    and label[-1] != "-"
+                ):
+                    matches.append((scheme.start(), following[0]))
+                    position = following[0]
+
+        for match_start, match_end in matches:
+            domain = clean_domain(text[match_start:match_end])
+            if "." in domain:
+                domains[domain] = None
+
+        if matches and text.startswith("/", position):
+            position = PATH.match(text, position).end()
+    return list(domains)
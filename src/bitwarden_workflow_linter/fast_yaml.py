@@ -0,0 +1,214 @@
+"""Module providing a fast loader of workflow YAML.
+
+The round-trip loader of ruamel keeps every comment and position of a workflow,
+but the only comments the models use are the ones after `uses:` (the version
+of a pinned action). This loader parses with the libyaml based loader of
+PyYAML instead, and recovers those comments by scanning the lines after each
+`uses:` value. Scalars are resolved with the YAML 1.2 core schema like ruamel
+does, so ie. `on:` stays a string key instead of becoming True.
+"""
+
+import re
+
+from typing import Any, Optional
+
+import yaml
+
+# The libyaml loader is much faster, but is not available on every platform
+try:
+    from yaml import CSafeLoader as BaseLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as BaseLoader
+
+# The comments of this key are recovered while loading
+COMMENTED_KEY = "uses"
+
+
+class CommentedDict(dict):
+    """A mapping loaded by FastLoader, with the comments after its `uses:` value.
+
+    comments holds the text that ruamel would store in `.ca.items[key][2]`:
+    the rest of the line after the value, followed by any blank or comment
+    lines up to the next token.
+    """
+
+    __slots__ = ("comments",)
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.comments: dict[str, str] = {}
+
+
+class FastLoader(BaseLoader):  # pylint: disable=too-many-ancestors
+    """Safe YAML loader that resolves scalars like ruamel's YAML 1.2 loader."""
+
+    yaml_implicit_resolvers: dict = {}
+
+    def __init__(self, stream: str) -> None:
+        super().__init__(stream)
+        self.source = stream
+        self._lines: Optional[list[str]] = None
+
+    def source_line(self, index: int) -> Optional[str]:
+        """Get a line of the source (without its line break), or None past the end.
+
+        Not named `line`, which the pure Python Reader of PyYAML uses for its
+        current line number.
+        """
+        if self._lines is None:
+            self._lines = self.source.splitlines()
+        if index < len(self._lines):
+            return self._lines[index]
+        return None
+
+    def comment_after(self, node: yaml.Node) -> Optional[str]:
+        """Get the comment text that ruamel would attach to a scalar value.
+
+        Args:
+          node:
+            The scalar node of the value
+
+        Returns:
+          The rest of the line after the value (without leading blanks) and
+          every following empty or comment line, each ending with a line
+          break. None if that is only blanks, or if a token follows the value
+          on the same line.
+        """
+        line_index = node.end_mark.line
+        first = self.source_line(line_index)
+        if first is None:
+            return None
+        rest = first[node.end_mark.column:].lstrip(" \t")
+        if rest and not rest.startswith("#"):
+            return None
+
+        lines = [rest]
+        while True:
+            line_index += 1
+            line = self.source_line(line_index)
+            if line is None:
+                break
+            if not line.strip():
+                # ruamel drops the blanks of empty lines
+                lines.append("")
+            elif line.lstrip(" \t").startswith("#"):
+                lines.append(line)
+            else:
+                break
+
+        if not rest and len(lines) == 1:
+            return None
+        return "\n".join(lines) + "\n"
+
+    def construct_commented_map(self, node: yaml.MappingNode):
+        """Construct a CommentedDict, rejecting duplicate keys like ruamel."""
+        data = CommentedDict()
+        yield data
+
+        seen = set()
+        for key_node, value_node in node.value:
+            if key_node.tag == "tag:yaml.org,2002:merge":
+                continue
+            key = self.construct_object(key_node, deep=True)
+            try:
+                duplicate = key in seen
+            except TypeError as err:
+                raise yaml.constructor.ConstructorError(
+                    "while constructing a mapping", node.start_mark,
+                    f"found unhashable key ({err})", key_node.start_mark,
+                )
+            if duplicate:
+                raise yaml.constructor.ConstructorError(
+                    "while constructing a mapping", node.start_mark,
+                    f'found duplicate key "{key}"', key_node.start_mark,
+                )
+            seen.add(key)
+            if key == COMMENTED_KEY and isinstance(value_node, yaml.ScalarNode):
+                comment = self.comment_after(value_node)
+                if comment is not None:
+                    data.comments[key] = comment
+
+        data.update(self.construct_mapping(node, deep=True))
+
+    def construct_yaml_int(self, node: yaml.ScalarNode) -> int:
+        """Construct an int, where a leading 0 is not octal in YAML 1.2."""
+        value = self.construct_scalar(node).replace("_", "")
+        sign = -1 if value.startswith("-") else 1
+        value = value.lstrip("+-")
+        for prefix, base in (("0b", 2), ("0o", 8), ("0x", 16)):
+            if value.startswith(prefix):
+                return sign * int(value[2:], base)
+        return sign * int(value)
+
+
+FastLoader.add_constructor("tag:yaml.org,2002:map", FastLoader.construct_commented_map)
+FastLoader.add_constructor("tag:yaml.org,2002:int", FastLoader.construct_yaml_int)
+
+# The implicit resolvers of the YAML 1.2 core schema, as used by ruamel
+FastLoader.add_implicit_resolver(
+    "tag:yaml.org,2002:bool",
+    re.compile(r"^(?:true|True|TRUE|false|False|FALSE)$"),
+    list("tTfF"),
+)
+FastLoader.add_implicit_resolver(
+    "tag:yaml.org,2002:float",
+    re.compile(
+        r"""^(?:
+         [-+]?(?:[0-9][0-9_]*)\.[0-9_]*(?:[eE][-+]?[0-9]+)?
+        |[-+]?(?:[0-9][0-9_]*)(?:[eE][-+]?[0-9]+)
+        |[-+]?\.[0-9_]+(?:[eE][-+][0-9]+)?
+        |[-+]?\.(?:inf|Inf|INF)
+        |\.(?:nan|NaN|NAN))$""",
+        re.X,
+    ),
+    list("-+0123456789."),
+)
+FastLoader.add_implicit_resolver(
+    "tag:yaml.org,2002:int",
+    re.compile(
+        r"""^(?:[-+]?0b[0-1_]+
+        |[-+]?0o?[0-7_]+
+        |[-+]?[0-9_]+
+        |[-+]?0x[0-9a-fA-F_]+)$""",
+        re.X,
+    ),
+    list("-+0123456789"),
+)
+FastLoader.add_implicit_resolver(
+    "tag:yaml.org,2002:merge", re.compile(r"^(?:<<)$"), ["<"]
+)
+FastLoader.add_implicit_resolver(
+    "tag:yaml.org,2002:null",
+    re.compile(r"^(?:~|null|Null|NULL|)$"),
+    ["~", "n", "N", ""],
+)
+FastLoader.add_implicit_resolver(
+    "tag:yaml.org,2002:timestamp",
+    re.compile(
+        r"""^(?:[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]
+        |[0-9][0-9][0-9][0-9] -[0-9][0-9]? -[0-9][0-9]?
+        (?:[Tt]|[ \t]+)[0-9][0-9]?
+        :[0-9][0-9] :[0-9][0-9] (?:\.[0-9]*)?
+        (?:[ \t]*(?:Z|[-+][0-9][0-9]?(?::[0-9][0-9])?))?)$""",
+        re.X,
+    ),
+    list("0123456789"),
+)
+
+
+def load(source: str) -> Any:
+    """Load a YAML document with FastLoader.
+
+    Args:
+      source:
+        The YAML text
+
+    Returns:
+      The loaded document, with CommentedDict for every mapping.
+    """
+    loader = FastLoader(source)
+    try:
+        return loader.get_single_data()
+    finally:
+        loader.dispose()
+
@@ -0,0 +1,65 @@
+"""Module providing helpers to query the local git repository."""
+
+import os
+import subprocess
+
+from typing import Optional
+
+
+class GitError(Exception):
+    """Exception to indicate that the local git repository could not be queried."""
+
+    pass
+
+
+def run_git(args: list[str], cwd: Optional[str] = None) -> str:
+    """Run a git command and return its output.
+
+    Args:
+      args:
+        The arguments to pass to git
+      cwd:
+        The directory to run git in (defaults to the current directory)
+
+    Returns:
+      The stdout of the git command.
+    """
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            capture_output=True,
+            text=True,
+            check=False,
+            cwd=cwd,
+        )
+    except (FileNotFoundError, OSError) as err:
+        raise GitError(f"Failed to run git: {err}") from err
+
+    if result.returncode != 0:
+        raise GitError(f"'git {' '.join(args)}' failed: {result.stderr.strip()}")
+    return result.stdout
+
+
+def changed_files(ref: str, cwd: Optional[str] = None) -> set[str]:
+    """Get the files that changed compared to the merge base with a ref.
+
+    This includes committed, staged and unstaged changes to tracked files as
+    well as new untracked files, which matches what a pull request would
+    contain once the local changes are pushed.
+
+    Args:
+      ref:
+        The git ref to compare against (ie. origin/main)
+      cwd:
+        A directory inside of the git repository
+
+    Returns:
+      The real paths of all changed files.
+    """
+    root = run_git(["rev-parse", "--show-toplevel"], cwd).strip()
+    merge_base = run_git(["merge-base", ref, "HEAD"], cwd).strip()
+
+    paths = run_git(["diff", "--name-only", "-z", merge_base], root).split("\0")
+    paths += run_git(["ls-files", "--others", "--exclude-standard", "-z"], root).split("\0")
+
+    return {os.path.realpath(os.path.join(root, path)) for path in paths if path}
@@ -2,12 +2,43 @@
 Workflows."""
 
 import argparse
+import contextlib
+import multiprocessing
 import os
+import sys
 
-from typing import Optional
+from typing import TYPE_CHECKING, ContextManager, Iterator, Optional
 
-from .load import WorkflowBuilder, Rules
+from .cache import ResultCache
+from .git import GitError, changed_files
 from .utils import LintFinding, LintLevels, Settings
+from .watch import create_watcher, wait_for_changes
+
+# The Rules and models pull in ruamel and dataclasses_json, so they are imported
+# when a LinterCmd is created rather than when the CLI builds its parser.
+if TYPE_CHECKING:
+    from .load import Rules
+    from .profiling import Profiler
+
+
+# The LinterCmd that forked worker processes inherit from the parent. It is set
+# right before the pool is created so the workers never rebuild Settings or Rules.
+_worker_linter: Optional["LinterCmd"] = None
+
+
+def can_fork_workers() -> bool:
+    """Check if files can be linted in a pool of forked worker processes.
+
+    Only Linux forks safely. macOS defaults to spawn since forking a process
+    that loaded system frameworks or started threads can crash or deadlock,
+    and Windows cannot fork at all.
+    """
+    return sys.platform.startswith("linux")
+
+
+def _lint_worker(filename: str) -> list[LintFinding]:
+    """Collect the findings of a single file inside a worker process."""
+    return _worker_linter.collect_findings(filename)
 
 
 class LinterCmd:
@@ -27,7 +58,13 @@ class LinterCmd:
             A Settings object that contains any default, overridden, or custom settings
             required anywhere in the application.
         """
-        self.rules = Rules(settings=settings)
+        from .load import Rules  # pylint: disable=import-outside-toplevel
+
+        self.settings = settings
+        self.rules: "Rules" = Rules(settings=settings)
+        self.cache: Optional[ResultCache] = None
+        self.profiler: Optional["Profiler"] = None
+        self.fast_yaml = False
 
     @staticmethod
     def extend_parser(
@@ -67,8 +104,61 @@ class LinterCmd:
             help="output format: [stdout|json|md]",
             default="stdout",
         )
+        parser_lint.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=os.cpu_count() or 1,
+            help=(
+                "number of worker processes to lint files with, on Linux "
+                "(default: CPU count)"
+            ),
+        )
+        parser_lint.add_argument(
+            "--changed-since",
+            metavar="REF",
+            default=None,
+            help="only lint files changed compared to the merge base with a git ref",
+        )
+        parser_lint.add_argument(
+            "--no-cache",
+            action="store_true",
+            default=False,
+            help="re-lint every file instead of reusing the results of unchanged files",
+        )
+        parser_lint.add_argument(
+            "-w",
+            "--watch",
+            action="store_true",
+            default=False,
+            help="keep running and re-lint workflows as they are modified",
+        )
+        parser_lint.add_argument(
+            "--profile",
+            action="store_true",
+            default=False,
+            help="print the time spent in each phase and rule (lints serially, without the cache)",
+        )
+        parser_lint.add_argument(
+            "--profile-output",
+            metavar="FILE",
+            default=None,
+            help="with --profile, also dump cProfile stats to FILE for pstats/snakeviz",
+        )
+        parser_lint.add_argument(
+            "--fast-yaml",
+            action="store_true",
+            default=False,
+            help="parse workflows with the faster libyaml based loader",
+        )
         return subparsers
 
+    def timer(self, section: str, name: str) -> ContextManager:
+        """Time a phase of linting when profiling (see Profiler.timer)."""
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.timer(section, name)
+
     def get_max_error_level(self, findings: list[LintFinding]) -> int:
         """Get max error level from list of findings.
 
@@ -86,39 +176,75 @@ class LinterCmd:
             return 0
         return max(findings, key=lambda finding: finding.level.code).level.code
 
-    def lint_file(self, filename: str, errors_only: bool) -> int:
-        """Lint a single workflow.
+    def collect_findings(self, filename: str) -> list[LintFinding]:
+        """Run all of the enabled Rules against a single workflow.
 
-        Run all of the Workflow, Job, and Step level rules that have been enabled.
+        The findings are stored in the result cache (if enabled) for later runs.
 
         Args:
           filename:
             The name of the file that contains the workflow to lint
 
         Returns:
-          The maximum error level found in the file (none, warning, error) to
-          calculate the exit code from.
+          All of the findings of the Workflow, Job, and Step level rules.
         """
+        with self.timer("file", filename):
+            findings = self._collect_findings(filename)
+
+        if self.cache is not None and all(
+            rule.cacheable for rule in self.rules.workflow + self.rules.job + self.rules.step
+        ):
+            self.cache.set(filename, findings)
+
+        return findings
+
+    def _collect_findings(self, filename: str) -> list[LintFinding]:
+        """Build a workflow and run all of the enabled Rules against it."""
+        from .load import WorkflowBuilder  # pylint: disable=import-outside-toplevel
+
         findings = []
-        max_error_level = 0
 
-        print(f"Linting: {filename}")
-        workflow = WorkflowBuilder.build(filename)
+        with self.timer("phase", "load"):
+            loaded_yaml = WorkflowBuilder.load(filename, self.fast_yaml)
+        with self.timer("phase", "build"):
+            workflow = WorkflowBuilder.build_loaded(filename, loaded_yaml)
 
+        # The Rules were grouped by compatibility when they were loaded, so they
+        # are evaluated without checking it again for every object.
         for rule in self.rules.workflow:
-            findings.append(rule.execute(workflow))
+            findings.append(rule.evaluate(workflow))
 
-        for _, job in workflow.jobs.items():
-            for rule in self.rules.job:
-                findings.append(rule.execute(job))
+        # The Jobs and Steps are built on first use, so they are left alone when
+        # no Rule needs them.
+        if self.rules.job or self.rules.step:
+            step_plan = self.rules.step_plan()
+            for _, job in workflow.jobs.items():
+                for rule in self.rules.job:
+                    findings.append(rule.evaluate(job))
 
-            if job.steps is not None:
-                for step in job.steps:
-                    for rule in self.rules.step:
-                        findings.append(rule.execute(step))
+                if self.rules.step and job.steps is not None:
+                    for step in job.steps:
+                        for rule in step_plan[step.kind]:
+                            findings.append(rule.evaluate(step))
 
-        findings = list(filter(lambda a: a is not None, findings))
+        return list(filter(lambda a: a is not None, findings))
 
+    def report_findings(
+        self, filename: str, findings: list[LintFinding], errors_only: bool
+    ) -> int:
+        """Print the findings of a single workflow.
+
+        Args:
+          filename:
+            The name of the file that the findings belong to
+          findings:
+            All of the findings that the linter found while linting the workflow
+          errors_only:
+            only show errors, not warning level findings
+
+        Returns:
+          The maximum error level of the reported findings.
+        """
         if errors_only:
             findings = list(filter(lambda f: f.level == LintLevels.ERROR, findings))
 
@@ -128,9 +254,100 @@ class LinterCmd:
             print(f"Issues found by {len(findings)} rules in {filename}")
             print()
 
-        max_error_level = self.get_max_error_level(findings)
+        return self.get_max_error_level(findings)
+
+    def lint_file(self, filename: str, errors_only: bool) -> int:
+        """Lint a single workflow.
+
+        Run all of the Workflow, Job, and Step level rules that have been enabled,
+        unless the result cache already has the findings of the file.
+
+        Args:
+          filename:
+            The name of the file that contains the workflow to lint
+
+        Returns:
+          The maximum error level found in the file (none, warning, error) to
+          calculate the exit code from.
+        """
+        print(f"Linting: {filename}")
+        findings = self.cache.get(filename) if self.cache is not None else None
+        if findings is None:
+            findings = self.collect_findings(filename)
+        return self.report_findings(filename, findings, errors_only)
+
+    def generate_findings(
+        self, files: list[str], jobs: int
+    ) -> Iterator[list[LintFinding]]:
+        """Collect the findings of each file, in order.
+
+        With more than one job, the files are linted in a pool of worker processes
+        forked from the current process so they share the already loaded Settings
+        and Rules. Only the findings are sent back to this process. Where forking
+        is not safe (see can_fork_workers()), the files are linted serially.
+
+        Args:
+          files:
+            The list of files to lint
+          jobs:
+            The number of worker processes to use
+
+        Yields:
+          The findings of each file, in the order of files.
+        """
+        jobs = min(jobs, len(files))
+        if jobs <= 1 or not can_fork_workers():
+            for file in files:
+                yield self.collect_findings(file)
+            return
+
+        global _worker_linter
+        _worker_linter = self
+
+        context = multiprocessing.get_context("fork")
+        chunksize = max(1, len(files) // (jobs * 4))
+        try:
+            with context.Pool(processes=jobs) as pool:
+                yield from pool.imap(_lint_worker, files, chunksize=chunksize)
+        finally:
+            _worker_linter = None
+
+    def lint_files(self, files: list[str], errors_only: bool, jobs: int) -> list[int]:
+        """Lint workflows and report their findings in order.
+
+        Files whose results are cached are answered from the cache. All others
+        are handed to the Rules' prepare hooks and then linted.
+
+        Args:
+          files:
+            The sorted list of files to lint
+          errors_only:
+            only show errors, not warning level findings
+          jobs:
+            The number of worker processes to use
+
+        Returns:
+          The maximum error level of each file, in the order of files.
+        """
+        cached = {}
+        if self.cache is not None:
+            for file in files:
+                findings = self.cache.get(file)
+                if findings is not None:
+                    cached[file] = findings
+
+        pending = [file for file in files if file not in cached]
+        with self.timer("phase", "prepare"):
+            self.rules.prepare(pending)
 
-        return max_error_level
+        return_values = []
+        with contextlib.closing(self.generate_findings(pending, jobs)) as results:
+            for file in files:
+                print(f"Linting: {file}")
+                findings = cached[file] if file in cached else next(results)
+                return_values.append(self.report_findings(file, findings, errors_only))
+
+        return return_values
 
     def generate_files(self, files: list[str]) -> list[str]:
         """Generate the list of files to lint.
@@ -160,7 +377,34 @@ class LinterCmd:
 
         return sorted(set(workflow_files))
 
-    def run(self, input_files: list[str], strict: bool = False, errors_only: bool = False) -> int:
+    def filter_changed_files(self, files: list[str], ref: str) -> list[str]:
+        """Filter the list of files down to the ones changed since a git ref.
+
+        Args:
+          files:
+            The list of files to lint
+          ref:
+            The git ref to compare against
+
+        Returns:
+          The files that changed since the merge base with ref, in the original
+          order.
+        """
+        changed = changed_files(ref)
+        return [file for file in files if os.path.realpath(file) in changed]
+
+    def run(
+        self,
+        input_files: list[str],
+        strict: bool = False,
+        errors_only: bool = False,
+        jobs: int = 1,
+        use_cache: bool = False,
+        changed_since: Optional[str] = None,
+        profile: bool = False,
+        profile_output: Optional[str] = None,
+        fast_yaml: bool = False,
+    ) -> int:
         """Execute the LinterCmd.
 
         Args:
@@ -170,17 +414,61 @@ class LinterCmd:
             fail on WARNING instead of succeed
           errors_only:
             only show errors, not warning level findings
+          jobs:
+            number of worker processes to lint with. Files are linted serially
+            when this is 1 or on platforms other than Linux, where forking
+            is not safe.
+          use_cache:
+            reuse the findings of files that have not changed since they were
+            last linted with the same settings
+          changed_since:
+            only lint the files that changed compared to the merge base with this
+            git ref
+          profile:
+            print the time spent in each phase, each rule and the slowest files.
+            Files are then linted serially and without the result cache so
+            that every file is timed in this process.
+          profile_output:
+            with profile, also dump the cProfile stats of the run to this file
+          fast_yaml:
+            parse the workflows with the fast loader (see fast_yaml.py), which
+            builds the same Workflows without keeping every comment
 
         Returns
           The return_code for the entire CLI to indicate success/failure
         """
+        self.fast_yaml = fast_yaml
         files = self.generate_files(input_files)
 
+        if changed_since is not None:
+            try:
+                files = self.filter_changed_files(files, changed_since)
+            except GitError as err:
+                print(f"Unable to find the files changed since '{changed_since}': {err}")
+                return -1
+            print(f"Linting {len(files)} file(s) changed since {changed_since}")
+
         if len(input_files) > 0:
             files_with_issues = []
             return_code = 0
-            for file in files:
-                return_value = self.lint_file(file, errors_only)
+            if profile:
+                from .profiling import Profiler  # pylint: disable=import-outside-toplevel
+
+                jobs, use_cache = 1, False
+                self.profiler = Profiler(profile_output)
+                self.profiler.instrument(self.rules)
+            self.cache = (
+                ResultCache(self.settings, inputs=self.rules.cache_inputs)
+                if use_cache and self.settings is not None
+                else None
+            )
+            try:
+                with self.profiler or contextlib.nullcontext():
+                    return_values = self.lint_files(files, errors_only, jobs)
+            finally:
+                profiler, self.profiler = self.profiler, None
+
+            for file, return_value in zip(files, return_values):
                 if return_value > 0:
                     files_with_issues.append(file)
                     return_code = max(return_code, return_value)
@@ -200,6 +488,12 @@ https://github.com/bitwarden/workflow-linter/tree/main/.github/workflows/example
             else:
                 print("No issues found")
 
+            if self.cache is not None:
+                print(self.cache.stats())
+
+            if profiler is not None:
+                print(profiler.report())
+
             if return_code == 1 and not strict:
                 return_code = 0
 
@@ -207,3 +501,89 @@ https://github.com/bitwarden/workflow-linter/tree/main/.github/workflows/example
         else:
             print(f'File(s)/Directory: "{input_files}" does not exist, exiting.')
             return -1
+
+    def relint_file(self, filename: str, errors_only: bool) -> int:
+        """Lint a single workflow again after it has been modified.
+
+        Args:
+          filename:
+            The name of the file that contains the workflow to lint
+          errors_only:
+            only show errors, not warning level findings
+
+        Returns:
+          The maximum error level found in the file, or -1 if it could not be
+          parsed (ie. it was saved half way through an edit).
+        """
+        from .load import WorkflowBuilderError  # pylint: disable=import-outside-toplevel
+
+        if self.cache is not None:
+            self.cache.forget(filename)
+        try:
+            self.rules.prepare([filename])
+            return self.lint_file(filename, errors_only)
+        except WorkflowBuilderError as err:
+            print(err)
+            return -1
+
+    def watch(
+        self,
+        input_files: list[str],
+        strict: bool = False,
+        errors_only: bool = False,
+        jobs: int = 1,
+        use_cache: bool = False,
+        debounce: float = 0.3,
+        fast_yaml: bool = False,
+    ) -> int:
+        """Lint the workflows, then keep re-linting the ones that are modified.
+
+        Settings and Rules stay loaded between runs, and only the files that
+        changed are linted again. Bursts of saves are debounced so that a file is
+        linted once its editor has finished writing it.
+
+        Args:
+          input_files:
+            list of file names or directory names.
+          strict:
+            fail on WARNING instead of succeed
+          errors_only:
+            only show errors, not warning level findings
+          jobs:
+            number of worker processes to lint with on the first run
+          use_cache:
+            reuse the findings of files that have not changed since they were
+            last linted with the same settings
+          debounce:
+            seconds without any new change before the changed files are linted
+          fast_yaml:
+            parse the workflows with the fast loader
+
+        Returns
+          The return_code of the last run once interrupted.
+        """
+        return_code = self.run(
+            input_files, strict, errors_only, jobs, use_cache, fast_yaml=fast_yaml
+        )
+        if return_code < 0:
+            return return_code
+
+        watcher = create_watcher(input_files, lambda: self.generate_files(input_files))
+        print("Watching for changes (press Ctrl+C to stop)")
+        try:
+            while True:
+                changed = wait_for_changes(watcher, debounce)
+                return_values = [
+                    self.relint_file(filename, errors_only)
+                    for filename in sorted(changed)
+                    if os.path.isfile(filename)
+                ]
+                return_code = max(return_values, default=0)
+                if min(return_values, default=0) < 0:
+                    return_code = -1
+                elif return_code == 1 and not strict:
+                    return_code = 0
+        except KeyboardInterrupt:
+            return return_code
+        finally:
+            watcher.close()
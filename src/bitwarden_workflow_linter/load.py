@@ -2,13 +2,15 @@
 
 import importlib
 
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from ruamel.yaml import YAML
 from ruamel.yaml.comments import CommentedMap
 
+from . import fast_yaml
+from .models.construct import WorkflowBuilderError
 from .models.job import Job
-from .models.step import Step
+from .models.step import STEP_KINDS, Step
 from .models.workflow import Workflow
 from .rule import Rule
 from .utils import Settings, LintLevels
@@ -16,22 +18,19 @@ from .utils import Settings, LintLevels
 yaml = YAML()
 
 
-class WorkflowBuilderError(Exception):
-    """Exception to indicate an error with the WorkflowBuilder."""
-
-    pass
-
-
 class WorkflowBuilder:
     """Collection of methods to build Workflow objects."""
 
     @classmethod
-    def __load_workflow_from_file(cls, filename: str) -> CommentedMap:
+    def __load_workflow_from_file(cls, filename: str, fast: bool = False) -> CommentedMap:
         """Load YAML from disk.
 
         Args:
           filename:
             The name of the YAML file to read.
+          fast:
+            Load with the fast loader (see fast_yaml.py), which only keeps the
+            comments that the models use.
 
         Returns:
           A CommentedMap that contains the dict() representation of the
@@ -42,10 +41,42 @@ class WorkflowBuilder:
             if not file:
                 raise WorkflowBuilderError(f"Could not load {filename}")
             try:
+                if fast:
+                    return fast_yaml.load(file.read())
                 return yaml.load(file)
             except Exception as e:
                 raise WorkflowBuilderError(f"Error loading YAML file {filename}: {e}")
 
+    @classmethod
+    def load(cls, filename: str, fast: bool = False) -> CommentedMap:
+        """Load the YAML of a workflow from disk without building the Workflow.
+
+        Args:
+          filename:
+            The name of the YAML file to read.
+          fast:
+            Load with the fast loader instead of the round-trip loader
+
+        Returns:
+          The loaded YAML, to pass to build_loaded().
+        """
+        return cls.__load_workflow_from_file(filename, fast)
+
+    @classmethod
+    def build_loaded(cls, filename: str, loaded_yaml: CommentedMap) -> Workflow:
+        """Build a Workflow from the YAML that load() read from a file.
+
+        build(filename) is load() followed by build_loaded(); the two steps are
+        separate so they can be timed on their own.
+
+        Args:
+          filename:
+            The name of the file that the YAML was loaded from
+          loaded_yaml:
+            The YAML returned by load()
+        """
+        return cls.__build_workflow(filename, loaded_yaml)
+
     @classmethod
     def __build_workflow(cls, filename: str, loaded_yaml: CommentedMap) -> Workflow:
         """Parse the YAML and build out the workflow to run Rules against.
@@ -72,6 +103,7 @@ class WorkflowBuilder:
         filename: Optional[str] = None,
         workflow: Optional[CommentedMap] = None,
         from_file: bool = True,
+        fast: bool = False,
     ) -> Workflow:
         """Build a Workflow from either code or a file.
 
@@ -86,10 +118,12 @@ class WorkflowBuilder:
           from_file:
             Flag to determine if the YAML has already been loaded or needs to
             be loaded from disk
+          fast:
+            Load the file with the fast loader instead of the round-trip loader
         """
         if from_file and filename is not None:
             return cls.__build_workflow(
-                filename, cls.__load_workflow_from_file(filename)
+                filename, cls.__load_workflow_from_file(filename, fast)
             )
         elif not from_file and workflow is not None:
             return cls.__build_workflow("", workflow)
@@ -113,9 +147,9 @@ class Rules:
     types are not skipped.
     """
 
-    workflow: List[Rule] = []
-    job: List[Rule] = []
-    step: List[Rule] = []
+    workflow: List[Rule]
+    job: List[Rule]
+    step: List[Rule]
 
     def __init__(self, settings: Settings) -> None:
         """Initializes the Rules
@@ -125,6 +159,12 @@ class Rules:
             A Settings object that contains any default, overridden, or custom settings
             required anywhere in the application.
         """
+        self.workflow = []
+        self.job = []
+        self.step = []
+        self._step_plan: Dict[str, List[Rule]] = {}
+        self._step_plan_key: Optional[Tuple[int, ...]] = None
+
         # [TODO]: data resiliency
         for rule in settings.enabled_rules:
             rule_id = rule["id"]
@@ -133,7 +173,9 @@ class Rules:
             rule_name = rule_id.split(".")[-1]
 
             try:
-                rule_class = getattr(importlib.import_module(module_name), rule_name)
+                rule_class = settings.rule_classes.get(rule_id) or getattr(
+                    importlib.import_module(module_name), rule_name
+                )
                 rule_inst = rule_class(settings=settings, lint_level=lint_level(rule["level"]))
 
                 if Workflow in rule_inst.compatibility:
@@ -145,6 +187,62 @@ class Rules:
             except LoadRulesError as err:
                 print(f"Error loading: {rule}\n{err}")
 
+    def step_plan(self) -> Dict[str, List[Rule]]:
+        """Get the Step level Rules to run on each kind of Step.
+
+        The plan is built once and only rebuilt if the Step level Rules change.
+        Rules that declare step_kinds are left out of the kinds of Steps that
+        they can never fail on.
+
+        Returns:
+          The Step level Rules, in order, keyed by Step.kind.
+        """
+        key = tuple(map(id, self.step))
+        if key != self._step_plan_key:
+            self._step_plan = {
+                kind: [
+                    rule
+                    for rule in self.step
+                    if rule.step_kinds is None or kind in rule.step_kinds
+                ]
+                for kind in STEP_KINDS
+            }
+            self._step_plan_key = key
+        return self._step_plan
+
+    def prepare(self, filenames: List[str]) -> None:
+        """Give every loaded Rule the full list of files before linting starts.
+
+        Args:
+          filenames:
+            All of the workflow files that are about to be linted
+        """
+        prepared = set()
+        for rule in self.workflow + self.job + self.step:
+            if id(rule) not in prepared:
+                prepared.add(id(rule))
+                rule.prepare(filenames)
+
+    def cache_inputs(self, filename: str, content: bytes) -> List[str]:
+        """Collect the cache inputs of a file from every loaded Rule.
+
+        Args:
+          filename:
+            The workflow file about to be linted
+          content:
+            The content of the file
+
+        Returns:
+          The cache inputs of each Rule, in order.
+        """
+        inputs = []
+        collected = set()
+        for rule in self.workflow + self.job + self.step:
+            if id(rule) not in collected:
+                collected.add(id(rule))
+                inputs.extend(rule.cache_inputs(filename, content))
+        return inputs
+
     def list(self) -> None:
         """Print the loaded Rules."""
         print("===== Loaded Rules =====")
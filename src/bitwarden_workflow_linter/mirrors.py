@@ -0,0 +1,370 @@
+"""Module providing the resolution of action versions from local git mirrors."""
+
+import bisect
+import glob
+import logging
+import os
+import struct
+import threading
+import zlib
+
+from typing import Optional
+
+from packaging.version import InvalidVersion, Version
+
+from .utils import Action
+
+# The types of the objects stored in git packs
+OBJ_COMMIT = 1
+OBJ_TREE = 2
+OBJ_BLOB = 3
+OBJ_TAG = 4
+OBJ_OFS_DELTA = 6
+OBJ_REF_DELTA = 7
+
+OBJECT_TYPES = {
+    OBJ_COMMIT: "commit",
+    OBJ_TREE: "tree",
+    OBJ_BLOB: "blob",
+    OBJ_TAG: "tag",
+}
+
+# The first bytes of a version 2 pack index
+PACK_INDEX_SIGNATURE = b"\377tOc"
+
+# Tags of tags are followed up to this depth
+MAX_PEEL_DEPTH = 10
+
+# The size of the chunks that pack entries are decompressed from
+READ_CHUNK_SIZE = 8192
+
+
+class MirrorError(Exception):
+    """Exception to indicate that a git mirror could not be read."""
+
+    pass
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    """Rebuild an object from its base and a git delta.
+
+    Args:
+      base:
+        The content of the base object
+      delta:
+        The delta instructions: the sizes of the base and of the result, then
+        instructions that copy a range of the base or insert new data
+
+    Returns:
+      The content of the object.
+    """
+
+    def varint(position: int) -> tuple[int, int]:
+        value = shift = 0
+        while True:
+            byte = delta[position]
+            position += 1
+            value |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                return value, position
+
+    base_size, position = varint(0)
+    result_size, position = varint(position)
+    if base_size != len(base):
+        raise MirrorError("Delta does not apply to its base object")
+
+    result = bytearray()
+    while position < len(delta):
+        instruction = delta[position]
+        position += 1
+        if instruction & 0x80:
+            # Copy from the base: which offset and size bytes follow is in the
+            # low bits of the instruction
+            offset = size = 0
+            for index in range(4):
+                if instruction & (1 << index):
+                    offset |= delta[position] << (8 * index)
+                    position += 1
+            for index in range(3):
+                if instruction & (0x10 << index):
+                    size |= delta[position] << (8 * index)
+                    position += 1
+            result += base[offset : offset + (size or 0x10000)]
+        elif instruction:
+            result += delta[position : position + instruction]
+            position += instruction
+        else:
+            raise MirrorError("Invalid delta instruction")
+
+    if len(result) != result_size:
+        raise MirrorError("Delta result has the wrong size")
+    return bytes(result)
+
+
+class PackIndex:
+    """The version 2 index of a git pack, mapping object ids to pack offsets."""
+
+    def __init__(self, path: str) -> None:
+        """Read the index of a pack.
+
+        Args:
+          path:
+            The .idx file, next to its .pack file
+        """
+        self.pack_path = path[: -len(".idx")] + ".pack"
+        with open(path, "rb") as file:
+            data = file.read()
+        if data[:8] != PACK_INDEX_SIGNATURE + struct.pack(">I", 2):
+            raise MirrorError(f"Unsupported pack index: {path}")
+
+        # The number of objects whose first byte is at most each value, then
+        # the sorted object ids, their CRC32 and their offsets in the pack
+        self.fanout = struct.unpack_from(">256I", data, 8)
+        count = self.fanout[255]
+        names = 8 + 256 * 4
+        offsets = names + count * 20 + count * 4
+        self.names = [
+            data[start : start + 20] for start in range(names, names + count * 20, 20)
+        ]
+        self.offsets = struct.unpack_from(f">{count}I", data, offsets)
+        self.large_offsets = data[offsets + count * 4 :]
+
+    def offset(self, sha: bytes) -> Optional[int]:
+        """Get the offset of an object in the pack, or None if it is not in it."""
+        low = self.fanout[sha[0] - 1] if sha[0] else 0
+        index = bisect.bisect_left(self.names, sha, low, self.fanout[sha[0]])
+        if index == self.fanout[sha[0]] or self.names[index] != sha:
+            return None
+        offset = self.offsets[index]
+        if offset & 0x80000000:
+            # Offsets past 2 GiB are stored in a table of 64 bit offsets
+            large = (offset & 0x7FFFFFFF) * 8
+            offset = struct.unpack_from(">Q", self.large_offsets, large)[0]
+        return offset
+
+
+class GitMirror:
+    """A bare git repository, whose tags are read without running git.
+
+    Refs are read from packed-refs and from the loose files under refs/tags,
+    and objects from the loose objects and from the version 2 packs, with
+    their deltas. Only what is needed to peel a tag to its commit is read.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the GitMirror.
+
+        Args:
+          path:
+            The git directory of the mirror (e.g. owner/repo.git)
+        """
+        self.path = path
+        self._packs: Optional[list[PackIndex]] = None
+        self._peeled: dict[str, str] = {}
+
+    def tags(self) -> dict[str, str]:
+        """Get the object id of every tag, loose refs overriding packed ones."""
+        tags, peeled = {}, {}
+        try:
+            with open(os.path.join(self.path, "packed-refs"), encoding="utf8") as file:
+                ref = None
+                for line in file:
+                    line = line.strip()
+                    if not line or line.startswith("#"):
+                        continue
+                    if line.startswith("^"):
+                        # The commit of the annotated tag on the previous line
+                        if ref is not None:
+                            peeled[tags[ref]] = line[1:]
+                        continue
+                    sha, _, name = line.partition(" ")
+                    ref = None
+                    if name.startswith("refs/tags/"):
+                        ref = name[len("refs/tags/") :]
+                        tags[ref] = sha
+        except FileNotFoundError:
+            pass
+
+        tags_dir = os.path.join(self.path, "refs", "tags")
+        for root, _, files in os.walk(tags_dir):
+            for name in files:
+                with open(os.path.join(root, name), encoding="utf8") as file:
+                    sha = file.read().strip()
+                if len(sha) == 40:
+                    tag = os.path.relpath(os.path.join(root, name), tags_dir)
+                    tags[tag.replace(os.sep, "/")] = sha
+        self._peeled = peeled
+        return tags
+
+    def packs(self) -> list[PackIndex]:
+        """Get the indexes of the packs of the mirror."""
+        if self._packs is None:
+            pattern = os.path.join(self.path, "objects", "pack", "*.idx")
+            self._packs = [PackIndex(path) for path in sorted(glob.glob(pattern))]
+        return self._packs
+
+    def read_object(self, sha: str) -> tuple[str, bytes]:
+        """Get the type and content of an object.
+
+        Raises:
+          MirrorError: if the object is not in the mirror.
+        """
+        try:
+            with open(os.path.join(self.path, "objects", sha[:2], sha[2:]), "rb") as file:
+                data = zlib.decompress(file.read())
+        except FileNotFoundError:
+            pass
+        else:
+            header, _, content = data.partition(b"\0")
+            return header.split(b" ")[0].decode(), content
+
+        binary = bytes.fromhex(sha)
+        for pack in self.packs():
+            offset = pack.offset(binary)
+            if offset is not None:
+                with open(pack.pack_path, "rb") as file:
+                    return self.read_pack_entry(file, offset)
+        raise MirrorError(f"Object {sha} not found in {self.path}")
+
+    def read_pack_entry(self, file, offset: int) -> tuple[str, bytes]:
+        """Get the type and content of the object at an offset of a pack."""
+        file.seek(offset)
+        header = file.read(32)
+        kind = (header[0] >> 4) & 7
+        position = 0
+        while header[position] & 0x80:
+            position += 1
+        position += 1
+
+        if kind == OBJ_OFS_DELTA:
+            byte = header[position]
+            distance = byte & 0x7F
+            while byte & 0x80:
+                position += 1
+                byte = header[position]
+                distance = ((distance + 1) << 7) | (byte & 0x7F)
+            position += 1
+            data = self.inflate(file, offset + position)
+            kind_name, base = self.read_pack_entry(file, offset - distance)
+            return kind_name, apply_delta(base, data)
+        if kind == OBJ_REF_DELTA:
+            base_sha = header[position : position + 20].hex()
+            data = self.inflate(file, offset + position + 20)
+            kind_name, base = self.read_object(base_sha)
+            return kind_name, apply_delta(base, data)
+        if kind not in OBJECT_TYPES:
+            raise MirrorError(f"Invalid pack entry at {offset} in {file.name}")
+        return OBJECT_TYPES[kind], self.inflate(file, offset + position)
+
+    @staticmethod
+    def inflate(file, offset: int) -> bytes:
+        """Decompress the zlib stream that starts at an offset of a file."""
+        file.seek(offset)
+        decompressor = zlib.decompressobj()
+        chunks = []
+        while not decompressor.eof:
+            chunk = file.read(READ_CHUNK_SIZE)
+            if not chunk:
+                raise MirrorError(f"Truncated pack entry in {file.name}")
+            chunks.append(decompressor.decompress(chunk))
+        return b"".join(chunks)
+
+    def peel(self, sha: str) -> str:
+        """Get the commit that a tag points to, following annotated tags."""
+        if sha in self._peeled:
+            return self._peeled[sha]
+        for _ in range(MAX_PEEL_DEPTH):
+            kind, content = self.read_object(sha)
+            if kind != "tag":
+                return sha
+            # The first line of a tag object is the object it points to
+            sha = content.split(b"\n", 1)[0].split(b" ")[1].decode()
+        raise MirrorError(f"Too many nested tags in {self.path}")
+
+
+class MirrorResolver:
+    """Resolve the latest versions of actions from a directory of git mirrors.
+
+    The mirror of owner/repo is owner/repo.git (as made by `git clone
+    --mirror`) or owner/repo in the directory. The latest version is the tag
+    with the highest version number, preferring releases to pre-releases, and
+    is resolved to the commit it points to without any network access.
+
+    It is safe to use from several threads.
+    """
+
+    def __init__(self, directory: str) -> None:
+        """Initialize the MirrorResolver.
+
+        Args:
+          directory:
+            The directory of the mirrors
+        """
+        self.directory = directory
+        self._mirrors: dict[str, Optional[GitMirror]] = {}
+        self._latest: dict[str, tuple[bool, Optional[Action]]] = {}
+        self._repo_locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def mirror(self, repo_name: str) -> Optional[GitMirror]:
+        """Get the mirror of an owner/repo repository, or None if there is none."""
+        with self._lock:
+            if repo_name not in self._mirrors:
+                self._mirrors[repo_name] = None
+                base = os.path.join(self.directory, *repo_name.split("/"))
+                for path in (f"{base}.git", base, os.path.join(base, ".git")):
+                    if os.path.isfile(os.path.join(path, "HEAD")):
+                        self._mirrors[repo_name] = GitMirror(path)
+                        break
+            return self._mirrors[repo_name]
+
+    @staticmethod
+    def latest_tag(tags: list[str]) -> Optional[str]:
+        """Get the tag with the highest version, or None if no tag is a version.
+
+        Tags of equal versions (v4 and v4.0.0) prefer the most specific one.
+        """
+        releases, prereleases = [], []
+        for tag in tags:
+            try:
+                version = Version(tag)
+            except InvalidVersion:
+                continue
+            candidate = (version, len(tag), tag)
+            (prereleases if version.is_prerelease else releases).append(candidate)
+        candidates = releases or prereleases
+        return max(candidates)[2] if candidates else None
+
+    def get_latest_version(self, repo_name: str) -> tuple[bool, Optional[Action]]:
+        """Get the latest version of a repository from its mirror.
+
+        The result is kept for the other actions of the same repository, which
+        wait for the first lookup rather than reading the mirror again.
+
+        Returns:
+          Whether the repository is mirrored, and its latest version (None if
+          it has no version tag or its mirror could not be read).
+        """
+        with self._lock:
+            repo_lock = self._repo_locks.setdefault(repo_name, threading.Lock())
+        with repo_lock:
+            if repo_name not in self._latest:
+                self._latest[repo_name] = self.read_latest_version(repo_name)
+            return self._latest[repo_name]
+
+    def read_latest_version(self, repo_name: str) -> tuple[bool, Optional[Action]]:
+        """Read the latest version of a repository from its mirror."""
+        mirror = self.mirror(repo_name)
+        if mirror is None:
+            return False, None
+        try:
+            tags = mirror.tags()
+            tag = self.latest_tag(list(tags))
+            if tag is None:
+                logging.error("No version tag in the mirror of %s", repo_name)
+                return True, None
+            return True, Action(name=repo_name, version=tag, sha=mirror.peel(tags[tag]))
+        except (OSError, ValueError, IndexError, zlib.error, MirrorError) as err:
+            logging.error("Failed to read the mirror of %s: %s", repo_name, err)
+            return True, None
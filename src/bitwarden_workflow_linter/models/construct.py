@@ -0,0 +1,206 @@
+"""Construction of the models from loaded YAML."""
+
+import contextlib
+import sys
+
+from dataclasses import field
+from typing import Any, Callable, ContextManager, NoReturn, Tuple, Type, TypeVar
+
+from dataclasses_json import config
+
+Model = TypeVar("Model")
+
+# The keys whose trailing comments are kept in the deferred YAML (see defer()),
+# which are the only comments the models read (see Step.uses_comment)
+DEFERRED_COMMENTS = ("uses",)
+
+# Wraps every build_deferred(), replaced while profiling so the lazily built
+# fields are timed as building rather than as the Rule that first used them
+build_timer: Callable[[], ContextManager] = contextlib.nullcontext
+
+
+class WorkflowBuilderError(Exception):
+    """Exception to indicate an error with the WorkflowBuilder."""
+
+    pass
+
+
+class FrozenDict(dict):
+    """A dict that cannot be modified after it is created.
+
+    The mappings of the models (ie. env or with) are shared by every Rule, so
+    they are read-only. It is still a dict so that Rules, json and
+    dataclasses_json handle it like the loaded YAML.
+    """
+
+    __slots__ = ()
+
+    def _immutable(self, *args, **kwargs) -> NoReturn:
+        raise TypeError(f"'{type(self).__name__}' object is immutable")
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+class CommentedFrozenDict(FrozenDict):
+    """A FrozenDict that kept the comments after the values of some of its keys.
+
+    comments holds the text that ruamel stores in `.ca.items[key][2]`, like the
+    mappings of the fast loader, so trailing_comment() reads either of them.
+    """
+
+    __slots__ = ("comments",)
+
+    def __reduce__(self):
+        return (commented_frozen_dict, (dict(self), self.comments))
+
+
+def commented_frozen_dict(items: dict, comments: dict[str, str]) -> CommentedFrozenDict:
+    """Create a CommentedFrozenDict from its items and comments."""
+    data = CommentedFrozenDict(items)
+    data.comments = comments
+    return data
+
+
+def trailing_comments(data: dict, keys: Tuple[str, ...]) -> dict[str, str]:
+    """Get the comments after the values of some keys of a loaded mapping."""
+    comments = getattr(data, "comments", None)
+    if comments is not None:
+        return {key: comment for key, comment in comments.items() if key in keys}
+    ca = getattr(data, "ca", None)
+    if ca is None:
+        return {}
+    return {
+        key: ca.items[key][2].value
+        for key in keys
+        if key in ca.items and len(ca.items[key]) > 2 and ca.items[key][2]
+    }
+
+
+def detach_key(key: Any) -> Any:
+    """Detach a key of a mapping, sharing the string keys between the mappings."""
+    key = detach(key)
+    return sys.intern(key) if type(key) is str else key
+
+
+def detach(value: Any, comments: Tuple[str, ...] = ()) -> Any:
+    """Copy a value of the loaded YAML into builtin, immutable containers.
+
+    The YAML loaded by ruamel is made of subclasses of dict, list and str that
+    carry their comments and positions. A model that kept them would keep all
+    of that alive, so mappings become FrozenDicts, sequences become tuples and
+    strings become plain strings. Values that are already detached are shared.
+
+    Args:
+      value:
+        A value of the loaded YAML
+      comments:
+        The keys whose trailing comments are kept (ie. "uses" for the YAML of
+        the Steps that are built later), in CommentedFrozenDicts
+
+    Returns:
+      The detached copy of the value.
+    """
+    value_type = type(value)
+    if value_type is str or value is None or value_type is bool:
+        return value
+    if value_type is tuple or isinstance(value, FrozenDict):
+        return value
+    if isinstance(value, dict):
+        items = {
+            detach_key(key): detach(item, comments) for key, item in value.items()
+        }
+        kept = trailing_comments(value, comments) if comments else None
+        return commented_frozen_dict(items, kept) if kept else FrozenDict(items)
+    if isinstance(value, list):
+        return tuple(detach(item, comments) for item in value)
+    for builtin in (str, int, float):
+        if isinstance(value, builtin):
+            return builtin(value)
+    return value
+
+
+def construct(cls: Type[Model], **fields: Any) -> Model:
+    """Create a model from the values of its fields.
+
+    dataclass_json(undefined=Undefined.EXCLUDE) wraps the __init__ of a model
+    so that unknown keyword arguments are dropped, which binds the signature
+    of __init__ on every call. The fields passed here are always known, so
+    the __init__ generated by dataclass is called directly.
+
+    Args:
+      cls:
+        The model to create
+      fields:
+        The values of the fields, by field name
+
+    Returns:
+      The new model.
+    """
+    init = getattr(cls.__init__, "__wrapped__", cls.__init__)
+    model = cls.__new__(cls)
+    init(model, **fields)
+    return model
+
+
+def deferred() -> Any:
+    """Declare the field that holds the YAML of a lazily built field until it is used.
+
+    The field of a model named `name` is built lazily by keeping its YAML in
+    a `_name_yaml` field declared with deferred(), which is left out of the
+    constructor, repr(), comparisons and to_dict().
+    """
+    return field(
+        default=None,
+        init=False,
+        repr=False,
+        compare=False,
+        metadata=config(exclude=lambda _: True),
+    )
+
+
+def defer(model: Any, name: str, data: Any) -> None:
+    """Leave a field of a model unset, to be built from its YAML on first use.
+
+    Reading the unset field calls the __getattr__ of the model, which builds it
+    with build_deferred().
+
+    Args:
+      model:
+        The model that was just constructed
+      name:
+        The name of the field to build lazily
+      data:
+        The YAML to build the field from, detached from the loaded YAML (see
+        detach()) so the model does not keep the whole document alive
+    """
+    delattr(model, name)
+    setattr(model, f"_{name}_yaml", data)
+
+
+def build_deferred(model: Any, name: str, build: Callable[[Any], Any]) -> Any:
+    """Build a field that was deferred with defer(), and release its YAML.
+
+    Args:
+      model:
+        The model the field belongs to
+      name:
+        The name of the field
+      build:
+        Function that builds the value of the field from its YAML
+
+    Returns:
+      The value of the field.
+    """
+    data = getattr(model, f"_{name}_yaml")
+    try:
+        with build_timer():
+            value = build(data)
+    except Exception as e:
+        raise WorkflowBuilderError(f"Error building workflow: {e}")
+    setattr(model, name, value)
+    setattr(model, f"_{name}_yaml", None)
+    return value
@@ -1,16 +1,25 @@
 """Representation for a job in a GitHub Action workflow."""
 
 from dataclasses import dataclass, field
-from typing import List, Optional, Self
+from typing import Any, Dict, List, Optional, Self, Tuple
 
 from dataclasses_json import config, dataclass_json, Undefined
 from ruamel.yaml.comments import CommentedMap
 
+from .construct import (
+    DEFERRED_COMMENTS,
+    FrozenDict,
+    build_deferred,
+    construct,
+    defer,
+    deferred,
+    detach,
+)
 from .step import Step
 
 
 @dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@dataclass(slots=True)
 class Job:
     """Represents a job in a GitHub Action workflow.
 
@@ -22,17 +31,28 @@ class Job:
     runs_on: Optional[str] = field(metadata=config(field_name="runs-on"), default=None)
     key: Optional[str] = None
     name: Optional[str] = None
-    env: Optional[CommentedMap] = None
-    needs: Optional[List[str]] = None
+    env: Optional[Dict[str, Any]] = None
+    needs: Optional[Tuple[str, ...]] = None
     steps: Optional[List[Step]] = None
     uses: Optional[str] = None
     uses_path: Optional[str] = None
     uses_ref: Optional[str] = None
-    uses_with: Optional[CommentedMap] = field(
+    uses_with: Optional[Dict[str, Any]] = field(
         metadata=config(field_name="with"), default=None
     )
-    outputs: Optional[CommentedMap] = None
-    permissions: Optional[object] = None  # This can be a CommentedMap or a string
+    outputs: Optional[Dict[str, Any]] = None
+    permissions: Optional[object] = None  # This can be a dict or a string
+    _steps_yaml: Optional[Tuple[FrozenDict, ...]] = deferred()
+
+    def __getattr__(self, name: str) -> Any:
+        """Build the Steps the first time that they are used."""
+        if name == "steps":
+            return build_deferred(self, "steps", self.build_steps)
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def build_steps(self, data: Tuple[FrozenDict, ...]) -> List[Step]:
+        """Build the Steps of the Job from their YAML."""
+        return [Step.init(idx, self.key, step_data) for idx, step_data in enumerate(data)]
 
     @classmethod
     def parse_needs(cls: Self, value):
@@ -43,26 +63,26 @@ class Job:
 
     @classmethod
     def init(cls: Self, key: str, data: CommentedMap) -> Self:
-        """Custom dataclass constructor to map job data to a Job."""
-        init_data = {
-            "key": key,
-            "name": data["name"] if "name" in data else None,
-            "runs-on": data["runs-on"] if "runs-on" in data else None,
-            "env": data["env"] if "env" in data else None,
-            "needs": Job.parse_needs(data["needs"]) if "needs" in data else None,
-            "outputs": data["outputs"] if "outputs" in data else None,
-            "permissions": data["permissions"] if "permissions" in data else None,
-        }
+        """Custom dataclass constructor to map job data to a Job.
 
-        new_job = cls.from_dict(init_data)
+        The Steps are only built when they are first used, so linting with
+        Rules that never look at Steps does not pay for building them.
+        """
+        new_job = construct(
+            cls,
+            key=detach(key),
+            name=detach(data.get("name")),
+            runs_on=detach(data.get("runs-on")),
+            env=detach(data.get("env")),
+            needs=detach(Job.parse_needs(data["needs"])) if "needs" in data else None,
+            outputs=detach(data.get("outputs")),
+            permissions=detach(data.get("permissions")),
+        )
 
         if "steps" in data:
-            new_job.steps = [
-                Step.init(idx, new_job.key, step_data)
-                for idx, step_data in enumerate(data["steps"])
-            ]
+            defer(new_job, "steps", detach(data["steps"], comments=DEFERRED_COMMENTS))
         else:
-            new_job.uses = data["uses"].replace("\n", "")
+            new_job.uses = detach(data["uses"]).replace("\n", "")
             if "@" in new_job.uses:
                 new_job.uses_path, new_job.uses_ref = new_job.uses.split("@")
 
@@ -1,47 +1,98 @@
 """Representation for a job step in a GitHub Action workflow."""
 
 from dataclasses import dataclass, field
-from typing import Optional, Self
+from typing import Any, Dict, Optional, Self
 
 from dataclasses_json import config, dataclass_json, Undefined
 from ruamel.yaml.comments import CommentedMap
 
+from .construct import construct, detach, trailing_comments
+
+# The kinds of Steps, see Step.kind
+STEP_KINDS = ("run", "local", "remote", "empty")
+
+
+def trailing_comment(data: CommentedMap, key: str) -> Optional[str]:
+    """Get the comment after the value of a key, without its line breaks.
+
+    Args:
+      data:
+        A mapping loaded by the round-trip loader of ruamel (with the comments
+        in `.ca`), by the fast loader or detached with its comments (with the
+        comments in `.comments`)
+      key:
+        The key of the mapping
+
+    Returns:
+      The comment, or None if there is no comment after the value.
+    """
+    comment = trailing_comments(data, (key,)).get(key)
+    return comment.replace("\n", "") if comment is not None else None
+
 
 @dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@dataclass(slots=True)
 class Step:
     """Represents a step in a GitHub Action workflow job.
 
     This object contains all of the data that is required to run the current linting
     Rules against. If a new Rule requires a key that is missing, the attribute should
     be added to this class to make it available for use in linting.
+
+    The values are copied out of the loaded YAML (see detach()), so a Step does
+    not keep the YAML of its workflow alive.
     """
 
     key: Optional[int] = None
     job: Optional[str] = None
     name: Optional[str] = None
-    env: Optional[CommentedMap] = None
+    env: Optional[Dict[str, Any]] = None
     uses: Optional[str] = None
     uses_path: Optional[str] = None
     uses_ref: Optional[str] = None
     uses_comment: Optional[str] = None
     uses_version: Optional[str] = None
-    uses_with: Optional[CommentedMap] = field(
+    uses_with: Optional[Dict[str, Any]] = field(
         metadata=config(field_name="with"), default=None
     )
     run: Optional[str] = None
 
+    @property
+    def kind(self) -> str:
+        """Classify the Step so Rules are only run on the Steps they apply to.
+
+        Returns:
+          "remote" for a versioned action (uses with '@'), "local" for any other
+          action (ie. ./path/to/action), "run" for a shell step and "empty" for a
+          step with neither.
+        """
+        if self.uses:
+            return "remote" if "@" in self.uses else "local"
+        if self.run is not None:
+            return "run"
+        return "empty"
+
     @classmethod
     def init(cls: Self, idx: int, job: str, data: CommentedMap) -> Self:
-        """Custom dataclass constructor to map a job step data to a Step."""
-        new_step = cls.from_dict(data)
+        """Custom dataclass constructor to map a job step data to a Step.
 
-        new_step.key = idx
-        new_step.job = job
+        The fields are set directly rather than through from_dict(), which
+        inspects the type of every field again for every Step.
+        """
+        new_step = construct(
+            cls,
+            key=idx,
+            job=job,
+            name=detach(data.get("name")),
+            env=detach(data.get("env")),
+            uses=detach(data.get("uses")),
+            uses_with=detach(data.get("with")),
+            run=detach(data.get("run")),
+        )
 
         if new_step.uses:
-            if "uses" in data.ca.items and data.ca.items["uses"][2]:
-                new_step.uses_comment = data.ca.items["uses"][2].value.replace("\n", "")
+            new_step.uses_comment = trailing_comment(data, "uses")
+            if new_step.uses_comment is not None:
                 new_step.uses_version = new_step.uses_comment.split(" ")[-1]
             if "@" in new_step.uses:
                 new_step.uses_path, new_step.uses_ref = new_step.uses.split("@")
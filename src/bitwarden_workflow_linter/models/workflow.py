@@ -1,16 +1,25 @@
 """Representation for an entire GitHub Action workflow."""
 
 from dataclasses import dataclass
-from typing import Dict, Optional, Self
+from typing import Any, Dict, Optional, Self
 
 from dataclasses_json import dataclass_json, Undefined
 from ruamel.yaml.comments import CommentedMap
 
+from .construct import (
+    DEFERRED_COMMENTS,
+    FrozenDict,
+    build_deferred,
+    construct,
+    defer,
+    deferred,
+    detach,
+)
 from .job import Job
 
 
 @dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@dataclass(slots=True)
 class Workflow:
     """Represents an entire workflow in a GitHub Action workflow.
 
@@ -25,25 +34,38 @@ class Workflow:
     key: str = ""
     filename: Optional[str] = None
     name: Optional[str] = None
-    on: Optional[CommentedMap] = None
+    on: Optional[Dict[str, Any]] = None
     jobs: Optional[Dict[str, Job]] = None
-    permissions: Optional[object] = None  # This can be a CommentedMap or a string
+    permissions: Optional[object] = None  # This can be a dict or a string
+    _jobs_yaml: Optional[FrozenDict] = deferred()
+
+    def __getattr__(self, name: str) -> Any:
+        """Build the Jobs the first time that they are used."""
+        if name == "jobs":
+            return build_deferred(self, "jobs", self.build_jobs)
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    @staticmethod
+    def build_jobs(data: FrozenDict) -> Dict[str, Job]:
+        """Build the Jobs of the Workflow from their YAML."""
+        return {str(job_key): Job.init(job_key, job) for job_key, job in data.items()}
 
     @classmethod
     def init(cls: Self, key: str, filename: str, data: CommentedMap) -> Self:
-        init_data = {
-            "key": key,
-            "filename": filename,
-            "name": data["name"] if "name" in data else None,
-            "on": data["on"] if "on" in data else None,
-            "permissions": data["permissions"] if "permissions" in data else None,
-        }
-
-        new_workflow = cls.from_dict(init_data)
-
-        new_workflow.jobs = {
-            str(job_key): Job.init(job_key, job)
-            for job_key, job in data["jobs"].items()
-        }
+        """Custom dataclass constructor to map workflow data to a Workflow.
+
+        The Jobs are only built when they are first used (see Job.init for
+        the Steps).
+        """
+        new_workflow = construct(
+            cls,
+            key=key,
+            filename=filename,
+            name=detach(data.get("name")),
+            on=detach(data.get("on")),
+            permissions=detach(data.get("permissions")),
+        )
+
+        defer(new_workflow, "jobs", detach(data["jobs"], comments=DEFERRED_COMMENTS))
 
         return new_workflow
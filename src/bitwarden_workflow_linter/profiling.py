@@ -0,0 +1,178 @@
+"""Module providing the timing profile of `bwwl lint --profile`."""
+
+import contextlib
+import cProfile
+import math
+import time
+
+from collections import defaultdict
+from typing import Any, Callable, Iterator, Optional
+
+from .load import Rules
+from .models import construct
+from .rule import Rule
+
+# The number of files listed in the slowest files of the report
+SLOWEST_FILES = 10
+
+
+def percentile(durations: list[float], fraction: float) -> float:
+    """Get a percentile of a list of durations (nearest-rank method)."""
+    ordered = sorted(durations)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class Profiler:
+    """Collect high resolution timings of each phase of linting and of each Rule.
+
+    Phases are timed with timer(). The Rules are timed by wrapping the methods
+    of each loaded Rule (see instrument()), which is only done while profiling
+    so that linting without --profile is not slowed down. The Jobs and Steps
+    that are built lazily while a Rule runs are timed in the "build" phase and
+    left out of the time of the Rule.
+    """
+
+    def __init__(self, stats_file: Optional[str] = None) -> None:
+        """Initialize the Profiler.
+
+        Args:
+          stats_file:
+            Where to dump the cProfile stats of the run (not collected if None)
+        """
+        self.stats_file = stats_file
+        self.timings: dict[tuple[str, str], list[float]] = defaultdict(list)
+        self.files: dict[str, float] = {}
+        self.deferred_builds = 0.0
+        self._instrumented: list[tuple[Any, str, Optional[Callable]]] = []
+        self._cprofile: Optional[cProfile.Profile] = None
+
+    @contextlib.contextmanager
+    def timer(self, section: str, name: str) -> Iterator[None]:
+        """Time the body of a with statement.
+
+        Args:
+          section:
+            What is being timed: "phase", "rule" or "file"
+          name:
+            The name of the phase, Rule or file
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if section == "file":
+                self.files[name] = self.files.get(name, 0.0) + elapsed
+            else:
+                self.timings[(section, name)].append(elapsed)
+
+    @contextlib.contextmanager
+    def build_timer(self) -> Iterator[None]:
+        """Time a lazily built field of a model (see build_deferred())."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings[("phase", "build")].append(elapsed)
+            self.deferred_builds += elapsed
+
+    def wrap(self, obj: Any, method: str, name: str) -> None:
+        """Replace a method of an object by one that times every call.
+
+        The time spent building deferred fields during the call is left out.
+        """
+        original = getattr(obj, method)
+        timings = self.timings[("rule", name)]
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            built = self.deferred_builds
+            try:
+                return original(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                timings.append(elapsed - (self.deferred_builds - built))
+
+        self._instrumented.append((obj, method, vars(obj).get(method)))
+        setattr(obj, method, timed)
+
+    def instrument(self, rules: Rules) -> None:
+        """Time the evaluate() calls of every loaded Rule.
+
+        The prepare() calls are timed as well for the Rules that override it
+        (ie. to run an external tool over all of the files), and so are the
+        lazily built Jobs and Steps.
+        """
+        self._instrumented.append((construct, "build_timer", construct.build_timer))
+        construct.build_timer = self.build_timer
+
+        seen = set()
+        for rule in rules.workflow + rules.job + rules.step:
+            if id(rule) in seen:
+                continue
+            seen.add(id(rule))
+            name = type(rule).__name__
+            self.wrap(rule, "evaluate", name)
+            if type(rule).prepare is not Rule.prepare:
+                self.wrap(rule, "prepare", f"{name}.prepare")
+
+    def restore(self) -> None:
+        """Undo instrument()."""
+        for obj, method, previous in reversed(self._instrumented):
+            if previous is None:
+                delattr(obj, method)
+            else:
+                setattr(obj, method, previous)
+        self._instrumented = []
+
+    def __enter__(self) -> "Profiler":
+        if self.stats_file is not None:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.restore()
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.stats_file)
+            self._cprofile = None
+
+    def report(self) -> str:
+        """Format the collected timings as a table.
+
+        Returns:
+          The total, mean and 95th percentile time of each phase and Rule,
+          followed by the slowest files.
+        """
+        lines = [
+            "===== Profile =====",
+            f"{'':<8} {'name':<36} {'calls':>7} {'total (s)':>10} "
+            f"{'mean (ms)':>10} {'p95 (ms)':>10}",
+        ]
+        for section in ("phase", "rule"):
+            rows = [
+                (name, durations)
+                for (kind, name), durations in self.timings.items()
+                if kind == section and durations
+            ]
+            for name, durations in sorted(rows, key=lambda row: -sum(row[1])):
+                total = sum(durations)
+                lines.append(
+                    f"{section:<8} {name:<36} {len(durations):>7} {total:>10.4f} "
+                    f"{total / len(durations) * 1000:>10.3f} "
+                    f"{percentile(durations, 0.95) * 1000:>10.3f}"
+                )
+
+        slowest = sorted(self.files.items(), key=lambda item: -item[1])[:SLOWEST_FILES]
+        if slowest:
+            lines.append("")
+            lines.append(f"Slowest {len(slowest)} file(s):")
+            for filename, elapsed in slowest:
+                lines.append(f"  {elapsed:>8.4f}s  {filename}")
+
+        if self.stats_file is not None:
+            lines.append("")
+            lines.append(f"cProfile stats written to {self.stats_file}")
+        return "\n".join(lines)
@@ -0,0 +1,171 @@
+"""Module providing the scheduling of GitHub API requests around its rate limits."""
+
+import logging
+import random
+import threading
+import time
+
+from typing import Callable, Mapping, Optional
+
+# Below this many remaining requests, the requests are spread evenly over the
+# time left until the rate limit resets instead of being sent at once
+RATE_LIMIT_RESERVE = 50
+
+# The number of times a rate limited or failed request is retried
+MAX_RETRIES = 5
+
+# The first delay before retrying a failed request, doubled on each retry
+BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 60.0
+
+# The longest a request waits for the rate limit to reset before giving up
+MAX_WAIT_SECONDS = 15 * 60.0
+
+
+def header_float(headers: Mapping[str, str], name: str) -> Optional[float]:
+    """Get a numeric header, or None if it is missing or not a number."""
+    try:
+        return float(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Schedule the requests of several threads within the GitHub API rate limit.
+
+    The rate limit state comes from the X-RateLimit-Remaining and
+    X-RateLimit-Reset headers of every response. Once fewer than `reserve`
+    requests remain, wait() spaces the requests so the remaining ones last
+    until the reset, and once none remain it waits for the reset. retry_delay()
+    tells how long to wait before retrying a rate limited request (from
+    Retry-After or X-RateLimit-Reset) or a server error (exponential backoff
+    with jitter).
+    """
+
+    def __init__(
+        self,
+        reserve: int = RATE_LIMIT_RESERVE,
+        max_retries: int = MAX_RETRIES,
+        backoff: float = BACKOFF_SECONDS,
+        max_backoff: float = MAX_BACKOFF_SECONDS,
+        max_wait: float = MAX_WAIT_SECONDS,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Initialize the RateLimiter.
+
+        Args:
+          reserve:
+            The number of remaining requests below which requests are paced
+          max_retries:
+            The number of retries of a request before giving up
+          backoff:
+            The delay before the first retry of a server error, in seconds
+          max_backoff:
+            The longest delay between the retries of a server error
+          max_wait:
+            The longest delay to wait for the rate limit to reset
+          clock:
+            The current time as a Unix timestamp (time.time by default)
+          sleep:
+            The function to wait with (time.sleep by default)
+        """
+        self.reserve = reserve
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_wait = max_wait
+        self.clock = clock
+        self.sleep = sleep
+        self.remaining: Optional[int] = None
+        self.reset: Optional[float] = None
+        self._next_request = 0.0
+        self._lock = threading.Lock()
+
+    def delay(self) -> float:
+        """Reserve the next request and get how long to wait before sending it."""
+        with self._lock:
+            now = self.clock()
+            if self.reset is not None and now >= self.reset:
+                # A new rate limit window started
+                self.remaining = self.reset = None
+            if self.remaining is None or self.reset is None:
+                return 0.0
+
+            if self.remaining <= 0:
+                delay = self.reset - now
+            elif self.remaining <= self.reserve:
+                start = max(now, self._next_request)
+                self._next_request = start + (self.reset - now) / self.remaining
+                delay = start - now
+            else:
+                delay = 0.0
+            self.remaining -= 1
+            return min(delay, self.max_wait)
+
+    def wait(self) -> None:
+        """Wait until the next request can be sent without exhausting the rate limit."""
+        delay = self.delay()
+        if delay > 0:
+            if delay >= 1:
+                logging.warning(
+                    "Close to the GitHub API rate limit, waiting %.0f seconds", delay
+                )
+            self.sleep(delay)
+
+    def observe(self, headers: Mapping[str, str]) -> None:
+        """Update the rate limit state from the headers of a response."""
+        remaining = header_float(headers, "X-RateLimit-Remaining")
+        reset = header_float(headers, "X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+        with self._lock:
+            if self.reset == reset and self.remaining is not None:
+                # Responses of concurrent requests arrive in any order
+                self.remaining = min(self.remaining, int(remaining))
+            else:
+                self.remaining = int(remaining)
+            self.reset = reset
+
+    def retry_delay(
+        self, status: int, headers: Mapping[str, str], attempt: int
+    ) -> Optional[float]:
+        """Get how long to wait before retrying a request.
+
+        Args:
+          status:
+            The HTTP status of the response
+          headers:
+            The headers of the response
+          attempt:
+            The number of retries of the request so far
+
+        Returns:
+          The delay in seconds, or None if the request should not be retried.
+        """
+        if attempt >= self.max_retries:
+            return None
+
+        if status in (403, 429):
+            retry_after = header_float(headers, "Retry-After")
+            reset = header_float(headers, "X-RateLimit-Reset")
+            if retry_after is not None:
+                delay = retry_after
+            elif headers.get("X-RateLimit-Remaining") == "0" and reset is not None:
+                # The primary rate limit is exhausted until it resets
+                delay = max(0.0, reset - self.clock()) + 1
+            elif status == 429:
+                delay = self.backoff_delay(attempt)
+            else:
+                # Forbidden for another reason than the rate limit
+                return None
+            return delay if delay <= self.max_wait else None
+
+        if status >= 500:
+            return self.backoff_delay(attempt)
+        return None
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Get the exponential backoff before a retry, with up to 10% of jitter."""
+        delay = min(self.max_backoff, self.backoff * 2**attempt)
+        return delay * random.uniform(0.9, 1.0)
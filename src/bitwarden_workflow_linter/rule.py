@@ -1,6 +1,6 @@
 """Base Rule class to build rules by extending."""
 
-from typing import List, Optional, Tuple, Union
+from typing import FrozenSet, List, Optional, Tuple, Union
 
 from .models.workflow import Workflow
 from .models.job import Job
@@ -20,6 +20,12 @@ class Rule:
     on_fail: LintLevels = LintLevels.ERROR
     compatibility: List[Union[Workflow, Job, Step]] = [Workflow, Job, Step]
     settings: Optional[Settings] = None
+    # Set to False when the findings depend on something other than the file
+    # content and Settings (ie. an external tool that could not be installed)
+    cacheable: bool = True
+    # The kinds of Steps (see Step.kind) the Rule can fail on, or None for all of
+    # them. Steps of any other kind are never passed to the Rule while linting.
+    step_kinds: Optional[FrozenSet[str]] = None
 
     def fn(self, obj: Union[Workflow, Job, Step]) -> Tuple[bool, str]:
         """Execute the Rule (this should be overridden in the extending class.
@@ -33,6 +39,36 @@ class Rule:
         """
         return False, f"{obj.name}: <default fail message>"
 
+    def prepare(self, filenames: List[str]) -> None:
+        """Prepare the Rule with every file of the run before any are linted.
+
+        This does nothing by default. Rules wrapping an external tool override it
+        to run the tool once over all of the files instead of once per workflow.
+
+        Args:
+          filenames:
+            All of the workflow files that are about to be linted
+        """
+        return None
+
+    def cache_inputs(self, filename: str, content: bytes) -> List[str]:
+        """Get what the findings of a file depend on besides its content and Settings.
+
+        The result cache folds these into the key of the file. This is empty by
+        default. Rules wrapping an external tool override it to return the
+        hashes of the other files that the tool reads (ie. its configuration).
+
+        Args:
+          filename:
+            The workflow file about to be linted
+          content:
+            The content of the file
+
+        Returns:
+          Strings that change whenever the findings of the file could change.
+        """
+        return []
+
     def build_lint_message(self, message: str, obj: Union[Workflow, Job, Step]) -> str:
         """Build the lint failure message.
 
@@ -74,8 +110,6 @@ class Rule:
           and a LintLevel that contains the level of error to calculate the
           exit code with.
         """
-        message = None
-
         if type(obj) not in self.compatibility:
             return LintFinding(
                 self.build_lint_message(
@@ -85,6 +119,23 @@ class Rule:
                 LintLevels.ERROR,
             )
 
+        return self.evaluate(obj)
+
+    def evaluate(self, obj: Union[Workflow, Job, Step]) -> Union[LintFinding, None]:
+        """Execute the Rule against an object that is known to be compatible.
+
+        This is execute() without the compatibility check, for callers that
+        only pass objects the Rule was selected for (see Rules.step_plan).
+
+        Args:
+          obj:
+            The object the Rule is being run against
+
+        Returns:
+          A LintFinding object, or None if the Rule passed.
+        """
+        message = None
+
         try:
             passed, message = self.fn(obj)
 
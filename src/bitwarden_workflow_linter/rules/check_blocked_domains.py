@@ -1,8 +1,8 @@
 """A Rule to check for blocked/malicious domains in workflow content."""
 
-import re
-from typing import List, Optional, Tuple, Union
+from typing import FrozenSet, Iterable, List, Optional, Tuple, Union
 
+from ..domains import extract_domains
 from ..models.job import Job
 from ..models.step import Step
 from ..models.workflow import Workflow
@@ -34,6 +34,42 @@ class RuleCheckBlockedDomains(Rule):
         
         # Get blocked domains from settings, use defaults if none provided
         self.blocked_domains = settings.blocked_domains if settings else []
+        self.blocked_suffixes = self.compile_blocked_domains(self.blocked_domains)
+
+    @staticmethod
+    def compile_blocked_domains(blocked_domains: Iterable[str]) -> FrozenSet[str]:
+        """Normalize the blocked domains into a set for suffix lookups.
+
+        Args:
+            blocked_domains: The blocked domains from the settings
+
+        Returns:
+            The lowercased and stripped blocked domains, without empty entries.
+        """
+        suffixes = (domain.lower().strip() for domain in blocked_domains)
+        return frozenset(suffix for suffix in suffixes if suffix)
+
+    def is_blocked(self, domain: str) -> bool:
+        """Check if a domain is a blocked domain or one of its subdomains.
+
+        Every suffix of the domain that starts at a label is looked up in the
+        set of blocked domains, so the cost depends on the number of labels of
+        the domain and not on the size of the blocklist.
+
+        Args:
+            domain: The domain to check
+
+        Returns:
+            True if the domain or any of its parent domains is blocked.
+        """
+        suffix = domain.lower().strip()
+        while True:
+            if suffix in self.blocked_suffixes:
+                return True
+            dot = suffix.find(".")
+            if dot == -1:
+                return False
+            suffix = suffix[dot + 1:]
 
     def extract_domains_from_text(self, text: str) -> List[str]:
         """Extract domain names from text content.
@@ -46,34 +82,7 @@ class RuleCheckBlockedDomains(Rule):
         """
         if not text:
             return []
-            
-        # Pattern to match domain names in various contexts
-        # Breaking down the regex:
-        # (?:https?://)?           - Optional protocol (http:// or https://)
-        # (?:www\.)?               - Optional www. prefix
-        # ([a-zA-Z0-9]             - Start of capturing group: first character (alphanumeric)
-        #   (?:[a-zA-Z0-9-]{0,61}  - Non-capturing group: 0-61 alphanumeric or hyphen chars
-        #   [a-zA-Z0-9])?          - End with alphanumeric (ensures no trailing hyphen)
-        # \.)+                     - Followed by dot, repeated (for subdomains)
-        # [a-zA-Z]{2,}             - Top-level domain (2+ letters)
-        # (?:/[^\s]*)?             - Optional path (slash followed by non-whitespace chars)
-        domain_pattern = r'(?:https?://)?(?:www\.)?([a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,}(?:/[^\s]*)?'
-        
-        domains = set()
-        
-        # Find all matches and extract the domain part
-        for match in re.finditer(domain_pattern, text, re.IGNORECASE):
-            full_match = match.group(0)
-            # Clean up the domain (remove protocol, www, path)
-            domain = re.sub(r'^https?://', '', full_match)
-            domain = re.sub(r'^www\.', '', domain)
-            domain = re.sub(r'/.*$', '', domain)  # Remove path
-            domain = domain.lower().strip()
-            
-            if domain and '.' in domain:
-                domains.add(domain)
-        
-        return list(domains)
+        return extract_domains(text)
 
     def check_blocked_domains(self, text: str) -> Tuple[bool, List[str]]:
         """Check if text contains any blocked domains.
@@ -87,17 +96,12 @@ class RuleCheckBlockedDomains(Rule):
         if not text:
             return True, []
             
-        domains = self.extract_domains_from_text(text)
-        blocked_found = []
-        
-        for domain in domains:
-            for blocked_domain in self.blocked_domains:
-                blocked_domain_lc = blocked_domain.lower().strip()
-                domain_lc = domain.lower().strip()
-                # Check for exact match or subdomain match
-                if domain_lc == blocked_domain_lc or domain_lc.endswith('.' + blocked_domain_lc):
-                    blocked_found.append(domain)
-                    
+        if not self.blocked_suffixes:
+            return True, []
+
+        blocked_found = [
+            domain for domain in self.extract_domains_from_text(text) if self.is_blocked(domain)
+        ]
         return len(blocked_found) == 0, blocked_found
 
     def fn(self, obj: Union[Workflow, Job, Step]) -> Tuple[bool, str]:
@@ -1,6 +1,6 @@
 """A Rule to run actionlint on workflows."""
 
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 import subprocess
 import platform
 import urllib.request
@@ -9,13 +9,52 @@ import os
 import tarfile
 import io
 import hashlib
+import json
+import re
 
 from ..rule import Rule
 from ..models.workflow import Workflow
-from ..utils import LintLevels, Settings
+from ..tools import resolve_tool
+from ..utils import (
+    LintLevels,
+    Settings,
+    cache_dir,
+    chunk_arguments,
+    file_hash,
+    file_lock,
+)
 
 
-_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "bwwl")
+_RELEASES_URL = "https://github.com/rhysd/actionlint/releases/download"
+
+# The configuration files that actionlint reads from the root of a project
+_CONFIG_FILES = (".github/actionlint.yaml", ".github/actionlint.yml")
+
+# The local actions and reusable workflows (uses: ./path) that actionlint reads
+_LOCAL_USES = re.compile(rb"""^[\s-]*uses:\s*['"]?(\./[^\s'"#]+)""", re.MULTILINE)
+
+
+def actionlint_platform() -> str:
+    """Get the <os>_<arch> name that actionlint releases are published for."""
+    system = platform.system().lower()
+    arch_map = {"x86_64": "amd64", "aarch64": "arm64"}
+    arch = arch_map.get(platform.machine().lower(), platform.machine().lower())
+    return f"{system}_{arch}"
+
+
+def actionlint_cache_dir(version: str) -> str:
+    """Get the cache directory of a single actionlint version."""
+    return os.path.join(cache_dir(), "actionlint", version)
+
+
+def actionlint_binary_path(version: str) -> str:
+    """Get the path actionlint is installed to when downloaded from a release.
+
+    Every version and platform has its own directory, so several versions can
+    be installed side by side:
+      <cache_dir>/actionlint/<version>/<os>_<arch>/actionlint
+    """
+    return os.path.join(actionlint_cache_dir(version), actionlint_platform(), "actionlint")
 
 
 def install_actionlint(platform_system: str, version: str) -> Tuple[bool, str]:
@@ -36,12 +75,36 @@ def install_actionlint(platform_system: str, version: str) -> Tuple[bool, str]:
     return False, error
 
 
-def _verify_checksum(data: bytes, filename: str, version: str) -> bool:
-    """Verify SHA256 of downloaded tarball against the published checksums file."""
-    checksum_url = f"https://github.com/rhysd/actionlint/releases/download/v{version}/actionlint_{version}_checksums.txt"
+def _load_checksums(version: str) -> Optional[str]:
+    """Get the published checksums file of a release, downloading it only once."""
+    checksums_path = os.path.join(actionlint_cache_dir(version), "checksums.txt")
+    try:
+        with open(checksums_path, encoding="utf8") as file:
+            return file.read()
+    except OSError:
+        pass
+
+    checksum_url = f"{_RELEASES_URL}/v{version}/actionlint_{version}_checksums.txt"
     try:
         checksums = urllib.request.urlopen(checksum_url, timeout=30).read().decode()
     except (urllib.error.URLError, OSError):
+        return None
+
+    try:
+        os.makedirs(os.path.dirname(checksums_path), exist_ok=True)
+        tmp_path = f"{checksums_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf8") as file:
+            file.write(checksums)
+        os.replace(tmp_path, checksums_path)
+    except OSError:
+        pass
+    return checksums
+
+
+def _verify_checksum(data: bytes, filename: str, version: str) -> bool:
+    """Verify SHA256 of downloaded tarball against the published checksums file."""
+    checksums = _load_checksums(version)
+    if checksums is None:
         return False
     for line in checksums.splitlines():
         parts = line.split()
@@ -51,28 +114,41 @@ def _verify_checksum(data: bytes, filename: str, version: str) -> bool:
 
 
 def install_actionlint_source(error, version) -> Tuple[bool, str]:
-    """Download and install actionlint binary directly from GitHub releases."""
-    system = platform.system().lower()
-    arch_map = {"x86_64": "amd64", "aarch64": "arm64"}
-    arch = arch_map.get(platform.machine().lower(), platform.machine().lower())
-    filename = f"actionlint_{version}_{system}_{arch}.tar.gz"
-    url = f"https://github.com/rhysd/actionlint/releases/download/v{version}/{filename}"
-    binary_path = os.path.join(_CACHE_DIR, "actionlint")
-    os.makedirs(_CACHE_DIR, exist_ok=True)
+    """Download and install actionlint binary directly from GitHub releases.
+
+    The binary is installed into its versioned cache directory while holding a
+    lock on it, so parallel runs on the same machine download it only once and
+    never see a partially written binary.
+    """
+    filename = f"actionlint_{version}_{actionlint_platform()}.tar.gz"
+    url = f"{_RELEASES_URL}/v{version}/{filename}"
+    binary_path = actionlint_binary_path(version)
+
+    # Older versions installed a single binary where the versioned directories live
+    legacy_path = os.path.join(cache_dir(), "actionlint")
     try:
-        data = urllib.request.urlopen(url, timeout=30).read()
-        if not _verify_checksum(data, filename, version):
-            return False, f"{error} : checksum verification failed"
-        with tarfile.open(fileobj=io.BytesIO(data)) as tar:
-            member = next((m for m in tar.getmembers() if m.name == "actionlint"), None)
-            if member is None:
-                return False, error
-            src = tar.extractfile(member)
-            if src is None:
-                return False, error
-            with src, open(binary_path, "wb") as dst:
-                dst.write(src.read())
-        os.chmod(binary_path, 0o755)
+        if os.path.isfile(legacy_path):
+            os.remove(legacy_path)
+
+        with file_lock(os.path.join(os.path.dirname(binary_path), ".lock")):
+            if os.path.isfile(binary_path):
+                return True, binary_path
+
+            data = urllib.request.urlopen(url, timeout=30).read()
+            if not _verify_checksum(data, filename, version):
+                return False, f"{error} : checksum verification failed"
+            with tarfile.open(fileobj=io.BytesIO(data)) as tar:
+                member = next((m for m in tar.getmembers() if m.name == "actionlint"), None)
+                if member is None:
+                    return False, error
+                src = tar.extractfile(member)
+                if src is None:
+                    return False, error
+                tmp_path = f"{binary_path}.tmp"
+                with src, open(tmp_path, "wb") as dst:
+                    dst.write(src.read())
+            os.chmod(tmp_path, 0o755)
+            os.replace(tmp_path, binary_path)
         return True, binary_path
     except (urllib.error.URLError, tarfile.TarError, OSError):
         return False, error
@@ -102,7 +178,8 @@ please check your package installer or manually install it",
         return check_actionlint_local(platform_system, version)
 
 def check_actionlint_local(platform_system: str, version: str) -> Tuple[bool, str]:
-    local_path = os.path.join(_CACHE_DIR, "actionlint")
+    """Check if the requested version of actionlint is installed in the cache."""
+    local_path = actionlint_binary_path(version)
     try:
         installed = subprocess.run(
             [local_path, "--version"],
@@ -115,10 +192,42 @@ def check_actionlint_local(platform_system: str, version: str) -> Tuple[bool, st
             return True, local_path
         else:
             return install_actionlint(platform_system, version)
-    except FileNotFoundError:
+    except (FileNotFoundError, NotADirectoryError):
         return install_actionlint(platform_system, version)
 
 
+def project_root(filename: str) -> Optional[str]:
+    """Find the project of a workflow the way actionlint does.
+
+    Returns:
+      The closest parent directory of the file with both .github/workflows and
+      .git in it, or None if the file is not in a project.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    while True:
+        if os.path.isdir(os.path.join(directory, ".github", "workflows")) and (
+            os.path.exists(os.path.join(directory, ".git"))
+        ):
+            return directory
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+def format_actionlint_errors(errors: List[dict]) -> str:
+    """Format actionlint JSON errors the same way as its default output."""
+    lines = []
+    for error in errors:
+        lines.append(
+            f"{error['filepath']}:{error['line']}:{error['column']}: "
+            f"{error['message']} [{error['kind']}]"
+        )
+        if error.get("snippet"):
+            lines.append(error["snippet"])
+    return "\n".join(lines) + "\n"
+
+
 class RunActionlint(Rule):
     """Rule to run actionlint as part of workflow linter V2."""
 
@@ -127,6 +236,73 @@ class RunActionlint(Rule):
         self.on_fail = lint_level
         self.compatibility = [Workflow]
         self.settings = settings
+        self.batch_results: dict[str, List[dict]] = {}
+
+    def resolve(self) -> Tuple[bool, str]:
+        """Check (and install if needed) actionlint once per process."""
+        version = self.settings.actionlint_version
+        installed, location = resolve_tool(
+            "actionlint", version, lambda: check_actionlint_path(platform.system(), version)
+        )
+        # Do not cache the results of files that could not be checked by actionlint
+        self.cacheable = installed
+        return installed, location
+
+    def cache_inputs(self, filename: str, content: bytes) -> List[str]:
+        """Hash the other files that actionlint reads to check a workflow.
+
+        These are the actionlint configuration of its project and the
+        action.yml of the local actions and the local reusable workflows that
+        it uses.
+        """
+        root = project_root(filename)
+        if root is None:
+            return []
+        paths = [os.path.join(root, config) for config in _CONFIG_FILES]
+        for match in _LOCAL_USES.finditer(content):
+            path = os.path.join(root, match.group(1).decode(errors="replace"))
+            if os.path.isdir(path):
+                paths.extend(os.path.join(path, name) for name in ("action.yml", "action.yaml"))
+            else:
+                paths.append(path)
+        return [f"{path}:{file_hash(path)}" for path in paths]
+
+    def prepare(self, filenames: List[str]) -> None:
+        """Run actionlint once over all of the files of the run.
+
+        The JSON output is split back up per file and kept until fn() is called
+        for each workflow. Files of a chunk that actionlint fails to process are
+        left out so fn() falls back to running actionlint on them directly.
+        """
+        self.batch_results = {}
+
+        if not filenames or not self.settings or not self.settings.actionlint_version:
+            return
+
+        installed, location = self.resolve()
+        if not installed:
+            return
+
+        for chunk in chunk_arguments(filenames):
+            result = subprocess.run(
+                [location or "actionlint", "-format", "{{json .}}", *chunk],
+                capture_output=True,
+                text=True,
+                check=False,
+            )
+            # 0: no errors, 1: errors found; anything else is a usage or fatal error
+            if result.returncode not in (0, 1):
+                continue
+            try:
+                errors = json.loads(result.stdout or "null") or []
+            except json.JSONDecodeError:
+                continue
+
+            errors_by_file = {os.path.normpath(filename): [] for filename in chunk}
+            for error in errors:
+                errors_by_file.setdefault(os.path.normpath(error["filepath"]), []).append(error)
+            for filename in chunk:
+                self.batch_results[filename] = errors_by_file[os.path.normpath(filename)]
 
     def fn(self, obj: Workflow) -> Tuple[bool, str]:
         if not obj or not obj.filename:
@@ -137,8 +313,14 @@ class RunActionlint(Rule):
         if not self.settings.actionlint_version:
             raise KeyError("The 'actionlint_version' is missing in the configuration file.")
 
+        if obj.filename in self.batch_results:
+            errors = self.batch_results[obj.filename]
+            if errors:
+                return False, format_actionlint_errors(errors)
+            return True, ""
+
         """Check if Actionlint is alerady installed and if it is installed somewhere not on the PATH (location)"""
-        installed, location = check_actionlint_path(platform.system(), self.settings.actionlint_version)
+        installed, location = self.resolve()
         if installed:
             if location:
                 result = subprocess.run(
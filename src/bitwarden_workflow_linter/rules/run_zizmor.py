@@ -1,18 +1,27 @@
 """A Rule to run zizmor on workflows."""
 
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 import subprocess
 import platform
 import urllib.request
 import urllib.error
 import tempfile
+import json
 import os
 
 from ..rule import Rule
 from ..models.workflow import Workflow
-from ..utils import LintLevels, Settings
+from ..tools import resolve_tool
+from ..utils import LintLevels, Settings, chunk_arguments, file_hash
 
 
+# zizmor exits with 0 when there are no findings and with 10-14 (depending on
+# the highest severity) when there are. Any other exit code is a failure.
+_FINDINGS_EXIT_CODES = range(10, 15)
+
+# The configuration files that zizmor discovers when it is not given --config
+_CONFIG_FILES = (".github/zizmor.yml", "zizmor.yml")
+
 def install_zizmor(platform_system: str, version: str) -> Tuple[bool, str]:
     """Install zizmor via pip."""
     error = f"An error occurred when installing Zizmor on {platform_system}"
@@ -64,6 +73,27 @@ def download_config_content(config_url: str) -> Optional[str]:
         return None
 
 
+def finding_location(finding: dict) -> Optional[dict]:
+    """Get the primary location of a zizmor JSON finding."""
+    locations = finding.get("locations") or []
+    for location in locations:
+        if location.get("symbolic", {}).get("kind") == "Primary":
+            return location
+    return locations[0] if locations else None
+
+
+def finding_path(finding: dict) -> Optional[str]:
+    """Get the path of the file that a zizmor JSON finding belongs to."""
+    location = finding_location(finding)
+    if location is None:
+        return None
+    key = location.get("symbolic", {}).get("key", {})
+    local = key.get("Local") if isinstance(key, dict) else None
+    if not local or not local.get("given_path"):
+        return None
+    return os.path.normpath(local["given_path"])
+
+
 class RunZizmor(Rule):
     """Rule to run zizmor as part of workflow linter."""
 
@@ -76,35 +106,143 @@ class RunZizmor(Rule):
         self.on_fail = lint_level
         self.compatibility = [Workflow]
         self.settings = settings
+        self.batch_results: dict[str, List[dict]] = {}
+        self._config_content: Optional[str] = None
+        self._config_downloaded = False
 
-    def fn(self, obj: Workflow) -> Tuple[bool, str]:
-        if not obj or not obj.filename:
-            raise AttributeError(
-                "Running zizmor without a filename is not currently supported"
-            )
+    def resolve(self) -> Tuple[bool, str]:
+        """Check (and install if needed) zizmor once per process."""
+        version = self.settings.zizmor_version
+        installed, location = resolve_tool(
+            "zizmor", version, lambda: check_zizmor_path(platform.system(), version)
+        )
+        # Do not cache the results of files that could not be checked by zizmor
+        self.cacheable = installed
+        return installed, location
 
-        if not self.settings.zizmor_version:
-            raise KeyError("The 'zizmor_version' is missing in the configuration file.")
+    def config_content(self) -> Optional[str]:
+        """Download the zizmor config once and reuse it for every invocation."""
+        if not self._config_downloaded and self.settings.zizmor_config_url:
+            self._config_content = download_config_content(self.settings.zizmor_config_url)
+            self._config_downloaded = True
+        return self._config_content
 
-        # Check if zizmor is already installed
-        installed, error = check_zizmor_path(
-            platform.system(), self.settings.zizmor_version
-        )
+    def cache_inputs(self, filename: str, content: bytes) -> List[str]:
+        """Get the zizmor configuration that a workflow is checked with.
+
+        This is the downloaded configuration if there is one, and otherwise the
+        hashes of the configuration files that zizmor would discover in the
+        parent directories of the workflow, up to the root of its repository.
+        """
+        if self.settings.zizmor_config_url:
+            return [f"config:{self.config_content()}"]
+
+        inputs = []
+        directory = os.path.dirname(os.path.abspath(filename))
+        while True:
+            for config in _CONFIG_FILES:
+                path = os.path.join(directory, config)
+                inputs.append(f"{path}:{file_hash(path)}")
+            parent = os.path.dirname(directory)
+            if os.path.exists(os.path.join(directory, ".git")) or parent == directory:
+                return inputs
+            directory = parent
+
+    def write_config(self, tmpdir: str) -> List[str]:
+        """Write the zizmor config to tmpdir and return the CLI arguments for it."""
+        config_content = self.config_content()
+        if not config_content:
+            return []
+        config_file = os.path.join(tmpdir, "zizmor.yml")
+        with open(config_file, "w") as f:
+            f.write(config_content)
+        return ["--config", config_file]
+
+    def prepare(self, filenames: List[str]) -> None:
+        """Run zizmor once over all of the files of the run.
+
+        The JSON findings are mapped back to the file they belong to and kept
+        until fn() is called for each workflow, so the files without findings
+        pass without running zizmor again. Files of a chunk that zizmor fails to
+        process, or with a finding that is not mapped to one of its files, are
+        left out so fn() falls back to running zizmor on them.
+        """
+        self.batch_results = {}
+
+        if not filenames or not self.settings or not self.settings.zizmor_version:
+            return
+
+        installed, _ = self.resolve()
         if not installed:
-            return False, error
+            return
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_args = self.write_config(tmpdir)
+            for chunk in chunk_arguments(filenames):
+                try:
+                    findings_by_file, _ = self.run_json(chunk, config_args)
+                except (FileNotFoundError, OSError):
+                    return
+                if findings_by_file is not None:
+                    self.batch_results.update(findings_by_file)
 
+    @staticmethod
+    def run_json(
+        filenames: List[str], config_args: List[str]
+    ) -> Tuple[Optional[dict[str, List[dict]]], str]:
+        """Run zizmor with JSON output and split its findings up per file.
+
+        The JSON findings are only used to tell which files have findings. The
+        findings are reported from the plain output of zizmor (see run_plain()).
+
+        Args:
+          filenames:
+            The workflow files to check
+          config_args:
+            The CLI arguments of the zizmor config (see write_config())
+
+        Returns:
+          The findings that are not ignored of each file, or None and the output
+          of zizmor if it failed or reported a finding that could not be mapped
+          back to one of the files.
+
+        Raises:
+          OSError: if zizmor could not be run.
+        """
+        result = subprocess.run(
+            ["zizmor", "--format", "json", *config_args, *filenames],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        output = result.stdout if result.stdout else result.stderr
+        if result.returncode != 0 and result.returncode not in _FINDINGS_EXIT_CODES:
+            return None, output
+        try:
+            findings = json.loads(result.stdout or "null") or []
+        except json.JSONDecodeError:
+            return None, output
+
+        findings_by_file = {os.path.normpath(filename): [] for filename in filenames}
+        for finding in findings:
+            if finding.get("ignored"):
+                continue
+            path = finding_path(finding)
+            if path not in findings_by_file:
+                # Passing the files of the chunk could hide this finding
+                return None, output
+            findings_by_file[path].append(finding)
+        return {
+            filename: findings_by_file[os.path.normpath(filename)] for filename in filenames
+        }, output
+
+    def run_plain(self, filename: str) -> Tuple[bool, str]:
+        """Run zizmor on a single workflow and get its plain output report."""
         cmd = ["zizmor", "--format", "plain"]
 
         with tempfile.TemporaryDirectory() as tmpdir:
-            if self.settings.zizmor_config_url:
-                config_content = download_config_content(self.settings.zizmor_config_url)
-                if config_content:
-                    config_file = os.path.join(tmpdir, "zizmor.yml")
-                    with open(config_file, "w") as f:
-                        f.write(config_content)
-                    cmd.extend(["--config", config_file])
-
-            cmd.append(obj.filename)
+            cmd.extend(self.write_config(tmpdir))
+            cmd.append(filename)
 
             try:
                 result = subprocess.run(
@@ -120,3 +258,24 @@ class RunZizmor(Rule):
             return True, ""
         output = result.stdout if result.stdout else result.stderr
         return False, output
+
+    def fn(self, obj: Workflow) -> Tuple[bool, str]:
+        if not obj or not obj.filename:
+            raise AttributeError(
+                "Running zizmor without a filename is not currently supported"
+            )
+
+        if not self.settings.zizmor_version:
+            raise KeyError("The 'zizmor_version' is missing in the configuration file.")
+
+        if obj.filename in self.batch_results and not self.batch_results[obj.filename]:
+            return True, ""
+
+        # Check if zizmor is already installed
+        installed, error = self.resolve()
+        if not installed:
+            return False, error
+
+        # Files with findings in the batch run, or left out of it, are reported
+        # with the plain output of zizmor on the file alone
+        return self.run_plain(obj.filename)
@@ -31,6 +31,8 @@ class RuleStepUsesApproved(Rule):
         """
         self.on_fail = lint_level
         self.compatibility = [Step]
+        # Only versioned actions (uses with '@') can fail, see skip()
+        self.step_kinds = frozenset({"remote"})
         self.settings = settings
 
     def skip(self, obj: Step) -> bool:
@@ -35,6 +35,8 @@ class RuleStepUsesPinned(Rule):
         """
         self.on_fail = lint_level
         self.compatibility = [Step]
+        # Only versioned actions (uses with '@') can fail, see skip()
+        self.step_kinds = frozenset({"remote"})
         self.settings = settings
 
     def skip(self, obj: Step) -> bool:
@@ -30,6 +30,8 @@ class RuleUnderscoreOutputs(Rule):
         self.message = "outputs with more than one word should use an underscore"
         self.on_fail = lint_level
         self.compatibility = [Workflow, Job, Step]
+        # Steps do not declare outputs, so no Step can fail this Rule
+        self.step_kinds = frozenset()
         self.settings = settings
 
     def fn(self, obj: Union[Workflow, Job, Step]) -> Tuple[bool, str]:
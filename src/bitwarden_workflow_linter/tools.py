@@ -0,0 +1,163 @@
+"""Module to resolve the external tools that Rules run (actionlint, zizmor)."""
+
+import json
+import os
+import shutil
+import time
+
+from typing import Any, Callable, Optional, Tuple
+
+from .utils import cache_dir, file_stamp, write_json_atomic
+
+# How long a failed resolution (ie. pip or the network failing during an
+# install) is reused before the tool is checked again, in seconds
+FAILED_RESOLUTION_TTL = 60.0
+
+# Results of every tool resolved by this process, keyed by (name, version),
+# with the stamp of the binary of a success or the expiry of a failure
+_resolved: dict[Tuple[str, str], Tuple[Tuple[bool, str], Any]] = {}
+
+
+def stamps_path() -> str:
+    """Get the path of the file that records the verified tool binaries."""
+    return os.path.join(cache_dir(), "tools.json")
+
+
+def load_stamps() -> dict[str, dict]:
+    """Load the recorded tool stamps, ignoring a missing or corrupt file."""
+    try:
+        with open(stamps_path(), encoding="utf8") as file:
+            stamps = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return stamps if isinstance(stamps, dict) else {}
+
+
+def binary_path(name: str, location: str) -> Optional[str]:
+    """Get the binary a (installed, location) result refers to.
+
+    An empty location means that the tool is run from the PATH.
+    """
+    path = location or shutil.which(name)
+    return os.path.realpath(path) if path else None
+
+
+def stamped_location(name: str, version: str) -> Optional[str]:
+    """Get the location of a tool if its stamp is still valid.
+
+    A stamp is valid when it was recorded for the same version and the binary
+    still has the same modification time and size.
+
+    Returns:
+      The location to run the tool from, or None if the tool must be checked.
+    """
+    stamp = load_stamps().get(name)
+    if not stamp or stamp.get("version") != version:
+        return None
+
+    path = binary_path(name, stamp.get("location", ""))
+    if path is None or path != stamp.get("path"):
+        return None
+
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    if stat.st_mtime_ns != stamp.get("mtime_ns") or stat.st_size != stamp.get("size"):
+        return None
+
+    return stamp.get("location", "")
+
+
+def record_stamp(name: str, version: str, location: str) -> None:
+    """Record a verified tool binary so later runs can skip the version check."""
+    path = binary_path(name, location)
+    if path is None:
+        return
+    try:
+        stat = os.stat(path)
+        stamps = load_stamps()
+        stamps[name] = {
+            "version": version,
+            "location": location,
+            "path": path,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+        }
+        write_json_atomic(stamps_path(), stamps)
+    except OSError:
+        pass
+
+
+def resolve_tool(
+    name: str, version: str, check: Callable[[], Tuple[bool, str]]
+) -> Tuple[bool, str]:
+    """Resolve an external tool once per process.
+
+    The first call checks (and installs if needed) the tool with check. A
+    success is reused by every later call in the process, while a failure is
+    only reused for FAILED_RESOLUTION_TTL seconds so that a long-lived process
+    (ie. the daemon or --watch) recovers from a transient install failure.
+    Successful checks are also stamped under the cache directory so later runs
+    skip the check while the binary is unchanged.
+
+    Args:
+      name:
+        The name of the tool binary
+      version:
+        The version of the tool that is required
+      check:
+        Function that verifies or installs the tool and returns whether it is
+        installed and the location to run it from ("" for the PATH)
+
+    Returns:
+      Whether the tool is installed and the location to run it from.
+    """
+    key = (name, version)
+    if key in _resolved:
+        result, validity = _resolved[key]
+        if result[0] or time.monotonic() < validity:
+            return result
+
+    location = stamped_location(name, version)
+    if location is not None:
+        result = (True, location)
+    else:
+        result = check()
+        if result[0]:
+            record_stamp(name, version, result[1])
+
+    if result[0]:
+        _resolved[key] = (result, file_stamp(binary_path(name, result[1]) or ""))
+    else:
+        _resolved[key] = (result, time.monotonic() + FAILED_RESOLUTION_TTL)
+    return result
+
+
+def forget_stale_tools() -> bool:
+    """Forget the resolved tools that would now be resolved differently.
+
+    These are the tools whose binary changed or disappeared since they were
+    resolved, and the failed resolutions that expired.
+
+    Returns:
+      Whether any tool was forgotten.
+    """
+    now = time.monotonic()
+    stale = [
+        key
+        for key, (result, validity) in _resolved.items()
+        if (
+            file_stamp(binary_path(key[0], result[1]) or "") != validity
+            if result[0]
+            else now >= validity
+        )
+    ]
+    for key in stale:
+        del _resolved[key]
+    return bool(stale)
+
+
+def clear_resolved_tools() -> None:
+    """Forget the tools resolved by this process."""
+    _resolved.clear()
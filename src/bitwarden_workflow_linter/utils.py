@@ -1,16 +1,24 @@
 """Module of a collection of random utilities."""
 
+import contextlib
+import hashlib
+import importlib
 import importlib.resources
 import json
 import os
+import pickle
+import sys
+import tempfile
 
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from enum import Enum
-from typing import Optional, Self, TypeVar
+from typing import Any, Iterator, Optional, Self, TypeVar
 
-from ruamel.yaml import YAML
+from .__about__ import __version__
 
-yaml = YAML()
+# Conservative limit on the total length of the file arguments passed to a single
+# external tool process (Windows caps the whole command line at 32767 characters).
+MAX_ARGUMENTS_LENGTH = 30000
 
 
 @dataclass
@@ -46,6 +54,8 @@ class LintLevels(LintLevel, Enum):
 class LintFinding:
     """Represents a problem detected by linting."""
 
+    __slots__ = ("description", "level")
+
     def __init__(self, description: str, level: LintLevels) -> None:
         self.description = description
         self.level = level
@@ -62,6 +72,143 @@ class LintFinding:
         )
 
 
+def cache_dir() -> str:
+    """Get the directory that bwwl caches data in between runs.
+
+    Defaults to ~/.cache/bwwl and can be overridden with the BWWL_CACHE_DIR
+    environment variable.
+    """
+    return os.environ.get("BWWL_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "bwwl"
+    )
+
+
+def write_bytes_atomic(path: str, data: bytes) -> None:
+    """Write a file so that concurrent readers never see a partial file.
+
+    Args:
+      path:
+        The file to write
+      data:
+        The content of the file
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_json_atomic(path: str, data: object) -> None:
+    """Write data as JSON so that concurrent readers never see a partial file.
+
+    Args:
+      path:
+        The file to write
+      data:
+        Any JSON serializable object
+    """
+    write_bytes_atomic(path, json.dumps(data).encode())
+
+
+@contextlib.contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """Hold an exclusive lock on a file across processes.
+
+    Args:
+      path:
+        The lock file to create (if missing) and lock
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a+b") as file:
+        if os.name == "nt":
+            import msvcrt  # pylint: disable=import-outside-toplevel
+
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl  # pylint: disable=import-outside-toplevel
+
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+def file_stamp(path: str) -> Optional[list[int]]:
+    """Get the modification time and size of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def file_hash(path: str) -> Optional[str]:
+    """Get the SHA-256 of the content of a file, or None if it does not exist."""
+    try:
+        with open(path, "rb") as file:
+            return hashlib.sha256(file.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def plain(data: Any) -> Any:
+    """Convert loaded YAML into builtin dicts, lists and strings.
+
+    The round-trip loader of ruamel returns its own subclasses, which would
+    need ruamel to be imported again to unpickle them.
+    """
+    if isinstance(data, dict):
+        return {plain(key): plain(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [plain(value) for value in data]
+    if isinstance(data, str):
+        return str(data)
+    return data
+
+
+def chunk_arguments(
+    arguments: list[str], max_length: int = MAX_ARGUMENTS_LENGTH
+) -> list[list[str]]:
+    """Split a list of command line arguments into argv-sized chunks.
+
+    Args:
+      arguments:
+        The arguments (generally file names) to split
+      max_length:
+        The maximum combined length of the arguments in a single chunk
+
+    Returns:
+      The chunks in the original order. An argument longer than max_length gets
+      a chunk of its own.
+    """
+    chunks = []
+    chunk = []
+    length = 0
+    for argument in arguments:
+        if chunk and length + len(argument) + 1 > max_length:
+            chunks.append(chunk)
+            chunk = []
+            length = 0
+        chunk.append(argument)
+        length += len(argument) + 1
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
 @dataclass
 class Action:
     """Collection of the metadata associated with a GitHub Action."""
@@ -107,6 +254,20 @@ class SettingsError(Exception):
 
 SettingsFromFactory = TypeVar("SettingsFromFactory", bound="Settings")
 
+
+def settings_snapshot_path() -> str:
+    """Get the path of the settings snapshot of the working directory.
+
+    The local settings.yaml is relative to the working directory, so each
+    directory gets its own snapshot. Pickles are not portable between Python
+    or bwwl versions, so they are part of the name as well.
+    """
+    key = hashlib.sha256(
+        f"{__version__}\0{sys.version}\0{os.getcwd()}".encode()
+    ).hexdigest()[:16]
+    return os.path.join(cache_dir(), "settings", f"{key}.pickle")
+
+
 class Settings:
     """Class that contains configuration-as-code for any portion of the app."""
 
@@ -117,6 +278,8 @@ class Settings:
     zizmor_config_url: Optional[str]
     default_branch: Optional[str]
     blocked_domains: Optional[list[str]]
+    sources: list[str]
+    rule_classes: dict[str, type]
 
     def __init__(
         self,
@@ -127,6 +290,8 @@ class Settings:
         zizmor_config_url: Optional[str] = None,
         default_branch: Optional[str] = None,
         blocked_domains: Optional[list[str]] = None,
+        sources: Optional[list[str]] = None,
+        rule_classes: Optional[dict[str, type]] = None,
     ) -> None:
         """Settings object that can be overridden in settings.py.
 
@@ -137,6 +302,12 @@ class Settings:
           approved_actions:
             The colleciton of GitHub Actions that are pre-approved to be used
             in any workflow (Required by src.rules.step_approved)
+          sources:
+            The absolute paths of the files the settings were loaded from,
+            including optional files that did not exist
+          rule_classes:
+            The already imported Rule class of each enabled rule id, which
+            Rules uses instead of importing them again
         """
         if enabled_rules is None:
             enabled_rules = []
@@ -166,9 +337,143 @@ class Settings:
                 self.approved_actions[name] = Action(**action)
         self.default_branch = default_branch
         self.blocked_domains = blocked_domains or []
+        self.sources = sources or []
+        self.rule_classes = rule_classes or {}
+
+    def fingerprint(self) -> str:
+        """Get a hash of every setting that can change the result of linting.
+
+        Returns:
+          The hex SHA-256 of the enabled rules and their levels, the approved
+          actions, the blocked domains and the external tool configuration.
+        """
+        effective = {
+            "enabled_rules": self.enabled_rules,
+            "approved_actions": {
+                name: asdict(action) for name, action in self.approved_actions.items()
+            },
+            "actionlint_version": self.actionlint_version,
+            "zizmor_version": self.zizmor_version,
+            "zizmor_config_url": self.zizmor_config_url,
+            "default_branch": self.default_branch,
+            "blocked_domains": self.blocked_domains,
+        }
+        return hashlib.sha256(
+            json.dumps(effective, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    def source_stamps(self) -> dict[str, Optional[list[int]]]:
+        """Get the current stamp of each file the settings were loaded from.
+
+        Comparing these stamps with ones taken earlier tells whether the
+        Settings need to be loaded again.
+        """
+        return {path: file_stamp(path) for path in self.sources}
+
+    def resolve_rule_classes(self) -> None:
+        """Import the Rule class of every enabled rule that can be imported.
+
+        The rules that cannot be imported are left for Rules to report.
+        """
+        for rule in self.enabled_rules:
+            module_name, _, rule_name = rule["id"].rpartition(".")
+            try:
+                self.rule_classes[rule["id"]] = getattr(
+                    importlib.import_module(module_name), rule_name
+                )
+            except (ImportError, AttributeError, ValueError):
+                continue
+
+    def save_snapshot(self, path: str) -> None:
+        """Save the Settings, with the stamp and hash of each source file.
+
+        Args:
+          path:
+            The file to pickle the snapshot to
+        """
+        snapshot = {
+            "sources": {
+                source: (file_stamp(source), file_hash(source)) for source in self.sources
+            },
+            "settings": self,
+        }
+        try:
+            write_bytes_atomic(path, pickle.dumps(snapshot, pickle.HIGHEST_PROTOCOL))
+        except (OSError, pickle.PicklingError, AttributeError, TypeError):
+            pass
 
     @staticmethod
-    def factory() -> SettingsFromFactory:
+    def load_snapshot(path: str) -> Optional[SettingsFromFactory]:
+        """Load the Settings saved by save_snapshot() if none of its sources changed.
+
+        A source is unchanged if its modification time and size are the
+        same, or failing that if its content still has the same hash (ie. the
+        file was only touched or checked out again).
+
+        Args:
+          path:
+            The file the snapshot was pickled to
+
+        Returns:
+          The Settings, or None if there is no snapshot or it is out of date.
+        """
+        try:
+            with open(path, "rb") as file:
+                snapshot = pickle.load(file)
+            sources = snapshot["sources"]
+            settings = snapshot["settings"]
+        except Exception:  # pylint: disable=broad-except
+            # Missing, corrupt or written by an incompatible version of a rule
+            return None
+
+        for source, (stamp, digest) in sources.items():
+            if file_stamp(source) != stamp and file_hash(source) != digest:
+                return None
+        return settings
+
+    @staticmethod
+    def factory(use_snapshot: bool = True) -> SettingsFromFactory:
+        """Load the default settings, the local settings.yaml and the approved actions.
+
+        Parsing them on every run is slow, so the loaded Settings (with the
+        Rule classes they enable) are saved to a snapshot in the cache
+        directory, which is used for as long as none of the files change.
+
+        Args:
+          use_snapshot:
+            Load from and save to the settings snapshot
+
+        Returns:
+          The Settings.
+        """
+        if not use_snapshot:
+            return Settings.parse()
+
+        path = settings_snapshot_path()
+        settings = Settings.load_snapshot(path)
+        if settings is None:
+            settings = Settings.parse()
+            settings.resolve_rule_classes()
+            settings.save_snapshot(path)
+        return settings
+
+    @staticmethod
+    def parse() -> SettingsFromFactory:
+        """Load the Settings from their files, without the snapshot."""
+        # ruamel is only imported once settings are needed to keep startup fast
+        from ruamel.yaml import YAML  # pylint: disable=import-outside-toplevel
+
+        yaml = YAML()
+        package_files = importlib.resources.files("bitwarden_workflow_linter")
+        sources = [
+            str(package_files.joinpath(name))
+            for name in (
+                "default_settings.yaml",
+                "actionlint_version.yaml",
+                "zizmor_version.yaml",
+            )
+        ]
+
         # load default settings
         with (
             importlib.resources.files("bitwarden_workflow_linter")
@@ -198,6 +503,7 @@ class Settings:
         # load override settings
         settings_filename = "settings.yaml"
         local_settings = None
+        sources.append(os.path.abspath(settings_filename))
 
         if os.path.exists(settings_filename):
             with open(settings_filename, encoding="utf8") as settings_file:
@@ -208,6 +514,7 @@ class Settings:
 
         # load approved actions
         if settings["approved_actions_path"] == "default_actions.json":
+            sources.append(str(package_files.joinpath("default_actions.json")))
             with (
                 importlib.resources.files("bitwarden_workflow_linter")
                 .joinpath("default_actions.json")
@@ -215,6 +522,7 @@ class Settings:
             ):
                 settings["approved_actions"] = json.load(file)
         else:
+            sources.append(os.path.abspath(settings["approved_actions_path"]))
             with open(
                 settings["approved_actions_path"], "r", encoding="utf8"
             ) as action_file:
@@ -225,11 +533,12 @@ class Settings:
             raise Exception("The default_branch is not set in the default_settings.yaml file")
 
         return Settings(
-            enabled_rules=settings["enabled_rules"],
+            enabled_rules=plain(settings["enabled_rules"]),
             approved_actions=settings["approved_actions"],
-            actionlint_version=actionlint_version,
-            zizmor_version=zizmor_version,
-            zizmor_config_url=settings.get("zizmor_config_url"),
-            default_branch=default_branch,
-            blocked_domains=settings.get("blocked_domains", []),
+            actionlint_version=plain(actionlint_version),
+            zizmor_version=plain(zizmor_version),
+            zizmor_config_url=plain(settings.get("zizmor_config_url")),
+            default_branch=plain(default_branch),
+            blocked_domains=plain(settings.get("blocked_domains", [])),
+            sources=sources,
         )
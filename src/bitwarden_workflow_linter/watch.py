@@ -0,0 +1,215 @@
+"""Module providing file watchers to re-lint workflows as they are modified."""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+from typing import Callable, Optional, Union
+
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+WORKFLOW_EXTENSIONS = (".yml", ".yaml")
+
+
+class PollingWatcher:
+    """Watch for modified workflow files by comparing their mtime and size."""
+
+    def __init__(self, list_files: Callable[[], list[str]], interval: float = 0.5) -> None:
+        """Initialize the PollingWatcher.
+
+        Args:
+          list_files:
+            Function that returns all of the files to watch
+          interval:
+            The number of seconds between two scans of the files
+        """
+        self.list_files = list_files
+        self.interval = interval
+        self.snapshot = self.scan()
+
+    def scan(self) -> dict[str, tuple[int, int]]:
+        """Get the modification time and size of every watched file."""
+        snapshot = {}
+        for filename in self.list_files():
+            try:
+                stat = os.stat(filename)
+            except OSError:
+                continue
+            snapshot[filename] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def changes(self, timeout: float) -> set[str]:
+        """Wait up to timeout seconds for files to be created or modified.
+
+        Returns:
+          The files that changed, or an empty set if nothing changed in time.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            snapshot = self.scan()
+            changed = {
+                filename
+                for filename, stamp in snapshot.items()
+                if self.snapshot.get(filename) != stamp
+            }
+            self.snapshot = snapshot
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.interval, remaining))
+
+    def close(self) -> None:
+        """Release the resources of the watcher."""
+        return None
+
+
+class InotifyWatcher:
+    """Watch for modified workflow files with Linux inotify."""
+
+    def __init__(self, paths: list[str]) -> None:
+        """Initialize the InotifyWatcher.
+
+        Args:
+          paths:
+            The workflow files and directories of workflow files to watch
+        """
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self.files = set()
+        self.directories: dict[int, str] = {}
+        self.watched_directories = set()
+        for path in paths:
+            if os.path.isdir(path):
+                self.add_watch(path)
+                self.watched_directories.add(path)
+            else:
+                self.add_watch(os.path.dirname(path) or ".")
+                self.files.add(os.path.realpath(path))
+
+    def add_watch(self, directory: str) -> None:
+        """Watch a directory for files being written or moved into it."""
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self.directories.setdefault(wd, directory)
+
+    def is_target(self, directory: str, name: str) -> bool:
+        """Check if a file in a watched directory is one of the watched workflows."""
+        if directory in self.watched_directories and name.endswith(WORKFLOW_EXTENSIONS):
+            return True
+        return os.path.realpath(os.path.join(directory, name)) in self.files
+
+    def read_events(self) -> set[str]:
+        """Read all pending inotify events and return the watched files they hit."""
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _INOTIFY_EVENT.unpack_from(data, offset)
+                offset += _INOTIFY_EVENT.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                if mask & IN_Q_OVERFLOW or wd not in self.directories:
+                    continue
+                directory = self.directories[wd]
+                if name and self.is_target(directory, name):
+                    changed.add(directory + os.sep + name)
+
+    def changes(self, timeout: float) -> set[str]:
+        """Wait up to timeout seconds for files to be created or modified.
+
+        Returns:
+          The files that changed, or an empty set if nothing changed in time.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return set()
+            readable, _, _ = select.select([self.fd], [], [], remaining)
+            if readable:
+                changed = self.read_events()
+                if changed:
+                    return changed
+
+    def close(self) -> None:
+        """Release the inotify file descriptor."""
+        os.close(self.fd)
+
+
+Watcher = Union[InotifyWatcher, PollingWatcher]
+
+
+def create_watcher(
+    paths: list[str], list_files: Callable[[], list[str]], interval: float = 0.5
+) -> Watcher:
+    """Create an inotify watcher where available and a polling watcher otherwise.
+
+    Args:
+      paths:
+        The workflow files and directories of workflow files to watch
+      list_files:
+        Function that returns all of the files to watch (used for polling)
+      interval:
+        The number of seconds between two scans when polling
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(paths)
+        except (AttributeError, OSError, TypeError):
+            pass
+    return PollingWatcher(list_files, interval)
+
+
+def wait_for_changes(
+    watcher: Watcher, debounce: float = 0.3, timeout: Optional[float] = None
+) -> set[str]:
+    """Wait for workflow files to change, debouncing bursts of saves.
+
+    Once a change is seen, this keeps collecting changes until no file has
+    changed for debounce seconds.
+
+    Args:
+      watcher:
+        The watcher to wait on
+      debounce:
+        The number of quiet seconds that end a burst of changes
+      timeout:
+        The maximum number of seconds to wait for the first change (forever if None)
+
+    Returns:
+      All of the files that changed, or an empty set if the timeout expired.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    changed = set()
+    while not changed:
+        if deadline is not None and time.monotonic() >= deadline:
+            return changed
+        wait = 1.0 if deadline is None else max(0.0, min(1.0, deadline - time.monotonic()))
+        changed |= watcher.changes(wait)
+
+    while True:
+        more = watcher.changes(debounce)
+        if not more:
+            return changed
+        changed |= more
@@ -1,3 +1,110 @@
 """Shared configuration for tests."""
 
+import subprocess
+
+import pytest
+
+from src.bitwarden_workflow_linter.tools import clear_resolved_tools
+
+from .mock_github import MockGitHub
+
 FIXTURE_DIR = "./tests/fixtures"
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep every test's caches out of the real ~/.cache/bwwl."""
+    monkeypatch.setenv("BWWL_CACHE_DIR", str(tmp_path / "bwwl-cache"))
+    clear_resolved_tools()
+    yield
+    clear_resolved_tools()
+
+
+@pytest.fixture(name="mock_github")
+def fixture_mock_github():
+    """Start local mock GitHub APIs, which are stopped after the test.
+
+    Returns:
+      A function that takes a list of MockRepo (and optionally the latency,
+      rate_limit and window of MockGitHub) and returns the started MockGitHub.
+    """
+    servers = []
+
+    def start(repos, latency=0.0, **options):
+        server = MockGitHub(repos, latency, **options).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+# The ways a mirror made by the git_mirror fixture stores its refs and objects
+MIRROR_STORAGES = ("loose", "packed-refs", "packed", "ref-delta")
+
+
+def run_git(cwd, *args):
+    """Run git in a directory, with a fixed identity."""
+    return subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+@pytest.fixture(name="git_mirror")
+def fixture_git_mirror(tmp_path):
+    """Create bare git mirrors of repositories with tags.
+
+    Returns:
+      A function that takes the path of the mirror, the tags to create (pairs
+      of a tag name and "lightweight", "annotated", or "nested" for a tag of an
+      annotated tag), each on a new commit, and one of MIRROR_STORAGES.
+    """
+
+    def make(path, tags, storage="loose"):
+        source = tmp_path / "sources" / path.name
+        source.mkdir(parents=True)
+        run_git(source, "init", "-q", "-b", "main")
+        lines = [f"line {index}\n" for index in range(200)]
+        for index, (tag, kind) in enumerate(tags):
+            # Similar contents and messages, so that packs store them as deltas
+            lines[index % 200] = f"changed for {tag}\n"
+            (source / "action.yml").write_text("".join(lines))
+            run_git(source, "add", ".")
+            run_git(source, "commit", "-q", "-m", f"release {tag}")
+            message = f"Release {tag}\n\n" + "The changes of this release.\n" * 20
+            if kind == "lightweight":
+                run_git(source, "tag", tag)
+            elif kind == "annotated":
+                run_git(source, "tag", "-a", tag, "-m", message)
+            else:
+                run_git(source, "tag", "-a", f"{tag}-inner", "-m", message)
+                run_git(source, "tag", "-a", tag, f"{tag}-inner", "-m", message)
+
+        path.mkdir(parents=True)
+        run_git(path, "init", "-q", "--bare")
+        # Unpack every fetched object, so that the mirror starts loose
+        run_git(
+            path,
+            "-c",
+            "fetch.unpackLimit=1000000",
+            "fetch",
+            "-q",
+            str(source),
+            "refs/heads/*:refs/heads/*",
+            "refs/tags/*:refs/tags/*",
+        )
+        if storage == "packed-refs":
+            run_git(path, "pack-refs", "--all")
+        elif storage == "packed":
+            run_git(path, "gc", "-q", "--aggressive")
+        elif storage == "ref-delta":
+            run_git(path, "-c", "repack.useDeltaBaseOffset=false", "repack", "-q", "-a", "-d")
+            run_git(path, "prune-packed")
+        return path
+
+    return make
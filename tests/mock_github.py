@@ -0,0 +1,295 @@
+"""A local mock of the GitHub REST API endpoints that ActionsCmd calls.
+
+MockGitHub serves the repositories, latest releases, tag refs, annotated tags
+and tags of a set of fake repositories over HTTP/1.1 with keep-alive, and
+records the requests and connections it gets, so that tests and benchmarks
+can run `actions update` without the network. Like GitHub, it sends an ETag
+with each response and answers 304 Not Modified to an If-None-Match request
+with the current ETag. POST /graphql answers the `repository { latestRelease }`
+queries of ActionsCmd.get_latest_versions_graphql(). Like GitHub, it can
+enforce a rate limit, reported with the X-RateLimit-* headers, and fail()
+injects errors for the next requests of a path.
+"""
+
+import hashlib
+import http.server
+import json
+import re
+import threading
+import time
+
+from dataclasses import dataclass
+from typing import Optional
+
+# The aliased repository fields of the GraphQL queries of ActionsCmd
+GRAPHQL_REPOSITORY = re.compile(
+    r"(?P<alias>\w+): repository\(owner: \$(?P<owner>\w+), name: \$(?P<name>\w+)\)"
+)
+
+
+@dataclass
+class MockRepo:
+    """A repository served by MockGitHub."""
+
+    name: str
+    tag: str = "v1.0.0"
+    # Whether the tag is annotated (its ref points to a tag object)
+    annotated: bool = False
+    # Whether the repository has releases, or only tags
+    releases: bool = True
+
+    @property
+    def sha(self) -> str:
+        """The commit the tag points to."""
+        return hashlib.sha1(f"{self.name}@{self.tag}".encode()).hexdigest()
+
+    @property
+    def tag_sha(self) -> str:
+        """The annotated tag object of the tag."""
+        return hashlib.sha1(f"{self.name}@{self.tag}:tag".encode()).hexdigest()
+
+
+class MockGitHub(http.server.ThreadingHTTPServer):
+    """A threaded HTTP server that mocks the GitHub API.
+
+    Args:
+      repos:
+        The repositories to serve (every other repository is not found)
+      latency:
+        Seconds to wait before each response, to simulate the round trip to
+        the real API
+      rate_limit:
+        The number of requests allowed in each window (unlimited by default).
+        The requests above it are answered 403 until the window resets.
+      window:
+        Seconds until the rate limit resets
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        repos: list[MockRepo],
+        latency: float = 0.0,
+        rate_limit: Optional[int] = None,
+        window: float = 60.0,
+    ) -> None:
+        super().__init__(("127.0.0.1", 0), MockGitHubHandler)
+        self.repos = {repo.name: repo for repo in repos}
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.window = window
+        self.reset = time.time() + window
+        self.remaining = rate_limit
+        self.failures: dict[str, list] = {}
+        self.requests: list[str] = []
+        self.connections = 0
+        self.not_modified = 0
+        self.rate_limited = 0
+        self.lock = threading.Lock()
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """The base URL of the mocked API."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockGitHub":
+        """Serve the API in a background thread."""
+        self.thread = threading.Thread(
+            target=self.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the server."""
+        self.shutdown()
+        self.server_close()
+        if self.thread is not None:
+            self.thread.join()
+
+    def fail(
+        self, path: str, status: int, count: int = 1, retry_after: Optional[float] = None
+    ) -> None:
+        """Answer the next `count` requests of a path with an error status."""
+        self.failures[path] = [status, count, retry_after]
+
+    def limit(self, path: str) -> tuple[Optional[int], dict[str, str]]:
+        """Count a request against the rate limit and the injected failures.
+
+        Returns:
+          The error status to answer the request with (None to answer it), and
+          the rate limit headers of the response.
+        """
+        with self.lock:
+            failure = self.failures.get(path)
+            if failure is not None and failure[1] > 0:
+                failure[1] -= 1
+                status, _, retry_after = failure
+                headers = {} if retry_after is None else {"Retry-After": str(retry_after)}
+                return status, headers
+            if self.rate_limit is None:
+                return None, {}
+
+            if time.time() >= self.reset:
+                self.reset = time.time() + self.window
+                self.remaining = self.rate_limit
+            status = None
+            if self.remaining > 0:
+                self.remaining -= 1
+            else:
+                self.rate_limited += 1
+                status = 403
+            return status, {
+                "X-RateLimit-Limit": str(self.rate_limit),
+                "X-RateLimit-Remaining": str(self.remaining),
+                "X-RateLimit-Reset": f"{self.reset:.3f}",
+            }
+
+    def route(self, path: str) -> tuple[int, object]:
+        """Get the status and JSON body of the response to a GET request."""
+        parts = path.strip("/").split("/")
+        if len(parts) < 3 or parts[0] != "repos":
+            return 404, {"message": "Not Found"}
+        repo = self.repos.get(f"{parts[1]}/{parts[2]}")
+        if repo is None:
+            return 404, {"message": "Not Found"}
+
+        base = f"{self.url}/repos/{repo.name}"
+        endpoint = parts[3:]
+        if not endpoint:
+            return 200, {"full_name": repo.name}
+        if endpoint == ["releases", "latest"]:
+            if not repo.releases:
+                return 404, {"message": "Not Found"}
+            return 200, {"tag_name": repo.tag}
+        if endpoint == ["git", "ref", "tags", repo.tag]:
+            if repo.annotated:
+                return 200, {
+                    "object": {
+                        "type": "tag",
+                        "sha": repo.tag_sha,
+                        "url": f"{base}/git/tags/{repo.tag_sha}",
+                    }
+                }
+            return 200, {"object": {"type": "commit", "sha": repo.sha}}
+        if endpoint == ["git", "tags", repo.tag_sha]:
+            return 200, {"object": {"type": "commit", "sha": repo.sha}}
+        if endpoint == ["tags"]:
+            return 200, [{"name": repo.tag, "commit": {"sha": repo.sha}}]
+        return 404, {"message": "Not Found"}
+
+    def graphql(self, request: dict) -> dict:
+        """Get the JSON body of the response to a GraphQL query."""
+        variables = request.get("variables", {})
+        data, errors = {}, []
+        for field in GRAPHQL_REPOSITORY.finditer(request["query"]):
+            name = f"{variables[field['owner']]}/{variables[field['name']]}"
+            repo = self.repos.get(name)
+            if repo is None:
+                data[field["alias"]] = None
+                errors.append(
+                    {
+                        "type": "NOT_FOUND",
+                        "path": [field["alias"]],
+                        "message": f"Could not resolve to a Repository with the name '{name}'.",
+                    }
+                )
+            elif not repo.releases:
+                data[field["alias"]] = {"latestRelease": None}
+            else:
+                data[field["alias"]] = {
+                    "latestRelease": {"tagName": repo.tag, "tagCommit": {"oid": repo.sha}}
+                }
+        body = {"data": data}
+        if errors:
+            body["errors"] = errors
+        return body
+
+
+class MockGitHubHandler(http.server.BaseHTTPRequestHandler):
+    """Handles the requests of MockGitHub, keeping connections alive."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are sent separately, which Nagle's algorithm would delay
+    disable_nagle_algorithm = True
+    server: MockGitHub
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Respond to a GET request with the JSON of its route."""
+        with self.server.lock:
+            self.server.requests.append(self.path)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        status, body = self.server.route(self.path)
+        data = json.dumps(body).encode()
+        etag = f'"{hashlib.sha1(data).hexdigest()}"'
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            # Like GitHub, 304 Not Modified does not count against the rate limit
+            with self.server.lock:
+                self.server.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        error, headers = self.server.limit(self.path)
+        if error is not None:
+            self.send_error_json(error, headers)
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if status == 200:
+            self.send_header("ETag", etag)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        """Respond to a GraphQL query."""
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.server.lock:
+            self.server.requests.append(self.path)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        error, headers = self.server.limit(self.path)
+        if error is not None:
+            self.send_error_json(error, headers)
+            return
+        status, body = 404, {"message": "Not Found"}
+        if self.path == "/graphql":
+            status, body = 200, self.server.graphql(request)
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_error_json(self, status: int, headers: dict[str, str]) -> None:
+        """Respond with an error status and a JSON message, like GitHub."""
+        message = "API rate limit exceeded" if status in (403, 429) else "Server Error"
+        data = json.dumps({"message": message}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args) -> None:  # pylint: disable=redefined-builtin
+        """Do not log the requests to stderr."""
@@ -314,3 +314,36 @@ class TestRuleCheckBlockedDomains:
         
         assert error_rule.on_fail == LintLevels.ERROR
         assert warning_rule.on_fail == LintLevels.WARNING
+
+    def test_is_blocked_matches_domain_and_subdomains(self):
+        """Test that blocked domains match themselves and their subdomains only."""
+        rule = RuleCheckBlockedDomains(
+            settings=Settings(blocked_domains=[' Evil.COM ', 'cdn.example.org', ''])
+        )
+
+        assert rule.blocked_suffixes == frozenset({'evil.com', 'cdn.example.org'})
+        assert rule.is_blocked('evil.com')
+        assert rule.is_blocked('a.b.EVIL.com')
+        assert rule.is_blocked('cdn.example.org')
+        assert rule.is_blocked('x.cdn.example.org')
+        assert not rule.is_blocked('notevil.com')
+        assert not rule.is_blocked('evil.com.example.net')
+        assert not rule.is_blocked('example.org')
+        assert not rule.is_blocked('com')
+
+    def test_check_blocked_domains_large_blocklist(self):
+        """Test lookups against a blocklist much larger than the text."""
+        blocked = [f'threat-{index}.example' for index in range(50000)]
+        rule = RuleCheckBlockedDomains(settings=Settings(blocked_domains=blocked))
+
+        is_clean, domains = rule.check_blocked_domains(
+            'curl https://dl.threat-49999.example/x.sh https://threat-50000.example'
+        )
+        assert not is_clean
+        assert domains == ['dl.threat-49999.example']
+
+    def test_check_blocked_domains_without_blocklist(self):
+        """Test that nothing is blocked when no blocked domains are configured."""
+        rule = RuleCheckBlockedDomains(settings=Settings())
+
+        assert rule.check_blocked_domains('https://malicious-example.com') == (True, [])
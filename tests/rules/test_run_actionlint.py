@@ -5,8 +5,13 @@ import subprocess
 import os
 import io
 import tarfile
+import json
+import hashlib
+import threading
 import urllib.error
 
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 from ruamel.yaml import YAML
 
 from src.bitwarden_workflow_linter.utils import Settings
@@ -17,7 +22,9 @@ from src.bitwarden_workflow_linter.rules.run_actionlint import (
     check_actionlint_path,
     install_actionlint,
     check_actionlint_local,
-    _CACHE_DIR,
+    format_actionlint_errors,
+    actionlint_binary_path,
+    actionlint_platform,
 )
 
 
@@ -176,7 +183,7 @@ def test_check_actionlint_installed_locally_linux(monkeypatch):
     result, message = check_actionlint_local("Linux", settings.actionlint_version)
 
     assert result is True
-    assert message == os.path.join(_CACHE_DIR, "actionlint")
+    assert message == actionlint_binary_path(settings.actionlint_version)
 
 def test_check_actionlint_installed_locally_darwin(monkeypatch):
     def mock_run(*args, **kwargs):
@@ -187,7 +194,7 @@ def test_check_actionlint_installed_locally_darwin(monkeypatch):
     result, message = check_actionlint_local("Darwin", settings.actionlint_version)
 
     assert result is True
-    assert message == os.path.join(_CACHE_DIR, "actionlint")
+    assert message == actionlint_binary_path(settings.actionlint_version)
 
 def test_check_actionlint_installed_locally_windows(monkeypatch):
     def mock_run(*args, **kwargs):
@@ -339,3 +346,235 @@ def test_run_actionlint_installed_error(monkeypatch, rule):
     result, error = rule.fn(workflow)
     assert result is False
     assert "An error occurred" in error
+
+
+ACTIONLINT_JSON_ERROR = {
+    "message": 'property "foo" is not defined',
+    "filepath": "tests/fixtures/test_workflow_incorrect.yaml",
+    "line": 12,
+    "column": 9,
+    "kind": "expression",
+    "snippet": "   |\n12 | echo ${{ foo }}\n   |         ^~~",
+    "end_column": 11,
+}
+
+
+def test_format_actionlint_errors():
+    output = format_actionlint_errors([ACTIONLINT_JSON_ERROR])
+    assert output.startswith(
+        "tests/fixtures/test_workflow_incorrect.yaml:12:9: "
+        'property "foo" is not defined [expression]\n'
+    )
+    assert "12 | echo ${{ foo }}" in output
+
+
+def test_prepare_runs_actionlint_once(monkeypatch, rule):
+    rule.settings = settings
+    calls = []
+
+    def mock_run(cmd, *args, **kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 1, stdout=json.dumps([ACTIONLINT_JSON_ERROR]))
+
+    monkeypatch.setattr(subprocess, "run", mock_run)
+    monkeypatch.setattr(
+        "src.bitwarden_workflow_linter.rules.run_actionlint.check_actionlint_path",
+        lambda *args, **kwargs: (True, ""),
+    )
+
+    correct = "tests/fixtures/test_workflow.yaml"
+    incorrect = "./tests/fixtures/test_workflow_incorrect.yaml"
+    rule.prepare([correct, incorrect])
+
+    assert len(calls) == 1
+    assert calls[0][:3] == ["actionlint", "-format", "{{json .}}"]
+    assert calls[0][3:] == [correct, incorrect]
+
+    result, _ = rule.fn(WorkflowBuilder.build(correct))
+    assert result is True
+
+    result, error = rule.fn(WorkflowBuilder.build(incorrect))
+    assert result is False
+    assert 'property "foo" is not defined [expression]' in error
+    assert len(calls) == 1
+
+
+def test_prepare_fatal_error_falls_back_per_file(monkeypatch, rule):
+    rule.settings = settings
+    calls = []
+
+    def mock_run(cmd, *args, **kwargs):
+        calls.append(cmd)
+        if "-format" in cmd:
+            return subprocess.CompletedProcess(cmd, 3, stdout="", stderr="fatal")
+        return subprocess.CompletedProcess(cmd, 0, stdout="")
+
+    monkeypatch.setattr(subprocess, "run", mock_run)
+    monkeypatch.setattr(
+        "src.bitwarden_workflow_linter.rules.run_actionlint.check_actionlint_path",
+        lambda *args, **kwargs: (True, ""),
+    )
+
+    rule.prepare(["tests/fixtures/test_workflow.yaml"])
+    assert rule.batch_results == {}
+
+    result, _ = rule.fn(WorkflowBuilder.build("tests/fixtures/test_workflow.yaml"))
+    assert result is True
+    assert calls[-1] == ["actionlint", "tests/fixtures/test_workflow.yaml"]
+
+
+def test_run_actionlint_resolves_once(monkeypatch, rule):
+    rule.settings = settings
+    checks = []
+
+    def mock_check_actionlint(*args, **kwargs):
+        checks.append(args)
+        return True, ""
+
+    monkeypatch.setattr(
+        subprocess, "run", lambda cmd, *a, **kw: subprocess.CompletedProcess(cmd, 0, stdout="")
+    )
+    monkeypatch.setattr(
+        "src.bitwarden_workflow_linter.rules.run_actionlint.check_actionlint_path",
+        mock_check_actionlint,
+    )
+
+    for filename in ("tests/fixtures/test_workflow.yaml", "tests/fixtures/test.yml"):
+        result, _ = rule.fn(WorkflowBuilder.build(filename))
+        assert result is True
+    assert len(checks) == 1
+
+
+@pytest.fixture(name="release_server")
+def fixture_release_server(monkeypatch):
+    """Local stand-in for the actionlint GitHub release downloads."""
+    requests = []
+
+    class ReleaseHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests.append(self.path)
+            version = self.path.split("/")[1][1:]
+            tarball_name = f"actionlint_{version}_{actionlint_platform()}.tar.gz"
+            tarball = _make_tar_gz()
+            if self.path.endswith("_checksums.txt"):
+                body = f"{hashlib.sha256(tarball).hexdigest()}  {tarball_name}\n".encode()
+            elif self.path.endswith(tarball_name):
+                body = tarball
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ReleaseHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(
+        "src.bitwarden_workflow_linter.rules.run_actionlint._RELEASES_URL",
+        f"http://127.0.0.1:{server.server_address[1]}",
+    )
+    yield requests
+    server.shutdown()
+    server.server_close()
+
+
+def test_install_actionlint_source_versioned_cache(release_server):
+    result, path = install_actionlint_source("An error occurred", "1.7.1")
+    assert result is True
+    assert path == actionlint_binary_path("1.7.1")
+    assert path.endswith(os.path.join("1.7.1", actionlint_platform(), "actionlint"))
+    with open(path, "rb") as binary:
+        assert binary.read() == b"fake-binary"
+    assert len(release_server) == 2
+
+    # Installed versions are never downloaded again
+    result, _ = install_actionlint_source("An error occurred", "1.7.1")
+    assert result is True
+    assert len(release_server) == 2
+
+    # Other versions live side by side
+    result, other_path = install_actionlint_source("An error occurred", "1.7.2")
+    assert result is True
+    assert other_path != path
+    assert os.path.isfile(path) and os.path.isfile(other_path)
+    assert len(release_server) == 4
+
+
+def test_install_actionlint_source_caches_checksums(release_server):
+    install_actionlint_source("An error occurred", "1.7.1")
+    os.remove(actionlint_binary_path("1.7.1"))
+
+    result, _ = install_actionlint_source("An error occurred", "1.7.1")
+    assert result is True
+    assert sum(path.endswith("_checksums.txt") for path in release_server) == 1
+
+
+def test_install_actionlint_source_concurrent(release_server):
+    results = []
+
+    def install():
+        results.append(install_actionlint_source("An error occurred", "1.7.1"))
+
+    threads = [threading.Thread(target=install) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(result is True for result, _ in results)
+    assert sum(path.endswith(".tar.gz") for path in release_server) == 1
+
+
+def test_install_actionlint_source_replaces_legacy_binary(release_server):
+    legacy_path = os.path.join(os.environ["BWWL_CACHE_DIR"], "actionlint")
+    os.makedirs(os.path.dirname(legacy_path), exist_ok=True)
+    with open(legacy_path, "wb") as legacy:
+        legacy.write(b"old-binary")
+
+    result, path = install_actionlint_source("An error occurred", "1.7.1")
+    assert result is True
+    assert os.path.isfile(path)
+
+
+def test_cache_inputs_follow_config_and_local_uses(tmp_path, rule):
+    (tmp_path / ".git").mkdir()
+    workflows = tmp_path / ".github" / "workflows"
+    workflows.mkdir(parents=True)
+    action = tmp_path / ".github" / "actions" / "build"
+    action.mkdir(parents=True)
+    (action / "action.yml").write_text("runs:\n  using: node20\n")
+    (workflows / "reusable.yml").write_text("on: workflow_call\n")
+    workflow = workflows / "ci.yml"
+    workflow.write_text(
+        "jobs:\n"
+        "  call:\n"
+        "    uses: ./.github/workflows/reusable.yml\n"
+        "  build:\n"
+        "    steps:\n"
+        "      - uses: './.github/actions/build'\n"
+        "      - uses: actions/checkout@v4\n"
+    )
+
+    def inputs():
+        return rule.cache_inputs(str(workflow), workflow.read_bytes())
+
+    before = inputs()
+    for changed in (
+        tmp_path / ".github" / "actionlint.yaml",
+        action / "action.yml",
+        workflows / "reusable.yml",
+    ):
+        changed.write_text("# changed\n")
+        assert inputs() != before
+        before = inputs()
+
+
+def test_cache_inputs_outside_project(tmp_path, rule):
+    workflow = tmp_path / "ci.yml"
+    workflow.write_text("jobs: {}\n")
+    assert rule.cache_inputs(str(workflow), workflow.read_bytes()) == []
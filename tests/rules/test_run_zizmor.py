@@ -1,5 +1,6 @@
 """Test src/bitwarden_workflow_linter/rules/run_zizmor."""
 
+import json
 import pytest
 import subprocess
 import urllib.request
@@ -12,6 +13,7 @@ from src.bitwarden_workflow_linter.rules.run_zizmor import (
     install_zizmor,
     check_zizmor_path,
     download_config_content,
+    finding_path,
 )
 
 settings = Settings.factory()
@@ -283,3 +285,167 @@ def test_rule_zizmor_not_installed(rule):
         assert "zizmor not found" in error
     finally:
         zizmor_module.check_zizmor_path = original_check
+
+
+def _zizmor_finding(path):
+    return {
+        "ident": "artipacked",
+        "desc": "credential persistence through GitHub Actions artifacts",
+        "url": "https://docs.zizmor.sh/audits/#artipacked",
+        "determinations": {"confidence": "Low", "severity": "Medium", "persona": "Regular"},
+        "locations": [
+            {
+                "symbolic": {
+                    "key": {"Local": {"prefix": None, "given_path": path}},
+                    "annotation": "does not set persist-credentials: false",
+                    "kind": "Primary",
+                },
+                "concrete": {
+                    "location": {
+                        "start_point": {"row": 10, "column": 8},
+                        "end_point": {"row": 10, "column": 20},
+                    }
+                },
+            }
+        ],
+        "ignored": False,
+    }
+
+
+def test_finding_path():
+    assert finding_path(_zizmor_finding("./a/b.yml")) == "a/b.yml"
+    assert finding_path({"locations": []}) is None
+    assert finding_path({"locations": [{"symbolic": {"key": {"Remote": {}}}}]}) is None
+
+
+_ZIZMOR_PLAIN_OUTPUT = (
+    "warning[artipacked]: credential persistence through GitHub Actions artifacts\n"
+    "  --> tests/fixtures/test_workflow_incorrect.yaml:11:9\n"
+)
+
+
+@pytest.mark.parametrize(
+    "finding",
+    [
+        _zizmor_finding("tests/fixtures/elsewhere.yaml"),
+        {"ident": "artipacked", "locations": [], "ignored": False},
+    ],
+)
+def test_prepare_unmapped_finding_falls_back_per_file(monkeypatch, rule, finding):
+    rule.settings = Settings(zizmor_version=settings.zizmor_version)
+    filename = "tests/fixtures/test_workflow.yaml"
+    calls = []
+
+    def mock_run(cmd, *args, **kwargs):
+        calls.append(cmd)
+        if "plain" in cmd:
+            return subprocess.CompletedProcess(cmd, 13, stdout=_ZIZMOR_PLAIN_OUTPUT)
+        return subprocess.CompletedProcess(cmd, 13, stdout=json.dumps([finding]))
+
+    monkeypatch.setattr(subprocess, "run", mock_run)
+    monkeypatch.setattr(zizmor_module, "check_zizmor_path", lambda *a, **kw: (True, ""))
+
+    rule.prepare([filename])
+    assert rule.batch_results == {}
+
+    assert rule.fn(WorkflowBuilder.build(filename)) == (False, _ZIZMOR_PLAIN_OUTPUT)
+    assert calls[-1][:3] == ["zizmor", "--format", "plain"]
+
+
+def test_prepare_runs_zizmor_once(monkeypatch):
+    temp_settings = Settings(
+        enabled_rules=settings.enabled_rules,
+        zizmor_version=settings.zizmor_version,
+        zizmor_config_url="https://example.com/zizmor.yml",
+        default_branch=settings.default_branch,
+    )
+    rule = RunZizmor(temp_settings)
+    correct = "tests/fixtures/test_workflow.yaml"
+    incorrect = "tests/fixtures/test_workflow_incorrect.yaml"
+    calls = []
+    downloads = []
+
+    def mock_run(cmd, *args, **kwargs):
+        calls.append(cmd)
+        if "plain" in cmd:
+            return subprocess.CompletedProcess(cmd, 13, stdout=_ZIZMOR_PLAIN_OUTPUT)
+        findings = [_zizmor_finding(incorrect), dict(_zizmor_finding(correct), ignored=True)]
+        return subprocess.CompletedProcess(cmd, 13, stdout=json.dumps(findings))
+
+    def mock_download(url):
+        downloads.append(url)
+        return "# mock config"
+
+    monkeypatch.setattr(subprocess, "run", mock_run)
+    monkeypatch.setattr(zizmor_module, "check_zizmor_path", lambda *a, **kw: (True, ""))
+    monkeypatch.setattr(zizmor_module, "download_config_content", mock_download)
+
+    rule.prepare([correct, incorrect])
+
+    assert len(calls) == 1
+    assert calls[0][:3] == ["zizmor", "--format", "json"]
+    assert "--config" in calls[0]
+    assert calls[0][-2:] == [correct, incorrect]
+
+    result, _ = rule.fn(WorkflowBuilder.build(correct))
+    assert result is True
+
+    # Only the file with findings is run again, for the plain report of zizmor
+    result, error = rule.fn(WorkflowBuilder.build(incorrect))
+    assert result is False
+    assert error == _ZIZMOR_PLAIN_OUTPUT
+
+    assert len(calls) == 2
+    assert calls[1][:3] == ["zizmor", "--format", "plain"]
+    assert calls[1][-1] == incorrect
+    assert len(downloads) == 1
+
+
+def test_prepare_failure_falls_back_per_file(monkeypatch, rule):
+    rule.settings = settings
+    calls = []
+
+    def mock_run(cmd, *args, **kwargs):
+        calls.append(cmd)
+        if len(calls) == 1:
+            return subprocess.CompletedProcess(cmd, 2, stdout="", stderr="bad args")
+        return subprocess.CompletedProcess(cmd, 0, stdout="[]")
+
+    monkeypatch.setattr(subprocess, "run", mock_run)
+    monkeypatch.setattr(zizmor_module, "check_zizmor_path", lambda *a, **kw: (True, ""))
+    monkeypatch.setattr(zizmor_module, "download_config_content", lambda url: None)
+
+    rule.prepare(["tests/fixtures/test_workflow.yaml"])
+    assert rule.batch_results == {}
+
+    result, _ = rule.fn(WorkflowBuilder.build("tests/fixtures/test_workflow.yaml"))
+    assert result is True
+    assert calls[-1][:3] == ["zizmor", "--format", "plain"]
+
+
+def test_cache_inputs_follow_discovered_config(tmp_path):
+    rule = RunZizmor(Settings(zizmor_version=settings.zizmor_version))
+    (tmp_path / ".git").mkdir()
+    workflow = tmp_path / ".github" / "workflows" / "ci.yml"
+    workflow.parent.mkdir(parents=True)
+    workflow.write_text("jobs: {}\n")
+
+    def inputs():
+        return rule.cache_inputs(str(workflow), workflow.read_bytes())
+
+    before = inputs()
+    for changed in (tmp_path / ".github" / "zizmor.yml", tmp_path / "zizmor.yml"):
+        changed.write_text("rules: {}\n")
+        assert inputs() != before
+        before = inputs()
+
+
+def test_cache_inputs_use_downloaded_config(monkeypatch, tmp_path):
+    rule = RunZizmor(
+        Settings(zizmor_version=settings.zizmor_version, zizmor_config_url="https://x/z.yml")
+    )
+    monkeypatch.setattr(zizmor_module, "download_config_content", lambda url: "rules: {}\n")
+    workflow = tmp_path / "ci.yml"
+    workflow.write_text("jobs: {}\n")
+
+    assert rule.cache_inputs(str(workflow), workflow.read_bytes()) == ["config:rules: {}\n"]
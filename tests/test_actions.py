@@ -1,13 +1,20 @@
 """Tests src/bitwarden_workflow_linter/actions.py."""
 
 import json
+from json import loads as json_loads
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+import src.bitwarden_workflow_linter.actions as actions_module
+
 from src.bitwarden_workflow_linter.actions import ActionsCmd
+from src.bitwarden_workflow_linter.rate_limit import RateLimiter
 from src.bitwarden_workflow_linter.utils import Action, Settings
 
+from .conftest import run_git
+from .mock_github import MockRepo
+
 
 @pytest.fixture(name="mock_settings")
 def fixture_mock_settings():
@@ -525,3 +532,470 @@ class TestActionsUpdate:
             assert "v10.0.0" in megalinter_line
             assert "55a59b24a441e0e1943080d4a512d827710d4a9d" in megalinter_line
             assert "newsha12345" in megalinter_line
+
+
+class TestActionsUpdateConcurrent:
+    """Tests for ActionsCmd.update against a local mock of the GitHub API."""
+
+    def test_update_with_jobs(self, mock_github, tmp_path, capsys):
+        """Test that concurrent lookups report and save in the approved order."""
+        repos = [
+            MockRepo(f"owner-{index}/repo", tag=f"v{index}.0.0", annotated=index % 3 == 0)
+            for index in range(20)
+        ]
+        repos.append(MockRepo("tags-only/repo", tag="v0.1.0", releases=False))
+        server = mock_github(repos, latency=0.005)
+        settings = Settings()
+        settings.approved_actions = {
+            f"{repo.name}/sub": Action(name=f"{repo.name}/sub", version="v0", sha="0")
+            for repo in reversed(repos)
+        }
+        settings.approved_actions["missing/repo"] = Action(name="missing/repo")
+        output_file = tmp_path / "actions.json"
+
+        actions_cmd = ActionsCmd(settings=settings, api_url=server.url)
+        assert actions_cmd.update(str(output_file), jobs=4) == 0
+
+        lines = capsys.readouterr().out.splitlines()[1:]
+        assert [line.split()[1] for line in lines] == [
+            f"{repo.name}/sub" for repo in reversed(repos)
+        ]
+        with open(output_file, encoding="utf-8") as f:
+            actions = json.load(f)
+        assert "missing/repo" not in actions
+        for repo in repos:
+            assert actions[f"{repo.name}/sub"] == {
+                "name": f"{repo.name}/sub",
+                "version": repo.tag,
+                "sha": repo.sha,
+            }
+
+        # The lookups share at most one keep-alive connection per thread
+        assert server.connections <= 4
+        assert len(server.requests) > 60
+
+    def test_update_jobs_matches_sequential(self, mock_github, tmp_path, capsys):
+        """Test that the output does not depend on the number of jobs."""
+        server = mock_github([MockRepo(f"owner/repo-{index}") for index in range(10)])
+        settings = Settings()
+        settings.approved_actions = {
+            f"owner/repo-{index}": Action(name=f"owner/repo-{index}", version="v1.0.0")
+            for index in range(10)
+        }
+
+        outputs = []
+        for jobs in (1, 8):
+            output_file = tmp_path / f"actions-{jobs}.json"
+            ActionsCmd(settings=settings, api_url=server.url).update(str(output_file), jobs)
+            outputs.append((capsys.readouterr().out, output_file.read_text()))
+        assert outputs[0] == outputs[1]
+
+    def test_api_url_from_environment(self, monkeypatch):
+        """Test that the GitHub API URL can be set with $GITHUB_API_URL."""
+        monkeypatch.delenv("GITHUB_API_URL", raising=False)
+        assert ActionsCmd().api_url == "https://api.github.com"
+
+        monkeypatch.setenv("GITHUB_API_URL", "https://github.example.com/api/v3/")
+        assert ActionsCmd().api_url == "https://github.example.com/api/v3"
+        assert ActionsCmd(api_url="http://localhost:8080").api_url == "http://localhost:8080"
+
+    def test_update_revalidates_cached_responses(
+        self, mock_github, monkeypatch, tmp_path, capsys
+    ):
+        """Test that a second run is served by 304 Not Modified answers."""
+        repos = [MockRepo(f"owner/repo-{index}", annotated=index == 0) for index in range(5)]
+        server = mock_github(repos)
+        settings = Settings()
+        settings.approved_actions = {
+            repo.name: Action(name=repo.name, version="v1.0.0", sha=repo.sha) for repo in repos
+        }
+        output_file = tmp_path / "actions.json"
+
+        ActionsCmd(settings=settings, api_url=server.url).update(
+            str(output_file), jobs=2, use_cache=True
+        )
+        first = output_file.read_text()
+        requests = len(server.requests)
+        assert server.not_modified == 0
+        assert "HTTP cache: 0 hit(s), 16 miss(es)" in capsys.readouterr().out
+
+        # The bodies served after a 304 are not parsed again (the cache entries
+        # read from disk are str, the response bodies are bytes)
+        parsed = []
+
+        def loads(data, *args, **kwargs):
+            if isinstance(data, bytes):
+                parsed.append(data)
+            return json_loads(data, *args, **kwargs)
+
+        with monkeypatch.context() as patch_json:
+            patch_json.setattr(actions_module.json, "loads", loads)
+            ActionsCmd(settings=settings, api_url=server.url).update(
+                str(output_file), jobs=2, use_cache=True
+            )
+        assert parsed == []
+        assert output_file.read_text() == first
+        assert server.not_modified == len(server.requests) - requests == 16
+        assert "HTTP cache: 16 hit(s), 0 miss(es)" in capsys.readouterr().out
+
+        # A new release changes the ETag of the release, so it is downloaded again
+        server.repos["owner/repo-1"].tag = "v2.0.0"
+        ActionsCmd(settings=settings, api_url=server.url).update(
+            str(output_file), jobs=2, use_cache=True
+        )
+        with open(output_file, encoding="utf-8") as f:
+            assert json.load(f)["owner/repo-1"]["version"] == "v2.0.0"
+        assert "HTTP cache: 14 hit(s), 2 miss(es)" in capsys.readouterr().out
+
+
+class TestActionsRateLimit:
+    """Tests for the rate limiting and checkpoints of ActionsCmd.update."""
+
+    @pytest.fixture(name="repos")
+    def fixture_repos(self):
+        return [MockRepo(f"owner/repo-{index}", tag=f"v{index}.0.0") for index in range(6)]
+
+    @pytest.fixture(name="settings")
+    def fixture_settings(self, repos):
+        settings = Settings()
+        settings.approved_actions = {
+            repo.name: Action(name=repo.name, version="v0", sha="0") for repo in repos
+        }
+        return settings
+
+    def test_update_waits_for_rate_limit_reset(
+        self, mock_github, repos, settings, tmp_path
+    ):
+        """Test that an update paces its requests and waits for the reset."""
+        server = mock_github(repos, rate_limit=5, window=0.3)
+        output_file = tmp_path / "actions.json"
+
+        actions_cmd = ActionsCmd(
+            settings=settings, api_url=server.url, rate_limiter=RateLimiter(reserve=2)
+        )
+        assert actions_cmd.update(str(output_file), jobs=2) == 0
+
+        with open(output_file, encoding="utf-8") as f:
+            actions = json.load(f)
+        assert [actions[repo.name]["version"] for repo in repos] == [
+            repo.tag for repo in repos
+        ]
+        # 3 requests per action need 4 windows of 5 requests
+        assert len(server.requests) - server.rate_limited == 18
+
+    def test_update_retries_server_errors(self, mock_github, repos, settings, tmp_path):
+        """Test that failed and rate limited requests are retried."""
+        server = mock_github(repos)
+        server.fail("/repos/owner/repo-1/releases/latest", 502, count=2)
+        server.fail("/repos/owner/repo-2", 429, retry_after=0)
+        output_file = tmp_path / "actions.json"
+
+        actions_cmd = ActionsCmd(
+            settings=settings, api_url=server.url, rate_limiter=RateLimiter(backoff=0.01)
+        )
+        assert actions_cmd.update(str(output_file), jobs=2) == 0
+
+        with open(output_file, encoding="utf-8") as f:
+            assert json.load(f)["owner/repo-1"]["version"] == "v1.0.0"
+        assert len(server.requests) == 6 * 3 + 3
+
+    def test_update_keeps_actions_that_failed(
+        self, mock_github, repos, settings, tmp_path, capsys
+    ):
+        """Test that an action whose latest version is not found is kept as is."""
+        server = mock_github(repos)
+        server.fail("/repos/owner/repo-3/releases/latest", 500, count=2)
+        output_file = tmp_path / "actions.json"
+
+        actions_cmd = ActionsCmd(
+            settings=settings,
+            api_url=server.url,
+            rate_limiter=RateLimiter(max_retries=1, backoff=0.01),
+        )
+        assert actions_cmd.update(str(output_file)) == 1
+
+        out = capsys.readouterr().out
+        assert "owner/repo-3 \033[31mfailed" in out
+        assert "1 action(s) failed, rerun the update to retry them" in out
+        with open(output_file, encoding="utf-8") as f:
+            actions = json.load(f)
+        assert actions["owner/repo-3"] == {"name": "owner/repo-3", "version": "v0", "sha": "0"}
+        assert actions["owner/repo-4"]["version"] == "v4.0.0"
+
+        # The rerun only looks up the action that failed
+        requests = len(server.requests)
+        assert actions_cmd.update(str(output_file), resume=True) == 0
+        assert "Resuming: 5 action(s) already looked up" in capsys.readouterr().out
+        assert server.requests[requests:] == [
+            "/repos/owner/repo-3",
+            "/repos/owner/repo-3/releases/latest",
+            "/repos/owner/repo-3/git/ref/tags/v3.0.0",
+        ]
+        with open(output_file, encoding="utf-8") as f:
+            assert json.load(f)["owner/repo-3"]["version"] == "v3.0.0"
+
+    @pytest.mark.parametrize("backend", ["rest", "graphql"])
+    def test_update_resumes_after_interruption(
+        self, mock_github, repos, settings, tmp_path, monkeypatch, capsys, backend
+    ):
+        """Test that an interrupted update resumes from the actions it looked up."""
+        monkeypatch.setenv("GITHUB_TOKEN", "test-token")
+        monkeypatch.setattr("src.bitwarden_workflow_linter.actions.GRAPHQL_BATCH_SIZE", 2)
+        server = mock_github(repos)
+        output_file = tmp_path / "actions.json"
+        actions_cmd = ActionsCmd(settings=settings, api_url=server.url)
+
+        lookup = actions_cmd.get_latest_with_full_path
+        query = actions_cmd.get_latest_versions_graphql
+
+        def interrupt(function, name):
+            def wrapper(arg):
+                if name in str(arg):
+                    raise KeyboardInterrupt
+                return function(arg)
+
+            return wrapper
+
+        with patch.object(
+            actions_cmd, "get_latest_with_full_path", interrupt(lookup, "repo-4")
+        ), patch.object(
+            actions_cmd, "get_latest_versions_graphql", interrupt(query, "repo-4")
+        ), pytest.raises(KeyboardInterrupt):
+            actions_cmd.update(str(output_file), backend=backend)
+        assert "Update interrupted, rerun it to resume" in capsys.readouterr().out
+        assert not output_file.exists()
+
+        requests = len(server.requests)
+        assert actions_cmd.update(str(output_file), backend=backend, resume=True) == 0
+        # The lookups that were running or done when it stopped are not repeated
+        assert "Resuming: " in capsys.readouterr().out
+        assert not any(
+            f"repo-{index}/" in f"{path}/"
+            for index in range(4)
+            for path in server.requests[requests:]
+        )
+        assert any(
+            "repo-4" in path or path == "/graphql" for path in server.requests[requests:]
+        )
+        with open(output_file, encoding="utf-8") as f:
+            actions = json.load(f)
+        assert [actions[repo.name]["version"] for repo in repos] == [
+            repo.tag for repo in repos
+        ]
+
+        # The checkpoint is removed once the update is complete
+        capsys.readouterr()
+        actions_cmd.update(str(output_file), backend=backend, resume=True)
+        assert "Resuming" not in capsys.readouterr().out
+
+    def test_update_bug_is_not_an_interruption(
+        self, mock_github, repos, settings, tmp_path, capsys
+    ):
+        """Test that a bug saves the checkpoint without the resume hint."""
+        server = mock_github(repos)
+        output_file = tmp_path / "actions.json"
+        actions_cmd = ActionsCmd(settings=settings, api_url=server.url)
+        lookup = actions_cmd.get_latest_with_full_path
+
+        def broken(action):
+            if "repo-4" in action.name:
+                raise TypeError("bug")
+            return lookup(action)
+
+        with patch.object(
+            actions_cmd, "get_latest_with_full_path", broken
+        ), pytest.raises(TypeError):
+            actions_cmd.update(str(output_file))
+        assert "rerun it to resume" not in capsys.readouterr().out
+
+        assert actions_cmd.update(str(output_file), resume=True) == 0
+        assert "Resuming: " in capsys.readouterr().out
+
+
+class TestActionsGraphQL:
+    """Tests for the GraphQL backend of ActionsCmd against a local mock of the API."""
+
+    @pytest.fixture(autouse=True)
+    def github_token(self, monkeypatch):
+        monkeypatch.setenv("GITHUB_TOKEN", "test-token")
+
+    def test_update_graphql_matches_rest(self, mock_github, tmp_path, capsys):
+        """Test that both backends save and print the same actions."""
+        repos = [
+            MockRepo(
+                f"owner-{index % 7}/repo-{index}",
+                tag=f"v{index}.0.0",
+                annotated=index % 3 == 0,
+                releases=index % 20 != 0,
+            )
+            for index in range(120)
+        ]
+        server = mock_github(repos)
+        settings = Settings()
+        settings.approved_actions = {
+            repo.name: Action(name=repo.name, version="v0", sha="0") for repo in repos
+        }
+        settings.approved_actions["owner-1/repo-1/sub"] = Action(name="owner-1/repo-1/sub")
+        settings.approved_actions["missing/repo"] = Action(name="missing/repo")
+
+        outputs = []
+        for backend in ("rest", "graphql"):
+            output_file = tmp_path / f"actions-{backend}.json"
+            requests = len(server.requests)
+            ActionsCmd(settings=settings, api_url=server.url).update(
+                str(output_file), jobs=4, backend=backend
+            )
+            outputs.append((capsys.readouterr().out, output_file.read_text()))
+        assert outputs[0] == outputs[1]
+
+        # 3 queries of 50, 50 and 21 repositories, and 2 REST calls (latest
+        # release and tags) for each of the 6 repositories without a release
+        assert server.requests[requests:].count("/graphql") == 3
+        assert len(server.requests) - requests == 3 + 6 * 2
+
+    def test_add_graphql(self, mock_github, tmp_path):
+        """Test adding an action with the GraphQL backend."""
+        repo = MockRepo("owner/repo", tag="v2.1.0", annotated=True)
+        server = mock_github([repo])
+        output_file = tmp_path / "actions.json"
+
+        actions_cmd = ActionsCmd(settings=Settings(), api_url=server.url)
+        assert actions_cmd.add("owner/repo/sub", str(output_file), backend="graphql") == 0
+
+        with open(output_file, encoding="utf-8") as f:
+            assert json.load(f)["owner/repo/sub"] == {
+                "name": "owner/repo/sub",
+                "version": "v2.1.0",
+                "sha": repo.sha,
+            }
+        assert server.requests == ["/graphql"]
+
+    def test_graphql_failure_falls_back_to_rest(self, mock_github, tmp_path):
+        """Test that the REST API is used when the GraphQL query fails."""
+        server = mock_github([MockRepo("owner/repo")])
+        output_file = tmp_path / "actions.json"
+
+        actions_cmd = ActionsCmd(
+            settings=Settings(), api_url=server.url, graphql_url=f"{server.url}/missing"
+        )
+        actions_cmd.add("owner/repo", str(output_file), backend="graphql")
+
+        with open(output_file, encoding="utf-8") as f:
+            assert json.load(f)["owner/repo"]["version"] == "v1.0.0"
+
+    def test_graphql_url(self, monkeypatch):
+        """Test the default GraphQL URL of github.com and GitHub Enterprise Server."""
+        monkeypatch.delenv("GITHUB_API_URL", raising=False)
+        monkeypatch.delenv("GITHUB_GRAPHQL_URL", raising=False)
+        assert ActionsCmd().graphql_url == "https://api.github.com/graphql"
+        assert (
+            ActionsCmd(api_url="https://github.example.com/api/v3").graphql_url
+            == "https://github.example.com/api/graphql"
+        )
+
+        monkeypatch.setenv("GITHUB_GRAPHQL_URL", "https://github.example.com/api/graphql")
+        assert ActionsCmd().graphql_url == "https://github.example.com/api/graphql"
+
+    def test_graphql_needs_token(self, monkeypatch):
+        """Test that the REST API is used without a token."""
+        monkeypatch.delenv("GITHUB_TOKEN")
+        assert ActionsCmd().check_backend("graphql") == "rest"
+
+
+class TestActionsMirror:
+    """Tests for the mirror backend of ActionsCmd, which reads local git mirrors."""
+
+    # Any request to the GitHub API would fail to connect
+    OFFLINE_API_URL = "http://127.0.0.1:9"
+
+    def test_update_from_mirrors(self, git_mirror, tmp_path, capsys):
+        """Test that update resolves the latest tags from the mirrors."""
+        mirrors = tmp_path / "mirrors"
+        shas = {}
+        for index, storage in enumerate(("loose", "packed", "ref-delta")):
+            path = git_mirror(
+                mirrors / "owner" / f"repo-{index}.git",
+                [("v1.0.0", "annotated"), (f"v1.{index + 1}.0", "lightweight")],
+                storage,
+            )
+            shas[f"owner/repo-{index}"] = run_git(path, "rev-parse", "refs/heads/main").strip()
+        settings = Settings()
+        settings.approved_actions = {
+            "owner/repo-0": Action(
+                name="owner/repo-0", version="v1.1.0", sha=shas["owner/repo-0"]
+            ),
+            "owner/repo-1/sub": Action(name="owner/repo-1/sub", version="v1.0.0"),
+            "owner/repo-2": Action(name="owner/repo-2", version="v1.0.0"),
+            "owner/unmirrored": Action(name="owner/unmirrored", version="v3", sha="3"),
+        }
+        output_file = tmp_path / "actions.json"
+
+        actions_cmd = ActionsCmd(
+            settings=settings, api_url=self.OFFLINE_API_URL, mirror_dir=str(mirrors)
+        )
+        assert actions_cmd.update(str(output_file), jobs=4, backend="mirror") == 1
+
+        out = capsys.readouterr().out
+        assert "owner/repo-0 \033[32mok" in out
+        assert "owner/unmirrored \033[31mfailed" in out
+        with open(output_file, encoding="utf-8") as f:
+            actions = json.load(f)
+        assert actions == {
+            "owner/repo-0": {
+                "name": "owner/repo-0",
+                "version": "v1.1.0",
+                "sha": shas["owner/repo-0"],
+            },
+            "owner/repo-1/sub": {
+                "name": "owner/repo-1/sub",
+                "version": "v1.2.0",
+                "sha": shas["owner/repo-1"],
+            },
+            "owner/repo-2": {
+                "name": "owner/repo-2",
+                "version": "v1.3.0",
+                "sha": shas["owner/repo-2"],
+            },
+            # The action without a mirror is kept as it was
+            "owner/unmirrored": {"name": "owner/unmirrored", "version": "v3", "sha": "3"},
+        }
+
+    def test_add_from_mirror(self, git_mirror, tmp_path, monkeypatch):
+        """Test adding an action from a mirror in $BWWL_MIRROR_DIR."""
+        mirrors = tmp_path / "mirrors"
+        path = git_mirror(mirrors / "owner" / "repo.git", [("v2.0.0", "nested")], "packed")
+        monkeypatch.setenv("BWWL_MIRROR_DIR", str(mirrors))
+        output_file = tmp_path / "actions.json"
+
+        actions_cmd = ActionsCmd(settings=Settings(), api_url=self.OFFLINE_API_URL)
+        assert actions_cmd.add("owner/repo/sub", str(output_file), backend="mirror") == 0
+
+        with open(output_file, encoding="utf-8") as f:
+            assert json.load(f)["owner/repo/sub"] == {
+                "name": "owner/repo/sub",
+                "version": "v2.0.0",
+                "sha": run_git(path, "rev-parse", "refs/heads/main").strip(),
+            }
+
+    def test_add_without_mirror_fails(self, tmp_path, capsys):
+        """Test that adding an action without a mirror is a failed lookup."""
+        mirrors = tmp_path / "mirrors"
+        mirrors.mkdir()
+        output_file = tmp_path / "actions.json"
+
+        actions_cmd = ActionsCmd(
+            settings=Settings(), api_url=self.OFFLINE_API_URL, mirror_dir=str(mirrors)
+        )
+        assert actions_cmd.add("owner/missing", str(output_file), backend="mirror") == 1
+
+        output = capsys.readouterr().out
+        assert f"owner/missing \033[31mfailed\033[0m: no mirror in {mirrors}" in output
+        assert "not found" not in output
+        with open(output_file, encoding="utf-8") as f:
+            assert "owner/missing" not in json.load(f)
+
+    def test_mirror_backend_needs_directory(self, monkeypatch):
+        """Test that the mirror backend cannot be used without mirrors."""
+        monkeypatch.delenv("BWWL_MIRROR_DIR", raising=False)
+        with pytest.raises(ValueError, match="--mirror-dir"):
+            ActionsCmd().check_backend("mirror")
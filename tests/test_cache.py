@@ -0,0 +1,218 @@
+"""Test src/bitwarden_workflow_linter/cache.py."""
+
+import json
+import os
+import time
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.bitwarden_workflow_linter.actions import response_json
+from src.bitwarden_workflow_linter.cache import HttpCache, ResultCache, UpdateCheckpoint
+from src.bitwarden_workflow_linter.utils import Action, LintFinding, LintLevels, Settings
+
+
+@pytest.fixture(name="workflow_file")
+def fixture_workflow_file(tmp_path):
+    path = tmp_path / "workflow.yml"
+    path.write_text("name: Test\n")
+    return str(path)
+
+
+@pytest.fixture(name="findings")
+def fixture_findings():
+    return [
+        LintFinding("a warning", LintLevels.WARNING),
+        LintFinding("an error", LintLevels.ERROR),
+    ]
+
+
+def test_cache_roundtrip(workflow_file, findings):
+    cache = ResultCache(Settings())
+    assert cache.get(workflow_file) is None
+
+    cache.set(workflow_file, findings)
+    cached = ResultCache(Settings()).get(workflow_file)
+
+    assert [str(finding) for finding in cached] == [str(finding) for finding in findings]
+    assert cache.stats() == "Result cache: 0 hit(s), 1 miss(es)"
+
+
+def test_cache_keyed_by_content(workflow_file, findings):
+    ResultCache(Settings()).set(workflow_file, findings)
+
+    with open(workflow_file, "a", encoding="utf8") as file:
+        file.write("on: push\n")
+
+    assert ResultCache(Settings()).get(workflow_file) is None
+
+
+def test_cache_keyed_by_settings(workflow_file, findings):
+    ResultCache(Settings()).set(workflow_file, findings)
+
+    assert ResultCache(Settings(blocked_domains=["evil.com"])).get(workflow_file) is None
+    assert (
+        ResultCache(
+            Settings(enabled_rules=[{"id": "some.Rule", "level": "warning"}])
+        ).get(workflow_file)
+        is None
+    )
+    assert ResultCache(Settings()).get(workflow_file) is not None
+
+
+def test_cache_keyed_by_path(workflow_file, findings, tmp_path):
+    copy = tmp_path / "copy" / "workflow.yml"
+    copy.parent.mkdir()
+    copy.write_bytes(open(workflow_file, "rb").read())
+    ResultCache(Settings()).set(workflow_file, findings)
+
+    assert ResultCache(Settings()).get(str(copy)) is None
+    assert ResultCache(Settings()).get(workflow_file) is not None
+
+
+def test_cache_keyed_by_inputs(workflow_file, findings):
+    inputs = ["config:1"]
+    ResultCache(Settings(), inputs=lambda filename, content: inputs).set(
+        workflow_file, findings
+    )
+
+    assert ResultCache(Settings()).get(workflow_file) is None
+    assert (
+        ResultCache(Settings(), inputs=lambda filename, content: inputs).get(workflow_file)
+        is not None
+    )
+    inputs = ["config:2"]
+    assert (
+        ResultCache(Settings(), inputs=lambda filename, content: inputs).get(workflow_file)
+        is None
+    )
+
+
+def test_cache_ignores_corrupt_entries(workflow_file, findings):
+    cache = ResultCache(Settings())
+    cache.set(workflow_file, findings)
+    with open(cache.path(workflow_file), "w", encoding="utf8") as file:
+        file.write("{not json")
+
+    assert ResultCache(Settings()).get(workflow_file) is None
+
+
+def http_response(body, etag='"v1"', last_modified=None):
+    headers = {"ETag": etag, "Last-Modified": last_modified}
+    return SimpleNamespace(
+        status=200,
+        data=body.encode(),
+        headers={name: value for name, value in headers.items() if value is not None},
+    )
+
+
+def test_http_cache_roundtrip():
+    cache = HttpCache()
+    url = "https://api.github.com/repos/owner/repo"
+    assert cache.get(url) is None
+
+    cache.set(url, http_response('{"full_name": "owner/repo"}', last_modified="Mon"))
+    cached = HttpCache().get(url)
+
+    assert cached.status == 200
+    assert cached.data == b'{"full_name": "owner/repo"}'
+    assert cached.validators() == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon"}
+
+
+def test_http_cache_keeps_parsed_body():
+    url = "https://api.github.com/repos/owner/repo"
+    stored = HttpCache().set(url, http_response('{"tag_name": "v1.0.0"}'))
+    cached = HttpCache().get(url)
+
+    assert stored.json() == cached.json() == {"tag_name": "v1.0.0"}
+    assert response_json(cached) is cached.parsed
+    assert HttpCache().set(url, http_response("not json")) is None
+
+
+def test_http_cache_needs_validators():
+    cache = HttpCache()
+    cache.set("https://api.github.com/a", http_response("{}", etag=None))
+
+    assert cache.get("https://api.github.com/a") is None
+
+
+def test_http_cache_expires_unused_entries():
+    cache = HttpCache(ttl=60)
+    cache.set("https://api.github.com/old", http_response("{}"))
+    cache.set("https://api.github.com/new", http_response("{}"))
+    old = time.time() - 120
+    os.utime(cache.path("https://api.github.com/old"), (old, old))
+
+    assert cache.get("https://api.github.com/old") is None
+    assert not os.path.exists(cache.path("https://api.github.com/old"))
+    assert cache.get("https://api.github.com/new") is not None
+
+
+def test_http_cache_prune_evicts_least_recently_used():
+    cache = HttpCache(max_bytes=2500)
+    urls = [f"https://api.github.com/repos/owner/repo-{index}" for index in range(4)]
+    for age, url in enumerate(reversed(urls)):
+        cache.set(url, http_response(json.dumps("x" * 1000)))
+        used = time.time() - 10 * age
+        os.utime(cache.path(url), (used, used))
+    # Using the oldest entry keeps it
+    cache.hit(urls[0])
+
+    cache.prune()
+
+    assert [cache.get(url) is not None for url in urls] == [True, False, False, True]
+    assert cache.stats() == "HTTP cache: 1 hit(s), 0 miss(es)"
+
+
+def test_update_checkpoint_roundtrip():
+    actions = [Action("owner/repo", "v1", "a"), Action("owner/gone")]
+    checkpoint = UpdateCheckpoint("https://api.github.com", actions)
+    checkpoint.record("owner/repo", True, Action("owner/repo", "v2", "b"))
+    checkpoint.record("owner/gone", False, None)
+    checkpoint.save()
+
+    resumed = UpdateCheckpoint("https://api.github.com", actions)
+    assert resumed.load() == 2
+    assert resumed.results == {
+        "owner/repo": (True, Action("owner/repo", "v2", "b")),
+        "owner/gone": (False, None),
+    }
+
+    resumed.clear()
+    assert UpdateCheckpoint("https://api.github.com", actions).load() == 0
+
+
+def test_update_checkpoint_skips_failures():
+    checkpoint = UpdateCheckpoint("https://api.github.com", [Action("owner/repo")])
+    checkpoint.record("owner/repo", True, None)
+    checkpoint.save()
+    assert checkpoint.load() == 0
+
+
+def test_update_checkpoint_keyed_by_actions():
+    checkpoint = UpdateCheckpoint("https://api.github.com", [Action("owner/repo", "v1")])
+    checkpoint.record("owner/repo", True, Action("owner/repo", "v2", "b"))
+    checkpoint.save()
+
+    assert UpdateCheckpoint("https://api.github.com", [Action("owner/repo", "v2")]).load() == 0
+    assert UpdateCheckpoint("http://localhost", [Action("owner/repo", "v1")]).load() == 0
+
+
+def test_update_checkpoint_expires():
+    checkpoint = UpdateCheckpoint("https://api.github.com", [Action("owner/repo")], ttl=60)
+    checkpoint.created = time.time() - 120
+    checkpoint.record("owner/repo", False, None)
+    checkpoint.save()
+
+    assert checkpoint.load() == 0
+    assert not os.path.exists(checkpoint.path)
+
+
+def test_update_checkpoint_saves_every_interval():
+    actions = [Action(f"owner/repo-{index}") for index in range(5)]
+    checkpoint = UpdateCheckpoint("https://api.github.com", actions, interval=2)
+    checkpoint.record("owner/repo-0", False, None)
+    assert not os.path.exists(checkpoint.path)
+    checkpoint.record("owner/repo-1", False, None)
+    assert os.path.exists(checkpoint.path)
@@ -0,0 +1,46 @@
+"""Test src/bitwarden_workflow_linter/cli.py."""
+
+import subprocess
+import sys
+
+import pytest
+
+from src.bitwarden_workflow_linter.cli import find_subcommand, load_subcommand
+from src.bitwarden_workflow_linter.lint import LinterCmd
+
+HEAVY_MODULES = ("ruamel.yaml", "dataclasses_json", "urllib3")
+
+IMPORTED_MODULES = """
+import sys
+sys.argv = ["bwwl", *{args!r}]
+from src.bitwarden_workflow_linter import cli
+try:
+    cli.main()
+except SystemExit:
+    pass
+print(",".join(name for name in {modules!r} if name in sys.modules))
+"""
+
+
+def test_find_subcommand():
+    assert find_subcommand(["-v", "lint", "-f", "actions"]) == "lint"
+    assert find_subcommand(["--version"]) is None
+    assert find_subcommand(["unknown", "lint"]) is None
+
+
+def test_load_subcommand():
+    assert load_subcommand("lint") is LinterCmd
+
+
+@pytest.mark.parametrize(
+    "args",
+    [["--version"], ["--help"], ["lint", "--help"], ["actions", "--help"], ["daemon", "--help"]],
+)
+def test_startup_does_not_import_heavy_modules(args):
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORTED_MODULES.format(args=args, modules=HEAVY_MODULES)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.splitlines()[-1] == ""
@@ -0,0 +1,152 @@
+"""Test src/bitwarden_workflow_linter/daemon.py."""
+
+import contextlib
+import io
+import os
+import threading
+
+import pytest
+
+import src.bitwarden_workflow_linter.tools as tools_module
+
+from src.bitwarden_workflow_linter.daemon import (
+    DaemonCmd,
+    DaemonError,
+    LintDaemon,
+    is_supported,
+    lint_with_daemon,
+    send_request,
+    socket_path,
+)
+from src.bitwarden_workflow_linter.lint import LinterCmd
+from src.bitwarden_workflow_linter.utils import Settings
+
+pytestmark = pytest.mark.skipif(not is_supported(), reason="requires Unix sockets")
+
+ARGUMENTS = {
+    "input_files": ["tests/fixtures/test.yml", "tests/fixtures/test-alt.yml"],
+    "strict": False,
+    "errors_only": False,
+    "jobs": 1,
+    "use_cache": False,
+    "changed_since": None,
+}
+
+
+@pytest.fixture(name="settings_file")
+def fixture_settings_file(tmp_path):
+    path = tmp_path / "settings.yaml"
+    path.write_text("enabled_rules: []\n")
+    return path
+
+
+@pytest.fixture(name="settings_factory")
+def fixture_settings_factory(settings_file):
+    def factory():
+        print("Loading settings")
+        return Settings(
+            enabled_rules=[
+                {
+                    "id": "bitwarden_workflow_linter.rules.name_exists.RuleNameExists",
+                    "level": "error",
+                },
+            ],
+            sources=[str(settings_file)],
+        )
+
+    return factory
+
+
+@pytest.fixture(name="daemon")
+def fixture_daemon(settings_factory):
+    daemon = LintDaemon(settings_factory=settings_factory)
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    for _ in range(200):
+        with contextlib.suppress(DaemonError):
+            send_request({"command": "status"})
+            break
+        threading.Event().wait(0.01)
+    yield daemon
+    with contextlib.suppress(DaemonError):
+        send_request({"command": "stop"})
+    thread.join(5)
+
+
+def test_lint_without_daemon():
+    assert lint_with_daemon(ARGUMENTS) is None
+
+
+def test_lint_with_daemon_matches_in_process(daemon, settings_factory):
+    output, return_code = lint_with_daemon(ARGUMENTS)
+
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        expected_code = LinterCmd(settings=settings_factory()).run(**ARGUMENTS)
+
+    assert output == buffer.getvalue()
+    assert output.startswith("Loading settings\n")
+    assert return_code == expected_code
+    assert daemon.requests == 2
+
+
+def test_lint_with_daemon_stale_settings(daemon, settings_file):
+    assert lint_with_daemon(ARGUMENTS) is not None
+
+    settings_file.write_text("enabled_rules: []\ndefault_branch: dev\n")
+    assert lint_with_daemon(ARGUMENTS) is None
+
+    # The daemon reloads its Settings after answering a stale request
+    assert lint_with_daemon(ARGUMENTS) is not None
+
+
+def test_lint_with_daemon_other_version(daemon):
+    response = send_request({"command": "lint", "version": "0.0.0", "arguments": ARGUMENTS})
+    assert response == {"status": "stale"}
+
+
+def test_lint_with_daemon_error_falls_back(daemon):
+    assert lint_with_daemon({**ARGUMENTS, "input_files": ["missing.yml"]}) is None
+
+
+def test_daemon_stop_removes_socket(daemon, capsys):
+    assert os.path.exists(socket_path())
+    assert DaemonCmd().status() == 0
+    assert "Daemon is running" in capsys.readouterr().out
+
+    assert DaemonCmd().stop() == 0
+    for _ in range(200):
+        if not os.path.exists(socket_path()):
+            break
+        threading.Event().wait(0.01)
+    assert not os.path.exists(socket_path())
+    assert DaemonCmd().status() == -1
+
+
+def test_daemon_replaces_dead_socket(settings_factory):
+    path = socket_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf8"):
+        pass
+
+    daemon = LintDaemon(settings_factory=settings_factory, idle_timeout=0.1)
+    daemon.serve_forever()
+
+    assert not os.path.exists(path)
+
+
+def test_socket_path_depends_on_directory(tmp_path):
+    assert socket_path(str(tmp_path)) != socket_path(os.getcwd())
+    assert socket_path() == socket_path(os.getcwd())
+
+
+def test_daemon_stale_after_tool_failure_expires(settings_factory, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(tools_module.time, "monotonic", lambda: now[0])
+    daemon = LintDaemon(settings_factory=settings_factory)
+    daemon.load()
+    tools_module.resolve_tool("tool", "1.0.0", lambda: (False, "failed to install"))
+    assert not daemon.is_stale()
+
+    now[0] += tools_module.FAILED_RESOLUTION_TTL
+    assert daemon.is_stale()
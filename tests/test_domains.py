@@ -0,0 +1,106 @@
+"""Test src/bitwarden_workflow_linter/domains.py."""
+
+import random
+import re
+import time
+
+import pytest
+
+from src.bitwarden_workflow_linter.domains import extract_domains
+
+# The regex that RuleCheckBlockedDomains used, as the reference of extract_domains
+DOMAIN_PATTERN = re.compile(
+    r"(?:https?://)?(?:www\.)?([a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+"
+    r"[a-zA-Z]{2,}(?:/[^\s]*)?",
+    re.IGNORECASE,
+)
+
+# Fragments that the fuzzed texts are made of, around the edge cases of the regex
+FRAGMENTS = (
+    "a", "b", "ab", "xyz", "com", "io", "co", "1", "42", "a1", "-", "--", ".", "..",
+    "/", "//", ":", "://", " ", "\n", "\t", "_", "@", "'", '"', "$", "{", "}",
+    "http://", "https://", "HTTP://", "Https://", "http", "https", "www.", "WWW.",
+    "www", "github.com", "example.org", "x-y", "a-", "-a", "a" * 62, "b" * 63, "c" * 64,
+    "ſ", "K", "İ", "ı", "é", "ß",
+)
+
+
+def legacy_extract(text: str) -> list[str]:
+    """Extract the domains of a text the way RuleCheckBlockedDomains did with a regex."""
+    domains = set()
+    for match in DOMAIN_PATTERN.finditer(text):
+        domain = re.sub(r"^https?://", "", match.group(0))
+        domain = re.sub(r"^www\.", "", domain)
+        domain = re.sub(r"/.*$", "", domain)
+        domain = domain.lower().strip()
+        if domain and "." in domain:
+            domains.add(domain)
+    return sorted(domains)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("", []),
+        ("https://example.com/path", ["example.com"]),
+        ("http://www.test.org", ["test.org"]),
+        ("curl -fsSL https://Sub.Example.COM/a.sh | bash", ["sub.example.com"]),
+        ("one.example.com two.example.org", ["one.example.com", "two.example.org"]),
+        ("a.b.c", []),
+        ("a.bc.d", ["a.bc"]),
+        ("a.com1.org", ["a.com1.org"]),
+        ("a.com-1x.b", ["a.com"]),
+        ("www.com", []),
+        ("https://a.com/b.org/c d.net", ["a.com", "d.net"]),
+        ("foo_bar.com", ["bar.com"]),
+        ("xhttps://a.com", ["a.com"]),
+        ("a.http://b.com", ["a.http", "b.com"]),
+        (f"{'x' * 70}.com", [f"{'x' * 63}.com"]),
+        ("-a.com a-.b.com", ["a.com", "b.com"]),
+        # The scheme is only removed in lowercase, which leaves no domain
+        ("HTTPS://example.com", []),
+        ("WWW.example.com", ["www.example.com"]),
+    ],
+)
+def test_extract_domains(text, expected):
+    assert extract_domains(text) == expected
+
+
+def test_extract_domains_keeps_order():
+    assert extract_domains("b.com a.com b.com c.com") == ["b.com", "a.com", "c.com"]
+
+
+def test_extract_domains_matches_legacy_regex():
+    rng = random.Random(0)
+    for _ in range(5000):
+        text = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 30)))
+        assert sorted(extract_domains(text)) == legacy_extract(text), repr(text)
+
+
+def test_extract_domains_matches_legacy_regex_on_dotted_words():
+    rng = random.Random(1)
+    alphabet = "ab1-.:/ "
+    for _ in range(5000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 40)))
+        assert sorted(extract_domains(text)) == legacy_extract(text), repr(text)
+
+
+@pytest.mark.parametrize(
+    "unit",
+    [
+        "a.",
+        "a-",
+        "a.-",
+        "1.a.",
+        "ab.1",
+        "https://a.",
+        "www.",
+        "a" * 64 + ".",
+    ],
+)
+def test_extract_domains_is_linear_on_adversarial_input(unit):
+    # The legacy regex takes minutes on 1 MB of any of these
+    text = unit * (1_000_000 // len(unit))
+    start = time.perf_counter()
+    extract_domains(text)
+    assert time.perf_counter() - start < 10
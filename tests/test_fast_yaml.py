@@ -0,0 +1,101 @@
+"""Tests src/bitwarden_workflow_linter/fast_yaml.py."""
+
+import glob
+import importlib
+
+import pytest
+import yaml as pyyaml
+
+from ruamel.yaml import YAML
+
+from .conftest import FIXTURE_DIR
+
+from src.bitwarden_workflow_linter import fast_yaml
+from src.bitwarden_workflow_linter.fast_yaml import load
+from src.bitwarden_workflow_linter.load import WorkflowBuilder, WorkflowBuilderError
+from src.bitwarden_workflow_linter.models.step import trailing_comment
+
+
+yaml = YAML()
+
+USES_COMMENTS = {
+    "same line": "steps:\n  - uses: a/b@sha # v4.1.1\n    with:\n      x: 1\n",
+    "last step": "steps:\n  - uses: a/b@sha # v4.1.1\n  - run: x\n",
+    "end of file": "steps:\n  - uses: a/b@sha # v4",
+    "no space": "steps:\n  - uses: a/b@sha #v4\n",
+    "trailing blanks": "steps:\n  - uses: a/b@sha   # v4   \n    with: {}\n",
+    "quoted": "steps:\n  - uses: 'a/b@sha' # v4\n",
+    "block scalar": "steps:\n  - uses: >-\n      a/b@sha\n    # v4\n    with: {}\n",
+    "flow mapping": "steps:\n  - {uses: a/b@sha, name: x} # v4\n",
+    "alias": "steps:\n  - uses: &u a/b@sha # v1\n  - uses: *u # v2\n",
+    "no comment": "steps:\n  - uses: a/b@sha   \n    with: {}\n",
+    "next lines": "steps:\n  - uses: a/b@sha # v1\n    # x\n\n    # y\n    with: {}\n",
+    "comment on next line": "steps:\n  - uses: a/b@sha\n    # another\n    with: {}\n",
+    "empty lines": "steps:\n  - uses: a/b@sha\n  \n  - run: x\n",
+    "comment after the file": "steps:\n  - uses: a/b@sha\n# end\n",
+}
+
+
+@pytest.mark.parametrize("source", USES_COMMENTS.values(), ids=USES_COMMENTS.keys())
+def test_uses_comment(source):
+    expected = yaml.load(source)["steps"][0]
+    loaded = load(source)["steps"][0]
+
+    assert loaded == expected
+    assert trailing_comment(loaded, "uses") == trailing_comment(expected, "uses")
+
+
+def test_without_libyaml(monkeypatch):
+    expected = [load(source) for source in USES_COMMENTS.values()]
+    monkeypatch.delattr(pyyaml, "CSafeLoader")
+    try:
+        pure = importlib.reload(fast_yaml)
+        assert pure.FastLoader.__bases__ == (pyyaml.SafeLoader,)
+        for source, loaded in zip(USES_COMMENTS.values(), expected):
+            step = pure.load(source)["steps"][0]
+            assert step == loaded["steps"][0]
+            assert trailing_comment(step, "uses") == trailing_comment(
+                loaded["steps"][0], "uses"
+            )
+    finally:
+        monkeypatch.undo()
+        importlib.reload(fast_yaml)
+
+
+def test_yaml_1_2_scalars():
+    source = """\
+on: push
+bools: [true, False, on, off, yes, no, y, n]
+ints: [0777, 0o17, 0x1F, -0x1F, 1_000, 0b101, +12, 010]
+floats: [.5, 1e3, .inf, -.inf]
+strings: ["5", 1:20, 1.2.3]
+nulls: [~, null, ]
+date: 2024-01-31
+"""
+    loaded = load(source)
+
+    assert "on" in loaded
+    assert loaded == yaml.load(source)
+    assert loaded["bools"] == [True, False, "on", "off", "yes", "no", "y", "n"]
+    assert loaded["ints"] == [777, 15, 31, -31, 1000, 5, 12, 10]
+
+
+def test_duplicate_keys():
+    with pytest.raises(Exception, match="duplicate key"):
+        load("name: a\nname: b\n")
+    assert load("base: &base\n  a: 1\nmerged:\n  <<: *base\n  a: 2\n")["merged"] == {"a": 2}
+
+
+FIXTURES = sorted(glob.glob(f"{FIXTURE_DIR}/**/*.y*ml", recursive=True))
+
+
+@pytest.mark.parametrize("filename", FIXTURES)
+def test_same_workflow(filename):
+    try:
+        expected = WorkflowBuilder.build(filename)
+    except WorkflowBuilderError:
+        with pytest.raises(WorkflowBuilderError):
+            WorkflowBuilder.build(filename, fast=True)
+        return
+
+    assert WorkflowBuilder.build(filename, fast=True) == expected
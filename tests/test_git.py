@@ -0,0 +1,53 @@
+"""Test src/bitwarden_workflow_linter/git.py."""
+
+import os
+import subprocess
+
+import pytest
+
+from src.bitwarden_workflow_linter.git import GitError, changed_files
+
+
+def _git(repo, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture(name="repo")
+def fixture_repo(tmp_path):
+    repo = tmp_path / "repo"
+    workflows = repo / ".github" / "workflows"
+    workflows.mkdir(parents=True)
+    for name in ("a.yml", "b.yml", "c.yml"):
+        (workflows / name).write_text(f"name: {name}\n")
+
+    _git(repo, "init", "-q", "-b", "main")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", "initial")
+    _git(repo, "checkout", "-q", "-b", "feature")
+    return repo
+
+
+def test_changed_files(repo):
+    workflows = repo / ".github" / "workflows"
+    (workflows / "a.yml").write_text("name: committed change\n")
+    _git(repo, "commit", "-q", "-am", "change a")
+    (workflows / "b.yml").write_text("name: uncommitted change\n")
+    (workflows / "d.yml").write_text("name: new file\n")
+
+    changed = changed_files("main", cwd=str(workflows))
+
+    assert changed == {
+        os.path.realpath(workflows / "a.yml"),
+        os.path.realpath(workflows / "b.yml"),
+        os.path.realpath(workflows / "d.yml"),
+    }
+
+
+def test_changed_files_unknown_ref(repo):
+    with pytest.raises(GitError, match="merge-base"):
+        changed_files("does-not-exist", cwd=str(repo))
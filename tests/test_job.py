@@ -4,6 +4,8 @@ import pytest
 
 from ruamel.yaml import YAML
 
+from src.bitwarden_workflow_linter.load import WorkflowBuilderError
+from src.bitwarden_workflow_linter.models.construct import FrozenDict
 from src.bitwarden_workflow_linter.models.job import Job
 
 
@@ -78,3 +80,38 @@ def test_job_extra_kwargs(workflow_yaml):
 
     with pytest.raises(Exception):
         assert job.extra == "test"
+
+
+def test_job_steps_built_on_first_use(workflow_yaml):
+    job = Job.init("job-key", workflow_yaml["jobs"]["job-key"])
+    assert job._steps_yaml is not None
+    assert "_steps_yaml" not in job.to_json()
+
+    assert [step.name for step in job.steps] == ["Test"]
+    assert job.steps[0].job == "job-key"
+    assert job._steps_yaml is None
+
+
+def test_job_deferred_steps_detached_from_yaml():
+    data = yaml.load(
+        """\
+steps:
+  - name: Checkout
+    uses: actions/checkout@2541b1294d2704b0964813337f33b291d3f8596b # v4.1.1
+"""
+    )
+    job = Job.init("job-key", data)
+
+    assert type(job._steps_yaml) is tuple
+    assert all(isinstance(step, FrozenDict) for step in job._steps_yaml)
+    assert job.steps[0].uses_comment == "# v4.1.1"
+    assert job.steps[0].uses_version == "v4.1.1"
+
+
+def test_job_invalid_steps_raise_on_first_use(workflow_yaml):
+    invalid_job = workflow_yaml["jobs"]["job-key"]
+    invalid_job["steps"] = None
+    job = Job.init("job-key", invalid_job)
+
+    with pytest.raises(WorkflowBuilderError, match="Error building workflow"):
+        assert job.steps
@@ -1,12 +1,16 @@
 """Test src/bitwarden_workflow_linter/lint.py."""
 
 import argparse
+import os
 
 import pytest
 
 from unittest.mock import MagicMock
 
+import src.bitwarden_workflow_linter.lint as lint_module
+
 from src.bitwarden_workflow_linter.lint import LinterCmd
+from src.bitwarden_workflow_linter.load import WorkflowBuilder
 from src.bitwarden_workflow_linter.utils import Settings, LintFinding, LintLevels
 
 
@@ -63,6 +67,8 @@ def fixture_linter_with_mock_rules(settings):
 def _make_rule(finding):
     rule = MagicMock()
     rule.execute.return_value = finding
+    rule.evaluate.return_value = finding
+    rule.step_kinds = None
     return rule
 
 
@@ -101,3 +107,245 @@ def test_strict_and_errors_only_are_mutually_exclusive():
 
     with pytest.raises(SystemExit):
         parser.parse_args(["lint", "--strict", "--errors-only", "-f", "file.yml"])
+
+
+def test_run_parallel_matches_serial(linter_with_mock_rules, capsys):
+    linter = linter_with_mock_rules
+    linter.rules.workflow = [
+        _make_rule(LintFinding("warning finding", LintLevels.WARNING)),
+        _make_rule(LintFinding("error finding", LintLevels.ERROR)),
+    ]
+
+    serial_code = linter.run(["tests/fixtures"], jobs=1)
+    serial_out = capsys.readouterr().out
+
+    parallel_code = linter.run(["tests/fixtures"], jobs=3)
+    parallel_out = capsys.readouterr().out
+
+    assert serial_code == parallel_code == 2
+    assert serial_out == parallel_out
+    assert serial_out.index("test-alt.yml") < serial_out.index("test_workflow.yaml")
+
+
+def test_run_serial_where_forking_is_unsafe(linter_with_mock_rules, monkeypatch, capsys):
+    linter = linter_with_mock_rules
+    linter.rules.workflow = [_make_rule(LintFinding("error finding", LintLevels.ERROR))]
+    monkeypatch.setattr(lint_module.sys, "platform", "darwin")
+    monkeypatch.setattr(
+        lint_module.multiprocessing,
+        "get_context",
+        lambda method: pytest.fail(f"a {method} pool was created"),
+    )
+
+    assert linter.run(["tests/fixtures"], jobs=3) == 2
+    assert "test-alt.yml" in capsys.readouterr().out
+
+
+def test_jobs_defaults_to_cpu_count():
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest="command")
+    LinterCmd.extend_parser(subparsers)
+
+    args = parser.parse_args(["lint", "-f", "file.yml"])
+    assert args.jobs >= 1
+
+    args = parser.parse_args(["lint", "-j", "4", "-f", "file.yml"])
+    assert args.jobs == 4
+
+
+def test_run_prepares_rules_with_all_files(linter_with_mock_rules, capsys):
+    linter = linter_with_mock_rules
+    rule = _make_rule(None)
+    linter.rules.workflow = [rule]
+    linter.rules.job = [rule]
+
+    assert linter.run(["tests/fixtures/test.yml", "tests/fixtures/test-alt.yml"]) == 0
+    rule.prepare.assert_called_once_with(
+        ["tests/fixtures/test-alt.yml", "tests/fixtures/test.yml"]
+    )
+
+
+def test_run_uses_result_cache(linter_with_mock_rules, capsys):
+    linter = linter_with_mock_rules
+    rule = _make_rule(LintFinding("error finding", LintLevels.ERROR))
+    linter.rules.workflow = [rule]
+
+    first_code = linter.run(["tests/fixtures"], use_cache=True)
+    first_out = capsys.readouterr().out
+    executions = rule.evaluate.call_count
+
+    second_code = linter.run(["tests/fixtures"], use_cache=True)
+    second_out = capsys.readouterr().out
+
+    assert first_code == second_code == 2
+    assert rule.evaluate.call_count == executions
+    assert "Result cache: 0 hit(s), 9 miss(es)" in first_out
+    assert "Result cache: 9 hit(s), 0 miss(es)" in second_out
+    assert first_out.replace("0 hit(s), 9 miss(es)", "9 hit(s), 0 miss(es)") == second_out
+
+
+def test_run_caches_identical_files_by_path(linter_with_mock_rules, tmp_path, capsys):
+    linter = linter_with_mock_rules
+    rule = _make_rule(None)
+    rule.evaluate.side_effect = lambda obj: LintFinding(
+        f"{obj.filename}: error finding", LintLevels.ERROR
+    )
+    linter.rules.workflow = [rule]
+
+    with open("tests/fixtures/test.yml", encoding="utf8") as file:
+        content = file.read()
+    files = [str(tmp_path / "a" / "test.yml"), str(tmp_path / "b" / "test.yml")]
+    for filename in files:
+        os.makedirs(os.path.dirname(filename))
+        with open(filename, "w", encoding="utf8") as file:
+            file.write(content)
+
+    linter.run(files, use_cache=True)
+    first_out = capsys.readouterr().out
+    linter.run(files, use_cache=True)
+    second_out = capsys.readouterr().out
+
+    assert rule.evaluate.call_count == 2
+    assert "Result cache: 0 hit(s), 2 miss(es)" in first_out
+    assert "Result cache: 2 hit(s), 0 miss(es)" in second_out
+    for output in (first_out, second_out):
+        for filename in files:
+            assert output.count(f"{filename}: error finding") == 1
+
+
+def test_run_does_not_cache_uncacheable_rules(linter_with_mock_rules, capsys):
+    linter = linter_with_mock_rules
+    rule = _make_rule(LintFinding("tool not installed", LintLevels.ERROR))
+    rule.cacheable = False
+    linter.rules.workflow = [rule]
+
+    linter.run(["tests/fixtures/test.yml"], use_cache=True)
+    linter.run(["tests/fixtures/test.yml"], use_cache=True)
+
+    assert rule.evaluate.call_count == 2
+    assert "Result cache: 0 hit(s), 1 miss(es)" in capsys.readouterr().out
+
+
+def test_run_changed_since(linter_with_mock_rules, monkeypatch, capsys):
+    linter = linter_with_mock_rules
+    linter.rules.workflow = [_make_rule(None)]
+    monkeypatch.setattr(
+        "src.bitwarden_workflow_linter.lint.changed_files",
+        lambda ref: {os.path.realpath("tests/fixtures/test.yml")},
+    )
+
+    assert linter.run(["tests/fixtures"], changed_since="main") == 0
+    output = capsys.readouterr().out
+
+    assert "Linting 1 file(s) changed since main" in output
+    assert "Linting: tests/fixtures/test.yml" in output
+    assert "test-alt.yml" not in output
+
+
+def test_watch_relints_only_changed_files(linter_with_mock_rules, monkeypatch, tmp_path, capsys):
+    linter = linter_with_mock_rules
+    rule = _make_rule(None)
+    linter.rules.workflow = [rule]
+
+    with open("tests/fixtures/test.yml", encoding="utf8") as file:
+        content = file.read()
+    for name in ("a.yml", "b.yml"):
+        (tmp_path / name).write_text(content)
+    changed = str(tmp_path / "b.yml")
+
+    changes = iter([{changed}])
+
+    def fake_wait_for_changes(watcher, debounce):
+        try:
+            return next(changes)
+        except StopIteration:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(
+        "src.bitwarden_workflow_linter.lint.wait_for_changes", fake_wait_for_changes
+    )
+
+    assert linter.watch([str(tmp_path)], use_cache=True) == 0
+    output = capsys.readouterr().out
+
+    assert output.count("a.yml") == 1
+    assert output.count("Linting: " + changed) == 2
+    assert rule.prepare.call_args_list[-1].args == ([changed],)
+
+
+def test_watch_reports_unparsable_files(linter_with_mock_rules, monkeypatch, tmp_path, capsys):
+    linter = linter_with_mock_rules
+    workflow = tmp_path / "a.yml"
+    with open("tests/fixtures/test.yml", encoding="utf8") as file:
+        workflow.write_text(file.read())
+    changes = iter([{str(workflow)}])
+
+    def fake_wait_for_changes(watcher, debounce):
+        try:
+            workflow.write_text("jobs: [")
+            return next(changes)
+        except StopIteration:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(
+        "src.bitwarden_workflow_linter.lint.wait_for_changes", fake_wait_for_changes
+    )
+
+    assert linter.watch([str(tmp_path)]) == -1
+    assert "Error loading YAML file" in capsys.readouterr().out
+
+
+def test_step_plan_matches_running_every_rule():
+    settings = Settings.factory()
+    settings.enabled_rules = [
+        {**rule, "id": f"src.{rule['id']}"}
+        for rule in settings.enabled_rules
+        if not rule["id"].endswith(("RunActionlint", "RunZizmor"))
+    ]
+    linter = LinterCmd(settings=settings)
+    assert linter.rules.step
+
+    for filename in linter.generate_files(["tests/fixtures"]):
+        expected = []
+        workflow = WorkflowBuilder.build(filename)
+        for rule in linter.rules.workflow:
+            expected.append(rule.execute(workflow))
+        for job in workflow.jobs.values():
+            for rule in linter.rules.job:
+                expected.append(rule.execute(job))
+            for step in job.steps or []:
+                for rule in linter.rules.step:
+                    expected.append(rule.execute(step))
+        expected = [str(finding) for finding in expected if finding is not None]
+
+        assert [str(finding) for finding in linter.collect_findings(filename)] == expected
+
+
+def test_run_fast_yaml_matches_round_trip(capsys):
+    settings = Settings.factory()
+    settings.enabled_rules = [
+        {**rule, "id": f"src.{rule['id']}"}
+        for rule in settings.enabled_rules
+        if not rule["id"].endswith(("RunActionlint", "RunZizmor"))
+    ]
+    linter = LinterCmd(settings=settings)
+
+    return_code = linter.run(["tests/fixtures"])
+    output = capsys.readouterr().out
+
+    assert linter.run(["tests/fixtures"], fast_yaml=True) == return_code
+    assert capsys.readouterr().out == output
+
+
+def test_workflow_rules_do_not_build_jobs(linter_with_mock_rules, monkeypatch):
+    linter = linter_with_mock_rules
+    linter.rules.workflow = [_make_rule(LintFinding("finding", LintLevels.WARNING))]
+
+    def fail_build_jobs(data):
+        raise AssertionError("the jobs should not be built")
+
+    monkeypatch.setattr(
+        "src.bitwarden_workflow_linter.models.workflow.Workflow.build_jobs", fail_build_jobs
+    )
+
+    assert len(linter.collect_findings("tests/fixtures/test.yml")) == 1
@@ -7,8 +7,9 @@ from ruamel.yaml.comments import CommentedMap
 
 from .conftest import FIXTURE_DIR
 
-from src.bitwarden_workflow_linter.load import WorkflowBuilder
+from src.bitwarden_workflow_linter.load import Rules, WorkflowBuilder
 from src.bitwarden_workflow_linter.models.workflow import Workflow
+from src.bitwarden_workflow_linter.utils import Settings
 
 
 yaml = YAML()
@@ -92,3 +93,34 @@ def test_load_simple_workflow_from_yaml(simple_workflow_yaml: CommentedMap) -> N
 def test_load_complex_workflow_from_yaml(complex_workflow_yaml: CommentedMap) -> None:
     workflow = WorkflowBuilder.build(workflow=complex_workflow_yaml, from_file=False)
     assert isinstance(workflow, Workflow)
+
+
+def test_rules_step_plan() -> None:
+    rules = Rules(
+        settings=Settings(
+            enabled_rules=[
+                {
+                    "id": "src.bitwarden_workflow_linter.rules.name_exists.RuleNameExists",
+                    "level": "error",
+                },
+                {
+                    "id": "src.bitwarden_workflow_linter.rules.step_pinned.RuleStepUsesPinned",
+                    "level": "error",
+                },
+                {
+                    "id": "src.bitwarden_workflow_linter.rules.underscore_outputs.RuleUnderscoreOutputs",
+                    "level": "warning",
+                },
+            ]
+        )
+    )
+    name_exists, step_pinned, underscore_outputs = rules.step
+
+    plan = rules.step_plan()
+    assert plan["remote"] == [name_exists, step_pinned]
+    assert plan["local"] == plan["run"] == plan["empty"] == [name_exists]
+    assert underscore_outputs in rules.workflow
+    assert rules.step_plan() is plan
+
+    rules.step = [step_pinned]
+    assert rules.step_plan()["run"] == []
@@ -0,0 +1,169 @@
+"""Test src/bitwarden_workflow_linter/mirrors.py."""
+
+import glob
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.bitwarden_workflow_linter.mirrors import (
+    GitMirror,
+    MirrorError,
+    MirrorResolver,
+    apply_delta,
+)
+from src.bitwarden_workflow_linter.utils import Action
+
+from .conftest import MIRROR_STORAGES, run_git
+
+TAGS = [
+    ("v1.0.0", "lightweight"),
+    ("v1.1.0", "annotated"),
+    ("v1", "lightweight"),
+    ("v1.2.0", "nested"),
+    ("v2.0.0-beta.1", "annotated"),
+    ("latest", "annotated"),
+]
+
+
+@pytest.fixture(name="mirrors")
+def fixture_mirrors(tmp_path):
+    return tmp_path / "mirrors"
+
+
+@pytest.mark.parametrize("storage", MIRROR_STORAGES)
+def test_peels_every_tag_like_git(git_mirror, mirrors, storage):
+    path = git_mirror(mirrors / "owner" / "repo.git", TAGS, storage)
+    mirror = GitMirror(str(path))
+
+    tags = mirror.tags()
+    assert set(tags) == {tag for tag, _ in TAGS} | {"v1.2.0-inner"}
+    for tag, sha in tags.items():
+        assert sha == run_git(path, "rev-parse", f"refs/tags/{tag}").strip()
+        assert mirror.peel(sha) == run_git(path, "rev-parse", f"{tag}^{{commit}}").strip()
+
+
+def test_storages_are_what_they_claim(git_mirror, mirrors):
+    loose = git_mirror(mirrors / "owner" / "loose.git", TAGS, "loose")
+    assert not glob.glob(str(loose / "objects" / "pack" / "*.idx"))
+    assert not (loose / "packed-refs").exists()
+
+    packed = git_mirror(mirrors / "owner" / "packed.git", TAGS, "packed")
+    assert glob.glob(str(packed / "objects" / "pack" / "*.idx"))
+    assert not os.listdir(packed / "refs" / "tags")
+    assert "^" in (packed / "packed-refs").read_text()
+
+    # Some tags and commits are stored as deltas (with a depth and a base)
+    (index,) = glob.glob(str(packed / "objects" / "pack" / "*.idx"))
+    objects = [
+        line.split() for line in run_git(packed, "verify-pack", "-v", index).splitlines()
+    ]
+    assert any(len(entry) == 7 and entry[1] in ("tag", "commit") for entry in objects)
+
+
+def test_loose_ref_overrides_packed_ref(git_mirror, mirrors):
+    path = git_mirror(mirrors / "owner" / "repo.git", TAGS, "packed")
+    sha = run_git(path, "rev-parse", "v1.0.0").strip()
+    run_git(path, "update-ref", "refs/tags/v1.2.0", sha)
+
+    mirror = GitMirror(str(path))
+    tags = mirror.tags()
+    assert tags["v1.2.0"] == sha
+    assert mirror.peel(tags["v1.2.0"]) == sha
+
+
+def test_missing_object(git_mirror, mirrors):
+    path = git_mirror(mirrors / "owner" / "repo.git", TAGS, "packed")
+    with pytest.raises(MirrorError, match="not found"):
+        GitMirror(str(path)).read_object("0" * 40)
+
+
+def test_apply_delta():
+    base = b"0123456789abcdef"
+    # Sizes 16 and 10, copy 4 bytes at offset 10, insert "XY", copy 4 bytes at 0
+    delta = bytes([16, 10, 0x91, 10, 4, 2]) + b"XY" + bytes([0x90, 4])
+    assert apply_delta(base, delta) == b"abcdXY0123"
+
+    with pytest.raises(MirrorError):
+        apply_delta(b"short", delta)
+
+
+@pytest.mark.parametrize(
+    ("tags", "latest"),
+    [
+        (["v1.0.0", "v1.10.0", "v1.9.0"], "v1.10.0"),
+        (["v2", "v2.0.0", "v1.9.9"], "v2.0.0"),
+        (["v1.0.0", "v2.0.0-rc.1", "latest"], "v1.0.0"),
+        (["v2.0.0-rc.1", "v2.0.0-beta.2"], "v2.0.0-rc.1"),
+        (["1.2.3", "v1.2.2"], "1.2.3"),
+        (["latest", "nightly"], None),
+        ([], None),
+    ],
+)
+def test_latest_tag(tags, latest):
+    assert MirrorResolver.latest_tag(tags) == latest
+
+
+@pytest.mark.parametrize("storage", MIRROR_STORAGES)
+def test_resolver_latest_version(git_mirror, mirrors, storage):
+    path = git_mirror(mirrors / "owner" / "repo.git", TAGS, storage)
+    sha = run_git(path, "rev-parse", "v1.2.0^{commit}").strip()
+
+    resolver = MirrorResolver(str(mirrors))
+    assert resolver.get_latest_version("owner/repo") == (
+        True,
+        Action(name="owner/repo", version="v1.2.0", sha=sha),
+    )
+
+
+def test_resolver_reads_each_mirror_once_across_threads(
+    git_mirror, mirrors, monkeypatch
+):
+    git_mirror(mirrors / "owner" / "repo.git", [("v1.0.0", "annotated")])
+    resolver = MirrorResolver(str(mirrors))
+    read_latest_version = resolver.read_latest_version
+    reads = []
+    reads_lock = threading.Lock()
+
+    def slow_read(repo_name):
+        with reads_lock:
+            reads.append(repo_name)
+        time.sleep(0.05)
+        return read_latest_version(repo_name)
+
+    monkeypatch.setattr(resolver, "read_latest_version", slow_read)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(
+            executor.map(resolver.get_latest_version, ["owner/repo"] * 8)
+        )
+
+    assert reads == ["owner/repo"]
+    assert all(result == results[0] for result in results)
+    assert results[0][1].version == "v1.0.0"
+
+
+def test_resolver_finds_mirrors_without_suffix(git_mirror, mirrors):
+    git_mirror(mirrors / "owner" / "repo", [("v1.0.0", "annotated")])
+    exists, latest = MirrorResolver(str(mirrors)).get_latest_version("owner/repo")
+    assert exists
+    assert latest.version == "v1.0.0"
+
+
+def test_resolver_missing_mirror(mirrors):
+    assert MirrorResolver(str(mirrors)).get_latest_version("owner/missing") == (
+        False,
+        None,
+    )
+
+
+def test_resolver_without_version_tags(git_mirror, mirrors):
+    git_mirror(mirrors / "owner" / "repo.git", [("latest", "annotated")])
+    assert MirrorResolver(str(mirrors)).get_latest_version("owner/repo") == (True, None)
+
+
+def test_resolver_corrupt_mirror(git_mirror, mirrors):
+    path = git_mirror(mirrors / "owner" / "repo.git", [("v1.0.0", "annotated")])
+    (path / "refs" / "tags" / "v1.0.0").write_text("1" * 40)
+    assert MirrorResolver(str(mirrors)).get_latest_version("owner/repo") == (True, None)
@@ -0,0 +1,111 @@
+"""Test src/bitwarden_workflow_linter/profiling.py."""
+
+import os
+import pstats
+
+from typing import List
+
+from src.bitwarden_workflow_linter.lint import LinterCmd
+from src.bitwarden_workflow_linter.models import construct
+from src.bitwarden_workflow_linter.models.job import Job
+from src.bitwarden_workflow_linter.models.step import Step
+from src.bitwarden_workflow_linter.models.workflow import Workflow
+from src.bitwarden_workflow_linter.profiling import Profiler, percentile
+from src.bitwarden_workflow_linter.rule import Rule
+from src.bitwarden_workflow_linter.utils import Settings
+
+
+class RuleAlwaysPasses(Rule):
+    def __init__(self):
+        self.compatibility = [Workflow, Job, Step]
+
+    def fn(self, obj):
+        return True, ""
+
+
+class RulePrepared(Rule):
+    def __init__(self):
+        self.compatibility = [Workflow]
+        self.prepared = []
+
+    def prepare(self, filenames: List[str]) -> None:
+        self.prepared.append(filenames)
+
+    def fn(self, obj):
+        return True, ""
+
+
+def test_percentile():
+    durations = [float(value) for value in range(1, 101)]
+    assert percentile(durations, 0.95) == 95.0
+    assert percentile([3.0], 0.95) == 3.0
+
+
+def test_profiler_timer():
+    profiler = Profiler()
+    for _ in range(3):
+        with profiler.timer("phase", "load"):
+            pass
+    with profiler.timer("file", "a.yml"):
+        pass
+    with profiler.timer("file", "a.yml"):
+        pass
+
+    assert len(profiler.timings[("phase", "load")]) == 3
+    assert list(profiler.files) == ["a.yml"]
+
+
+def test_run_with_profile(capsys, tmp_path):
+    linter = LinterCmd(settings=Settings())
+    passes, prepared = RuleAlwaysPasses(), RulePrepared()
+    linter.rules.workflow = [passes, prepared]
+    linter.rules.job = [passes]
+    linter.rules.step = [passes]
+
+    stats_file = str(tmp_path / "lint.pstats")
+    assert linter.run(["tests/fixtures"], jobs=4, use_cache=True, profile=True, profile_output=stats_file) == 0
+    output = capsys.readouterr().out
+
+    assert "===== Profile =====" in output
+    for name in ("load", "build", "prepare", "RuleAlwaysPasses", "RulePrepared.prepare"):
+        assert f" {name} " in output
+    assert "RuleAlwaysPasses.prepare" not in output
+    assert "Slowest 9 file(s):" in output
+    assert "Result cache" not in output
+    assert prepared.prepared == [linter.generate_files(["tests/fixtures"])]
+    assert pstats.Stats(stats_file).total_calls > 0
+
+    # The Rules are no longer timed once the run is over
+    assert "evaluate" not in vars(passes)
+    assert "prepare" not in vars(prepared)
+    assert linter.profiler is None
+
+
+def test_run_without_profile(capsys):
+    linter = LinterCmd(settings=Settings())
+    linter.rules.workflow = [RuleAlwaysPasses()]
+
+    assert linter.run(["tests/fixtures/test.yml"]) == 0
+    assert "Profile" not in capsys.readouterr().out
+    assert not os.path.exists("lint.pstats")
+
+
+def test_lazy_builds_are_timed_as_build():
+    linter = LinterCmd(settings=Settings())
+    passes = RuleAlwaysPasses()
+    linter.rules.workflow = []
+    linter.rules.job = [passes]
+    linter.rules.step = [passes]
+
+    profiler = Profiler()
+    profiler.instrument(linter.rules)
+    assert construct.build_timer == profiler.build_timer
+    linter.profiler = profiler
+    linter.collect_findings("tests/fixtures/test.yml")
+    profiler.restore()
+
+    # The eager build, then the Jobs and the Steps of each Job on first use
+    builds = profiler.timings[("phase", "build")]
+    assert len(builds) > 2
+    assert profiler.deferred_builds == sum(builds[1:])
+    assert construct.build_timer is not profiler.build_timer
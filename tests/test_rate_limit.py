@@ -0,0 +1,121 @@
+"""Test src/bitwarden_workflow_linter/rate_limit.py."""
+
+import pytest
+
+from src.bitwarden_workflow_linter.rate_limit import RateLimiter
+
+
+class FakeClock:
+    """A clock that only moves when something sleeps."""
+
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+        self.sleeps: list[float] = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture(name="clock")
+def fixture_clock():
+    return FakeClock()
+
+
+@pytest.fixture(name="limiter")
+def fixture_limiter(clock):
+    return RateLimiter(reserve=10, clock=clock.time, sleep=clock.sleep)
+
+
+def rate_limit_headers(remaining: int, reset: float) -> dict[str, str]:
+    return {"X-RateLimit-Remaining": str(remaining), "X-RateLimit-Reset": str(reset)}
+
+
+def test_no_wait_without_rate_limit_headers(limiter, clock):
+    limiter.observe({})
+    for _ in range(100):
+        limiter.wait()
+    assert not clock.sleeps
+
+
+def test_no_wait_above_reserve(limiter, clock):
+    limiter.observe(rate_limit_headers(100, clock.now + 60))
+    for _ in range(90):
+        limiter.wait()
+    assert not clock.sleeps
+
+
+def test_paces_requests_in_reserve(limiter, clock):
+    limiter.observe(rate_limit_headers(10, clock.now + 100))
+    for _ in range(4):
+        limiter.wait()
+
+    # The first request is sent at once, and the next ones spread the
+    # remaining requests until the reset
+    assert clock.sleeps[0] == pytest.approx(10.0)
+    assert len(clock.sleeps) == 3
+    assert clock.now < 1100.0
+
+
+def test_waits_for_reset_when_exhausted(limiter, clock):
+    limiter.observe(rate_limit_headers(0, clock.now + 30))
+    limiter.wait()
+    assert clock.sleeps == [30.0]
+
+    # A new window starts after the reset
+    limiter.wait()
+    assert clock.sleeps == [30.0]
+
+
+def test_wait_is_capped(clock):
+    limiter = RateLimiter(max_wait=5, clock=clock.time, sleep=clock.sleep)
+    limiter.observe(rate_limit_headers(0, clock.now + 3600))
+    limiter.wait()
+    assert clock.sleeps == [5]
+
+
+def test_observe_keeps_lowest_remaining(limiter, clock):
+    reset = clock.now + 60
+    limiter.observe(rate_limit_headers(5, reset))
+    limiter.observe(rate_limit_headers(8, reset))
+    assert limiter.remaining == 5
+
+    limiter.observe(rate_limit_headers(5000, reset + 3600))
+    assert limiter.remaining == 5000
+
+
+def test_retry_after(limiter):
+    assert limiter.retry_delay(403, {"Retry-After": "7"}, 0) == 7.0
+    assert limiter.retry_delay(429, {"Retry-After": "7"}, 0) == 7.0
+
+
+def test_retry_after_reset(limiter, clock):
+    headers = rate_limit_headers(0, clock.now + 20)
+    assert limiter.retry_delay(403, headers, 0) == 21.0
+
+
+def test_retry_too_long_gives_up(clock):
+    limiter = RateLimiter(max_wait=60, clock=clock.time, sleep=clock.sleep)
+    assert limiter.retry_delay(403, rate_limit_headers(0, clock.now + 3600), 0) is None
+    assert limiter.retry_delay(429, {"Retry-After": "120"}, 0) is None
+
+
+def test_no_retry_when_forbidden(limiter):
+    assert limiter.retry_delay(403, {}, 0) is None
+    assert limiter.retry_delay(404, {}, 0) is None
+    assert limiter.retry_delay(200, {}, 0) is None
+
+
+def test_server_errors_back_off(clock):
+    limiter = RateLimiter(
+        max_retries=4, backoff=1.0, max_backoff=3.0, clock=clock.time, sleep=clock.sleep
+    )
+    delays = [limiter.retry_delay(502, {}, attempt) for attempt in range(5)]
+    assert 0.9 <= delays[0] <= 1.0
+    assert 1.8 <= delays[1] <= 2.0
+    assert 2.7 <= delays[2] <= 3.0
+    assert 2.7 <= delays[3] <= 3.0
+    assert delays[4] is None
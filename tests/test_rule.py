@@ -138,3 +138,10 @@ def test_incorrect_rule_execution(exists_rule, incorrect_workflow):
 
 def test_exception_rule_execution(exception_rule, incorrect_workflow):
     assert "failed to apply" in exception_rule.execute(incorrect_workflow).description
+
+
+def test_evaluate_skips_compatibility_check(step_rule, exists_rule, incorrect_workflow):
+    assert exists_rule.evaluate(incorrect_workflow).description == (
+        exists_rule.execute(incorrect_workflow).description
+    )
+    assert "<default fail message>" in step_rule.evaluate(incorrect_workflow).description
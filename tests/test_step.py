@@ -1,10 +1,12 @@
 """Test src/bitwarden_workflow_linter/models/step.py."""
 
 import json
+import pickle
 import pytest
 
 from ruamel.yaml import YAML
 
+from src.bitwarden_workflow_linter.models.construct import FrozenDict
 from src.bitwarden_workflow_linter.models.step import Step
 
 
@@ -142,3 +144,48 @@ def test_step_no_ref_with_comments(uses_step_no_ref_with_comments):
         uses_step_no_ref_with_comments.uses_version == "comment"
     )  # We are not currently validating the version matches a specific format
     assert uses_step_no_ref_with_comments.uses_comment == "# A comment"
+
+
+def test_step_kind(default_step, uses_step, uses_step_no_ref):
+    assert default_step.kind == "run"
+    assert uses_step.kind == "remote"
+    assert uses_step_no_ref.kind == "local"
+    assert Step.init(0, "default", YAML().load("name: Empty Step\n")).kind == "empty"
+
+
+def test_step_init_matches_from_dict(uses_step):
+    from_dict = Step.from_dict(uses_step.to_dict())
+
+    assert from_dict.name == uses_step.name
+    assert from_dict.uses == uses_step.uses
+    assert from_dict.uses_with == uses_step.uses_with
+    assert Step(name="Keyword", extra="ignored").name == "Keyword"
+
+
+def test_step_merge_keys():
+    yaml = YAML()
+    workflow_yaml = yaml.load(
+        """\
+defaults: &defaults
+  name: Merged
+  uses: actions/checkout@sha # v4
+step:
+  <<: *defaults
+  run: echo
+"""
+    )
+    step = Step.init(0, "default", workflow_yaml["step"])
+
+    assert step.name == "Merged"
+    assert step.uses_path == "actions/checkout"
+    assert step.run == "echo"
+
+
+def test_step_detached_from_yaml(uses_step):
+    assert type(uses_step.uses) is str
+    assert type(uses_step.uses_with) is FrozenDict
+    assert not hasattr(uses_step, "__dict__")
+
+    with pytest.raises(TypeError):
+        uses_step.uses_with["path"] = "other"
+    assert pickle.loads(pickle.dumps(uses_step)) == uses_step
@@ -0,0 +1,116 @@
+"""Test src/bitwarden_workflow_linter/tools.py."""
+
+import os
+
+import pytest
+
+import src.bitwarden_workflow_linter.tools as tools_module
+
+from src.bitwarden_workflow_linter.tools import (
+    clear_resolved_tools,
+    forget_stale_tools,
+    load_stamps,
+    resolve_tool,
+)
+
+
+@pytest.fixture(name="binary")
+def fixture_binary(tmp_path):
+    path = tmp_path / "bin" / "tool"
+    path.parent.mkdir()
+    path.write_text("#!/bin/sh\necho 1.0.0\n")
+    path.chmod(0o755)
+    return str(path)
+
+
+def _counting_check(result):
+    calls = []
+
+    def check():
+        calls.append(1)
+        return result
+
+    return check, calls
+
+
+def test_resolve_tool_once_per_process():
+    check, calls = _counting_check((False, "not installed"))
+
+    assert resolve_tool("tool", "1.0.0", check) == (False, "not installed")
+    assert resolve_tool("tool", "1.0.0", check) == (False, "not installed")
+    assert len(calls) == 1
+    assert load_stamps() == {}
+
+
+def test_resolve_tool_stamp_skips_check(binary):
+    check, calls = _counting_check((True, binary))
+    assert resolve_tool("tool", "1.0.0", check) == (True, binary)
+    assert load_stamps()["tool"]["version"] == "1.0.0"
+
+    # A new process only has the stamp on disk
+    clear_resolved_tools()
+    assert resolve_tool("tool", "1.0.0", check) == (True, binary)
+    assert len(calls) == 1
+
+
+def test_resolve_tool_stamp_invalidated(binary):
+    check, calls = _counting_check((True, binary))
+    resolve_tool("tool", "1.0.0", check)
+
+    clear_resolved_tools()
+    resolve_tool("tool", "2.0.0", check)
+    assert len(calls) == 2
+
+    with open(binary, "a", encoding="utf8") as file:
+        file.write("echo changed\n")
+    clear_resolved_tools()
+    resolve_tool("tool", "2.0.0", check)
+    assert len(calls) == 3
+
+
+def test_resolve_tool_on_path(binary, monkeypatch):
+    monkeypatch.setenv("PATH", os.path.dirname(binary))
+    check, calls = _counting_check((True, ""))
+
+    assert resolve_tool("tool", "1.0.0", check) == (True, "")
+    clear_resolved_tools()
+    assert resolve_tool("tool", "1.0.0", check) == (True, "")
+    assert len(calls) == 1
+
+    # The tool is no longer found on the PATH
+    monkeypatch.setenv("PATH", "")
+    clear_resolved_tools()
+    resolve_tool("tool", "1.0.0", check)
+    assert len(calls) == 2
+
+
+def test_resolve_tool_retries_failures(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(tools_module.time, "monotonic", lambda: now[0])
+    check, calls = _counting_check((False, "failed to install"))
+
+    resolve_tool("tool", "1.0.0", check)
+    resolve_tool("tool", "1.0.0", check)
+    assert len(calls) == 1
+    assert not forget_stale_tools()
+
+    # A transient failure is not replayed for the life of the process
+    now[0] += tools_module.FAILED_RESOLUTION_TTL
+    resolve_tool("tool", "1.0.0", check)
+    assert len(calls) == 2
+
+    now[0] += tools_module.FAILED_RESOLUTION_TTL
+    assert forget_stale_tools()
+    assert not forget_stale_tools()
+
+
+def test_forget_stale_tools_after_binary_changes(binary):
+    check, calls = _counting_check((True, binary))
+    resolve_tool("tool", "1.0.0", check)
+    assert not forget_stale_tools()
+
+    with open(binary, "a", encoding="utf8") as file:
+        file.write("echo changed\n")
+    assert forget_stale_tools()
+    resolve_tool("tool", "1.0.0", check)
+    assert len(calls) == 2
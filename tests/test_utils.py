@@ -1,6 +1,16 @@
 """Tests src/bitwarden_workflow_linter/utils.py."""
 
-from src.bitwarden_workflow_linter.utils import Action, Colors, LintFinding, LintLevels
+import os
+
+from src.bitwarden_workflow_linter.utils import (
+    Action,
+    Colors,
+    LintFinding,
+    LintLevels,
+    Settings,
+    chunk_arguments,
+    settings_snapshot_path,
+)
 
 
 def test_action_eq():
@@ -33,3 +43,87 @@ def test_lint_finding():
 
     error = LintFinding(description="<no description>", level=LintLevels.ERROR)
     assert str(error) == "\x1b[31merror\x1b[0m <no description>"
+    assert not hasattr(error, "__dict__")
+
+
+def test_chunk_arguments():
+    assert chunk_arguments([]) == []
+    assert chunk_arguments(["a", "b", "c"]) == [["a", "b", "c"]]
+    assert chunk_arguments(["aaaa", "bbbb", "cccc"], max_length=10) == [
+        ["aaaa", "bbbb"],
+        ["cccc"],
+    ]
+    assert chunk_arguments(["a" * 20, "b"], max_length=10) == [["a" * 20], ["b"]]
+
+
+def test_settings_fingerprint():
+    assert Settings().fingerprint() == Settings().fingerprint()
+    assert (
+        Settings(blocked_domains=["a.com"]).fingerprint()
+        != Settings(blocked_domains=["b.com"]).fingerprint()
+    )
+    assert (
+        Settings(enabled_rules=[{"id": "some.Rule", "level": "error"}]).fingerprint()
+        != Settings(enabled_rules=[{"id": "some.Rule", "level": "warning"}]).fingerprint()
+    )
+    assert (
+        Settings(approved_actions={"a/b": {"name": "a/b", "version": "v1"}}).fingerprint()
+        != Settings(approved_actions={"a/b": {"name": "a/b", "version": "v2"}}).fingerprint()
+    )
+
+
+def test_settings_factory_sources(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    settings = Settings.factory()
+    local_settings = os.path.join(str(tmp_path), "settings.yaml")
+
+    assert local_settings in settings.sources
+    assert any(path.endswith("default_actions.json") for path in settings.sources)
+
+    stamps = settings.source_stamps()
+    assert stamps[local_settings] is None
+    (tmp_path / "settings.yaml").write_text("enabled_rules: []\n")
+    assert settings.source_stamps() != stamps
+
+
+def test_settings_snapshot(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    settings = Settings.factory()
+    path = settings_snapshot_path()
+
+    assert os.path.exists(path)
+    assert type(settings.enabled_rules[0]) is dict
+    assert set(settings.rule_classes) == {rule["id"] for rule in settings.enabled_rules}
+
+    snapshot = Settings.load_snapshot(path)
+    assert snapshot is not None
+    assert snapshot.fingerprint() == settings.fingerprint()
+    assert snapshot.sources == settings.sources
+    assert snapshot.rule_classes == settings.rule_classes
+
+
+def test_settings_snapshot_invalidated(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    local_settings = tmp_path / "settings.yaml"
+    local_settings.write_text("blocked_domains: [a.com]\n")
+    assert Settings.factory().blocked_domains == ["a.com"]
+
+    # Touching a file without changing it keeps the snapshot
+    os.utime(local_settings, ns=(0, 0))
+    assert Settings.load_snapshot(settings_snapshot_path()) is not None
+
+    local_settings.write_text("blocked_domains: [b.com]\n")
+    assert Settings.load_snapshot(settings_snapshot_path()) is None
+    assert Settings.factory().blocked_domains == ["b.com"]
+
+
+def test_settings_snapshot_corrupt(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = settings_snapshot_path()
+    os.makedirs(os.path.dirname(path))
+    with open(path, "wb") as file:
+        file.write(b"not a pickle")
+
+    assert Settings.load_snapshot(path) is None
+    assert Settings.factory().enabled_rules
+    assert Settings.load_snapshot(path) is not None
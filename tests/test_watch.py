@@ -0,0 +1,85 @@
+"""Test src/bitwarden_workflow_linter/watch.py."""
+
+import os
+import sys
+import threading
+
+import pytest
+
+from src.bitwarden_workflow_linter.watch import (
+    InotifyWatcher,
+    PollingWatcher,
+    create_watcher,
+    wait_for_changes,
+)
+
+
+def _list_files(directory):
+    return lambda: sorted(
+        str(directory / name) for name in os.listdir(directory) if name.endswith(".yml")
+    )
+
+
+def test_polling_watcher_detects_modified_and_new_files(tmp_path):
+    workflow = tmp_path / "a.yml"
+    workflow.write_text("name: a\n")
+    watcher = PollingWatcher(_list_files(tmp_path), interval=0.01)
+
+    assert watcher.changes(0.05) == set()
+
+    workflow.write_text("name: modified\n")
+    (tmp_path / "b.yml").write_text("name: b\n")
+    assert watcher.changes(1) == {str(workflow), str(tmp_path / "b.yml")}
+    assert watcher.changes(0.05) == set()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="requires inotify")
+def test_inotify_watcher_only_reports_workflows(tmp_path):
+    watcher = InotifyWatcher([str(tmp_path)])
+    try:
+        (tmp_path / "notes.txt").write_text("ignored")
+        (tmp_path / "a.yml").write_text("name: a\n")
+        assert watcher.changes(1) == {str(tmp_path) + os.sep + "a.yml"}
+        assert watcher.changes(0.05) == set()
+    finally:
+        watcher.close()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="requires inotify")
+def test_inotify_watcher_watches_single_files(tmp_path):
+    workflow = tmp_path / "a.yml"
+    workflow.write_text("name: a\n")
+    watcher = InotifyWatcher([str(workflow)])
+    try:
+        (tmp_path / "b.yml").write_text("name: b\n")
+        workflow.write_text("name: modified\n")
+        assert watcher.changes(1) == {str(workflow)}
+    finally:
+        watcher.close()
+
+
+def test_create_watcher_falls_back_to_polling(tmp_path, monkeypatch):
+    monkeypatch.setattr(sys, "platform", "darwin")
+    watcher = create_watcher([str(tmp_path)], _list_files(tmp_path))
+    assert isinstance(watcher, PollingWatcher)
+
+
+def test_wait_for_changes_debounces_bursts(tmp_path):
+    watcher = PollingWatcher(_list_files(tmp_path), interval=0.01)
+
+    def save_burst():
+        for index in range(5):
+            (tmp_path / f"{index}.yml").write_text("name: burst\n")
+            threading.Event().wait(0.02)
+
+    thread = threading.Thread(target=save_burst)
+    thread.start()
+    changed = wait_for_changes(watcher, debounce=0.2, timeout=5)
+    thread.join()
+
+    assert changed == {str(tmp_path / f"{index}.yml") for index in range(5)}
+
+
+def test_wait_for_changes_timeout(tmp_path):
+    watcher = PollingWatcher(_list_files(tmp_path), interval=0.01)
+    assert wait_for_changes(watcher, debounce=0.01, timeout=0.05) == set()